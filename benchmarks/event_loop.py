@@ -0,0 +1,87 @@
+"""
+Benchmark for the service `Executor`.
+
+Measures `GET /api/users/{uuid}` latency with 200 concurrent clients while
+the service layer runs inline on the event loop (before) and on the executor
+(after). The ORM call is replaced by a stand-in which sleeps, with one in
+every `SLOW_EVERY` calls acting as a slow query, so the numbers isolate event
+loop behaviour from database performance.
+
+ex: `python ../benchmarks/event_loop.py` from `src/`
+"""
+import asyncio
+import itertools
+import statistics
+import time
+from uuid import uuid4
+
+import httpx
+
+from api.schema import UsersSchema
+from api.services import Executor, UsersService
+from config import Config
+from main import app
+
+CLIENTS = 200
+REQUESTS_PER_CLIENT = 10
+FAST_QUERY = 0.002
+SLOW_QUERY = 0.100
+SLOW_EVERY = 50
+
+calls = itertools.count()
+
+
+def retrieve(self, uuid) -> UsersSchema:
+    """Stand-in for `UsersService.retrieve` with a blocking query"""
+    slow = next(calls) % SLOW_EVERY == 0
+    time.sleep(SLOW_QUERY if slow else FAST_QUERY)
+    return UsersSchema(uuid=uuid, password="benchmark", salt="benchmark")
+
+
+async def client(session: httpx.AsyncClient, latencies: list):
+    """Issues sequential requests and records their latency"""
+    for _ in range(REQUESTS_PER_CLIENT):
+        start = time.perf_counter()
+        response = await session.get(f"/api/users/{uuid4()}")
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+
+async def run(enabled: bool) -> dict:
+    """Runs all clients concurrently with the executor enabled or disabled"""
+    Config.Executor.enabled = enabled
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://benchmark",
+        auth=(Config.Auth.username, Config.Auth.password),
+    ) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session, latencies) for _ in range(CLIENTS)))
+        elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50": quantiles[49] * 1000,
+        "p99": quantiles[98] * 1000,
+    }
+
+
+def main():
+    UsersService.retrieve = retrieve
+    print(f"{CLIENTS} clients x {REQUESTS_PER_CLIENT} requests")
+    print(f"{'mode':<10}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode, enabled in (("inline", False), ("executor", True)):
+        result = asyncio.run(run(enabled))
+        print(
+            f"{mode:<10}{result['requests']:>10}{result['rps']:>10.0f}"
+            f"{result['p50']:>10.1f}{result['p99']:>10.1f}"
+        )
+    Executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark for the password `Hasher`.
+
+Measures `POST /api/users/` signups per second with 32 concurrent clients for
+each algorithm & cost, hashing in-process (on the service executor threads)
+and on the hashing worker processes. The INSERT is replaced by a stand-in
+which only hashes the password, so the numbers isolate hashing cost from
+database performance.
+
+ex: `python ../benchmarks/hashing.py` from `src/`
+"""
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+from api.hashing import Hasher
+from api.schema import UsersSchema
+from api.services import Executor, UsersService
+from api.tasks import UsersTasks
+from config import Config
+from main import app
+
+CLIENTS = 32
+SIGNUPS = 256
+WORKERS = os.cpu_count() or 1
+COSTS = [
+    ("sha512", {}),
+    ("pbkdf2_sha256", {"pbkdf2_iterations": 100_000}),
+    ("pbkdf2_sha256", {"pbkdf2_iterations": 600_000}),
+    ("scrypt", {"scrypt_ln": 14}),
+    ("scrypt", {"scrypt_ln": 15}),
+    ("scrypt", {"scrypt_ln": 16}),
+]
+
+
+def create(self, data: UsersSchema) -> UsersSchema:
+    """Stand-in for `UsersService.create` which only hashes the password"""
+    secrets = data.get_secrets()
+    Hasher.hash(secrets["password"], secrets["salt"])
+    return data
+
+
+async def client(session: httpx.AsyncClient, count: int, latencies: list):
+    """Issues sequential signups and records their latency"""
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await session.post(
+            "/api/users/", json={"password": "benchmark", "salt": "benchmark"}
+        )
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+
+async def run() -> dict:
+    """Runs all clients concurrently with the current hashing config"""
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://benchmark",
+        auth=(Config.Auth.username, Config.Auth.password),
+    ) as session:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(client(session, SIGNUPS // CLIENTS, latencies) for _ in range(CLIENTS))
+        )
+        elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "signups": len(latencies) / elapsed,
+        "p50": quantiles[49] * 1000,
+        "p99": quantiles[98] * 1000,
+    }
+
+
+def main():
+    UsersService.create = create
+    UsersTasks.do_after = staticmethod(lambda entity: None)
+    print(f"{CLIENTS} clients, {SIGNUPS} signups, {WORKERS} hashing workers")
+    print(
+        f"{'algorithm':<16}{'cost':<22}{'mode':<10}"
+        f"{'signups/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+    )
+    for algorithm, params in COSTS:
+        Config.Hashing.algorithm = algorithm
+        for key, value in params.items():
+            setattr(Config.Hashing, key, value)
+        cost = ",".join(f"{k}={v}" for k, v in Config.Hashing.params(algorithm).items())
+
+        for mode, workers in (("inline", 0), ("workers", WORKERS)):
+            Hasher.shutdown()
+            Config.Hashing.workers = workers
+            result = asyncio.run(run())
+            print(
+                f"{algorithm:<16}{cost or '-':<22}{mode:<10}"
+                f"{result['signups']:>10.0f}{result['p50']:>10.1f}{result['p99']:>10.1f}"
+            )
+    Hasher.shutdown()
+    Executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark for the streaming `POST /api/users/import` endpoint.
+
+Uploads NDJSON files of generated users in 64 KiB chunks for several
+`Import.chunk_size`s and measures the imported records per second and the
+peak resident memory. Passwords are hashed with sha512 here, hashing cost is
+measured by `benchmarks/hashing.py`.
+Writes to the configured database, the imported users are deleted afterwards.
+
+ex: `python ../benchmarks/imports.py` from `src/`
+"""
+import asyncio
+import json
+import resource
+import time
+from uuid import uuid4
+
+import httpx
+
+from api.hashing import Hasher
+from api.services import Executor, Import
+from config import Config
+from config.databases import DB
+from main import app
+
+RECORDS = 20_000
+CHUNK_SIZES = [100, 500, 2000]
+UPLOAD_CHUNK = 64 * 1024
+
+
+def make_file(count: int):
+    """Returns the uuids & NDJSON lines of `count` new users"""
+    uuids = [str(uuid4()) for _ in range(count)]
+    lines = [
+        json.dumps(
+            {
+                "uuid": uuid,
+                "name": "Benchmark User",
+                "age": 30,
+                "email": f"{uuid}@example.com",
+                "gender": "Nonbinary",
+                "password": "benchmark",
+                "salt": "benchmark",
+            }
+        ).encode("utf-8")
+        + b"\n"
+        for uuid in uuids
+    ]
+    return uuids, b"".join(lines)
+
+
+async def upload(data: bytes):
+    """Yields `data` in chunks, like a client streaming a file"""
+    for start in range(0, len(data), UPLOAD_CHUNK):
+        yield data[start:start + UPLOAD_CHUNK]
+
+
+async def run(data: bytes) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://benchmark",
+        auth=(Config.Auth.username, Config.Auth.password),
+        timeout=None,
+    ) as session:
+        start = time.perf_counter()
+        response = await session.post("/api/users/import", content=upload(data))
+        elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    return {**response.json(), "elapsed": elapsed}
+
+
+def cleanup(uuids: list):
+    for start in range(0, len(uuids), 500):
+        batch = uuids[start:start + 500]
+        DB.get_query_builder().table("preferences").where_in("user_id", batch).delete()
+        DB.get_query_builder().table("users").where_in("uuid", batch).delete()
+
+
+def main():
+    Config.Hashing.algorithm = "sha512"
+    print(f"{RECORDS} records, {UPLOAD_CHUNK // 1024} KiB upload chunks")
+    print(f"{'chunk':>6}{'records/s':>12}{'failed':>8}{'max rss MiB':>13}")
+    for chunk_size in CHUNK_SIZES:
+        Import.chunk_size = chunk_size
+        uuids, data = make_file(RECORDS)
+        try:
+            result = asyncio.run(run(data))
+        finally:
+            cleanup(uuids)
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(
+            f"{chunk_size:>6}{result['created'] / result['elapsed']:>12.0f}"
+            f"{result['failed']:>8}{rss:>13.1f}"
+        )
+    Hasher.shutdown()
+    Executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark for the `RateLimit` bucket backends.
+
+Measures the microseconds one check adds to a request, for the in-process
+buckets and for the SQLite buckets shared by 1, 4 and 8 worker processes
+checking concurrently.
+
+ex: `python ../benchmarks/ratelimit.py` from `src/`
+"""
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+from api.ratelimit import MemoryBuckets, SqliteBuckets
+
+CHECKS = 20_000
+CLIENTS = 1000
+PROCESSES = [1, 4, 8]
+
+
+def checks(backend) -> list:
+    """Returns the latency in microseconds of every check"""
+    latencies = []
+    for i in range(CHECKS):
+        start = time.perf_counter()
+        backend.take(f"users:user:client-{i % CLIENTS}", 1e6, 10**6)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def worker(path: str, results):
+    results.extend(checks(SqliteBuckets(path)))
+
+
+def report(name: str, latencies: list):
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{name:<20}{quantiles[49]:>10.1f}{quantiles[98]:>10.1f}")
+
+
+def main():
+    print(f"{CHECKS} checks per process, {CLIENTS} clients")
+    print(f"{'backend':<20}{'p50 us':>10}{'p99 us':>10}")
+    report("memory", checks(MemoryBuckets()))
+
+    for processes in PROCESSES:
+        path = os.path.join(tempfile.mkdtemp(), "ratelimit.sqlite3")
+        SqliteBuckets(path).clear()
+        with multiprocessing.Manager() as manager:
+            results = manager.list()
+            workers = [
+                multiprocessing.Process(target=worker, args=(path, results))
+                for _ in range(processes)
+            ]
+            for process in workers:
+                process.start()
+            for process in workers:
+                process.join()
+            report(f"sqlite x{processes}", list(results))
+
+
+if __name__ == "__main__":
+    main()
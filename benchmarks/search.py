@@ -0,0 +1,92 @@
+"""
+Benchmark for the type-ahead `UsersIndex`.
+
+Builds the index from 100k and 1M generated users, then reports:
+- the build time and the memory per user, as allocated (tracemalloc) and as
+  estimated by `UsersIndex.size()`, which the API logs at startup.
+- the latency of searches for 1 to 4 character prefixes, of 10 results.
+- the latency of an update, which moves entries within the sorted arrays.
+No database is needed.
+
+ex: `python ../benchmarks/search.py` from `src/`
+"""
+import random
+import statistics
+import string
+import time
+import tracemalloc
+from uuid import uuid4
+
+from api.search import UsersIndex
+
+SIZES = [100_000, 1_000_000]
+SEARCHES = 20_000
+UPDATES = 2_000
+FIRST = ["Ann", "Bob", "Carla", "Dirk", "Eva", "Femke", "Gijs", "Hanna", "Ivo", "Jan"]
+
+
+def make_rows(count: int):
+    """Yields `count` users with a random first name, surname & email"""
+    random.seed(count)
+    for _ in range(count):
+        surname = "".join(random.choices(string.ascii_lowercase, k=8)).title()
+        first = random.choice(FIRST)
+        email = f"{first.lower()}.{surname.lower()}{random.randrange(100)}@example.com"
+        yield str(uuid4()), f"{first} {surname}", email
+
+
+def latencies(func, queries) -> list:
+    """Returns the latency in microseconds of every call"""
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        results.append((time.perf_counter() - start) * 1e6)
+    return results
+
+
+def report(name: str, values: list):
+    quantiles = statistics.quantiles(values, n=100)
+    print(f"{name:<28}{quantiles[49]:>10.1f}{quantiles[98]:>10.1f}")
+
+
+def main():
+    for size in SIZES:
+        rows = list(make_rows(size))
+        # ? Tracing slows the allocations down, the timed build is untraced
+        tracemalloc.start()
+        UsersIndex().load(rows)
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        index = UsersIndex()
+        index.load(rows)
+        elapsed = time.perf_counter() - start
+
+        print(f"\n{size} users, built in {elapsed:.2f}s")
+        print(f"{'allocated per user':<28}{allocated / size:>10.0f} bytes")
+        print(f"{'estimated per user':<28}{index.size() / size:>10.0f} bytes")
+        print(f"{'operation':<28}{'p50 us':>10}{'p99 us':>10}")
+
+        for length in range(1, 5):
+            queries = [
+                random.choice(rows)[random.randrange(1, 3)][:length]
+                for _ in range(SEARCHES)
+            ]
+            report(
+                f"search, {length} characters",
+                latencies(lambda query: index.search(query, 10), queries),
+            )
+
+        changed = random.sample(rows, UPDATES)
+        report(
+            "update",
+            latencies(
+                lambda row: index.add(row[0], f"{row[1]} Jr", row[2]), changed
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark for the `FastJSONResponse` path.
+
+Measures `UsersList` rows per second from ORM rows to response bytes for
+pages of 10, 100 and 1000 rows:
+- default: `UsersSchema(**user.serialize())` per row, then FastAPI's response
+  validation & `jsonable_encoder` for the route, then the stdlib json encoder.
+- fast: `model_construct` from the ORM attributes, as rows from our own
+  database are already valid, then the precompiled pydantic-core
+  serializer, secrets omitted.
+Rows are hydrated in memory so no database is needed.
+
+ex: `python ../benchmarks/serialization.py` from `src/`
+"""
+import asyncio
+import time
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from api.responses import FastJSONResponse
+from api.schema import MetaSchema, UsersList, UsersSchema
+from api.services.pagination import construct
+from databases.models import UsersModel
+from main import app
+
+SIZES = [10, 100, 1000]
+DURATION = 1.0
+META = {
+    "current_page": 1,
+    "next_page": 2,
+    "previous_page": None,
+    "next_cursor": None,
+}
+
+
+def make_rows(count: int):
+    """Returns `count` hydrated `UsersModel`s"""
+    return UsersModel.hydrate(
+        [
+            {
+                "uuid": str(uuid4()),
+                "name": "Benchmark User",
+                "age": 30,
+                "email": f"user{i}@example.com",
+                "gender": "Nonbinary",
+                "password": "0" * 128,
+                "salt": "1" * 128,
+                "created_at": "2026-10-18 09:00:00",
+                "updated_at": "2026-10-18 09:00:00",
+                "deleted_at": None,
+            }
+            for i in range(count)
+        ]
+    )
+
+
+async def default(rows, field) -> bytes:
+    result = UsersList(
+        data=[user.serialize() for user in rows], meta={**META, "count": len(rows)}
+    )
+    content = await serialize_response(field=field, response_content=result)
+    return JSONResponse(content).body
+
+
+async def fast(rows, field) -> bytes:
+    result = UsersList.model_construct(
+        data=[construct(UsersSchema, user) for user in rows],
+        meta=MetaSchema.model_construct(**META, count=len(rows)),
+    )
+    return FastJSONResponse(result).body
+
+
+async def measure(path, rows, field) -> float:
+    """Returns the rows per second `path` encodes"""
+    iterations, start = 0, time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        await path(rows, field)
+        iterations += 1
+    return iterations * len(rows) / (time.perf_counter() - start)
+
+
+async def main():
+    route = next(
+        route for route in app.routes
+        if getattr(route, "operation_id", None) == "api.users.listed"
+    )
+    print(f"{'rows':>6}{'default rows/s':>16}{'fast rows/s':>14}{'speedup':>10}")
+    for size in SIZES:
+        rows = make_rows(size)
+        slow = await measure(default, rows, route.response_field)
+        quick = await measure(fast, rows, route.response_field)
+        print(f"{size:>6}{slow:>16.0f}{quick:>14.0f}{quick / slow:>9.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
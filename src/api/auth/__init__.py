@@ -4,6 +4,8 @@ import secrets
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 
+from api.cache import VerifiedCredentials
+from api.services import CredentialsService, Executor
 from config import Config
 
 
@@ -22,9 +24,9 @@ class Auth:
     """Container holding all Auth implementations."""
 
     @staticmethod
-    def basic(credentials: HTTPBasicCredentials = Depends(AuthConfig.basic)):
-        """Basic Auth Implementation"""
-        valid_credentials = all(
+    def is_admin(credentials: HTTPBasicCredentials) -> bool:
+        """Whether the credentials are the configured `AUTH_` pair"""
+        return all(
             [
                 secrets.compare_digest(
                     credentials.username.encode("utf8"),
@@ -36,11 +38,37 @@ class Auth:
                 ),
             ]
         )
-        if not valid_credentials:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect username or password",
-                headers={"WWW-Authenticate": "Basic"},
-            )
+
+    @staticmethod
+    def unauthorized() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+
+    @staticmethod
+    async def basic(credentials: HTTPBasicCredentials = Depends(AuthConfig.basic)):
+        """
+        Basic Auth Implementation, accepting the configured pair and the
+        database `Credentials`. Verified database credentials are cached.
+        """
+        username, password = credentials.username, credentials.password
+        if VerifiedCredentials.check(username, password) or Auth.is_admin(credentials):
+            return username
+
+        token = VerifiedCredentials.begin()
+        service = CredentialsService()
+        if not await Executor.run(service.authenticate, username, password):
+            raise Auth.unauthorized()
+
+        VerifiedCredentials.remember(username, password, token)
+        return username
+
+    @staticmethod
+    def admin(credentials: HTTPBasicCredentials = Depends(AuthConfig.basic)):
+        """Basic Auth Implementation, accepting the configured pair only"""
+        if not Auth.is_admin(credentials):
+            raise Auth.unauthorized()
 
         return credentials.username
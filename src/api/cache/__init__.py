@@ -0,0 +1,102 @@
+"""Module contains the read-through entity cache"""
+import threading
+from logging import getLogger
+from typing import Callable, Optional, Union
+
+from config import Config
+
+from .backends import MemoryBackend, SqliteBackend
+from .credentials import VerifiedCredentials
+from .totals import Totals
+
+logger = getLogger(__name__)
+
+__all__ = ["Cache", "MemoryBackend", "SqliteBackend", "Totals", "VerifiedCredentials"]
+
+
+class Cache:
+    """
+    Container for the entity cache shared by the services.
+    Entries are namespaced by table and invalidated by the model observers.
+    """
+
+    _backend: Optional[Union[MemoryBackend, SqliteBackend]] = None
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
+
+    # ? Bumped by every eviction, entries loaded before are not stored
+    generation = 0
+
+    @classmethod
+    def backend(cls) -> Union[MemoryBackend, SqliteBackend]:
+        """Returns the configured backend, created on first use"""
+        if cls._backend is None:
+            with cls._lock:
+                if cls._backend is None:
+                    if Config.Cache.backend == "sqlite":
+                        cls._backend = SqliteBackend(
+                            Config.Cache.path, Config.Cache.max_entries, Config.Cache.ttl
+                        )
+                    else:
+                        cls._backend = MemoryBackend(
+                            Config.Cache.max_entries, Config.Cache.ttl
+                        )
+        return cls._backend
+
+    @classmethod
+    def remember(cls, namespace: str, key, loader: Callable[[], dict]) -> dict:
+        """Returns the cached entry, or stores and returns the result of `loader`"""
+        if not Config.Cache.enabled:
+            return loader()
+
+        key = f"{namespace}:{key}"
+        value = cls.backend().get(key)
+        with cls._lock:
+            generation = cls.generation
+            if value is None:
+                cls.misses += 1
+            else:
+                cls.hits += 1
+        if value is None:
+            value = loader()
+            backend = cls.backend()
+            with cls._lock:
+                if generation == cls.generation:
+                    backend.set(key, value)
+        return value
+
+    @classmethod
+    def peek(cls, namespace: str, key) -> Optional[dict]:
+        """Returns the cached entry if any, without loading or counting it"""
+        if not Config.Cache.enabled:
+            return None
+        return cls.backend().get(f"{namespace}:{key}")
+
+    @classmethod
+    def forget(cls, namespace: str, key) -> None:
+        """Removes an entry, called when the entity changes"""
+        if Config.Cache.enabled:
+            backend = cls.backend()
+            with cls._lock:
+                cls.generation += 1
+                backend.delete(f"{namespace}:{key}")
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Returns the size of the cache and the hit & miss counters of this worker"""
+        return {
+            "backend": Config.Cache.backend,
+            "entries": len(cls.backend()),
+            "hits": cls.hits,
+            "misses": cls.misses,
+        }
+
+    @classmethod
+    def close(cls) -> None:
+        """Closes the backend and resets the counters"""
+        with cls._lock:
+            if cls._backend is not None:
+                cls._backend.close()
+                cls._backend = None
+            cls.hits = cls.misses = 0
@@ -0,0 +1,140 @@
+"""File contains the cache storage backends"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class MemoryBackend:
+    """
+    In-process LRU cache with a TTL per entry.
+    Entries are private to the worker process.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: dict) -> None:
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def close(self) -> None:
+        self.clear()
+
+
+class SqliteBackend:
+    """
+    LRU cache with a TTL per entry, stored in a local SQLite file which is
+    shared by every worker process on the host, so an invalidation in one
+    worker is seen by all of them.
+    """
+
+    # ? Recency is only written back when older than this, keeps hits read-only
+    touch_interval = 1.0
+
+    def __init__(self, path: str, max_entries: int = 10_000, ttl: float = 60):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Returns the connection of the calling thread"""
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entries_accessed_at"
+                " ON cache_entries (accessed_at)"
+            )
+            self.local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        row = self.connection.execute(
+            "SELECT value, expires_at, accessed_at FROM cache_entries WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at, accessed_at = row
+        if expires_at <= now:
+            self.delete(key)
+            return None
+        if now - accessed_at > self.touch_interval:
+            self.connection.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return json.loads(value)
+
+    def set(self, key: str, value: dict) -> None:
+        now = time.time()
+        connection = self.connection
+        connection.execute(
+            "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now + self.ttl, now),
+        )
+        overflow = len(self) - self.max_entries
+        if overflow > 0:
+            connection.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+            connection.execute(
+                "DELETE FROM cache_entries WHERE key IN ("
+                " SELECT key FROM cache_entries ORDER BY accessed_at LIMIT ?)",
+                (max(len(self) - self.max_entries, 0),),
+            )
+
+    def delete(self, key: str) -> None:
+        self.connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM cache_entries")
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def close(self) -> None:
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
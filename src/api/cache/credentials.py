@@ -0,0 +1,108 @@
+"""File contains the cache of verified database credentials"""
+import hmac
+import secrets
+import threading
+import time
+from hashlib import blake2b
+from typing import Optional, Tuple
+
+from config import Config
+
+from .backends import MemoryBackend, SqliteBackend
+
+
+class VerifiedCredentials:
+    """
+    Container remembering which database credentials recently verified, so a
+    request only pays a keyed hash & two lookups instead of a query and a slow
+    password hash.
+
+    Entries are stored by username and hold a keyed BLAKE2b hash of the
+    credentials, under a key private to the worker process, so no secret is
+    kept in memory.
+    Entries are private to the worker. A revocation is stamped in a SQLite
+    file shared by the workers, and every worker ignores its entries verified
+    before the stamp.
+    """
+
+    _key = secrets.token_bytes(32)
+    _backend: Optional[MemoryBackend] = None
+    _revocations: Optional[SqliteBackend] = None
+    _lock = threading.Lock()
+
+    # ? Bumped by every eviction, verifications started before are not stored
+    generation = 0
+
+    @classmethod
+    def backend(cls) -> MemoryBackend:
+        if cls._backend is None:
+            with cls._lock:
+                if cls._backend is None:
+                    cls._backend = MemoryBackend(
+                        Config.Auth.cache_max_entries, Config.Auth.cache_ttl
+                    )
+        return cls._backend
+
+    @classmethod
+    def revocations(cls) -> SqliteBackend:
+        """
+        Returns the backend of the revocation stamps, kept for the TTL. It is
+        shared whatever the cache backend, revocations are few and rare.
+        """
+        if cls._revocations is None:
+            with cls._lock:
+                if cls._revocations is None:
+                    cls._revocations = SqliteBackend(
+                        Config.Auth.revocations_path,
+                        Config.Auth.cache_max_entries,
+                        Config.Auth.cache_ttl,
+                    )
+        return cls._revocations
+
+    @classmethod
+    def digest(cls, username: str, password: str) -> bytes:
+        """Returns the keyed hash of a username & password pair"""
+        message = f"{username}\0{password}".encode("utf-8")
+        return blake2b(message, key=cls._key, digest_size=32).digest()
+
+    @classmethod
+    def check(cls, username: str, password: str) -> bool:
+        """Whether the pair was verified against the database within the TTL"""
+        entry = cls.backend().get(username)
+        if entry is None:
+            return False
+        revoked = cls.revocations().get(username)
+        if revoked is not None and revoked["at"] >= entry["since"]:
+            cls.backend().delete(username)
+            return False
+        return hmac.compare_digest(entry["digest"], cls.digest(username, password))
+
+    @classmethod
+    def begin(cls) -> Tuple[int, float]:
+        """Returns the token of a verification starting now, for `remember`"""
+        return cls.generation, time.time()
+
+    @classmethod
+    def remember(cls, username: str, password: str, token: Tuple[int, float]) -> None:
+        """Stores a verified pair, unless it was evicted since `begin`"""
+        generation, since = token
+        backend, digest = cls.backend(), cls.digest(username, password)
+        with cls._lock:
+            if generation == cls.generation:
+                backend.set(username, {"digest": digest, "since": since})
+
+    @classmethod
+    def forget(cls, username: str) -> None:
+        """Evicts a username, called when its credential changes or is revoked"""
+        backend = cls.backend()
+        with cls._lock:
+            cls.generation += 1
+            backend.delete(username)
+        cls.revocations().set(username, {"at": time.time()})
+
+    @classmethod
+    def close(cls) -> None:
+        with cls._lock:
+            if cls._revocations is not None:
+                cls._revocations.close()
+            cls._backend = cls._revocations = None
@@ -0,0 +1,47 @@
+"""File contains the incrementally maintained totals of the list endpoints"""
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+from config import Config
+
+
+class Totals:
+    """
+    Container for the row counts behind `X-Total-Count` & `meta.total`.
+
+    A total is counted once, then kept by the model observers adding their
+    creates & deletes, so a request reads a dictionary instead of running a
+    `COUNT(*)`. Totals are private to the worker, they are counted again
+    after `CACHE_TOTALS_TTL` seconds to catch up with the other workers and
+    rolled back transactions, until then they are approximate.
+    """
+
+    _totals: Dict[str, Tuple[int, float]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, name: str, counter: Callable[[], int]) -> int:
+        """Returns the total `name`, counted by `counter` when missing or stale"""
+        with cls._lock:
+            total = cls._totals.get(name)
+        if total is not None and time.monotonic() - total[1] < Config.Cache.totals_ttl:
+            return total[0]
+
+        value = counter()
+        with cls._lock:
+            cls._totals[name] = (value, time.monotonic())
+        return value
+
+    @classmethod
+    def add(cls, name: str, amount: int = 1) -> None:
+        """Adjusts a counted total, totals not counted yet are left to `get`"""
+        with cls._lock:
+            total = cls._totals.get(name)
+            if total is not None:
+                cls._totals[name] = (max(total[0] + amount, 0), total[1])
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._totals.clear()
@@ -0,0 +1,8 @@
+"""Module contains the change log of the entities & its event streams"""
+from .broadcaster import ChangesBroadcaster
+from .log import Changes
+
+__all__ = [
+    "Changes",
+    "ChangesBroadcaster",
+]
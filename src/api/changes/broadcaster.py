@@ -0,0 +1,217 @@
+"""File contains the fan-out of the change log to the event streams"""
+import asyncio
+import json
+import time
+from logging import getLogger
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from api.schema import ChangesSchema
+from config import Config
+
+from .log import Changes
+
+logger = getLogger(__name__)
+
+# ? Queued to a stream which fell behind, it ends so its client resumes
+DROPPED: Tuple[int, Optional[str]] = (0, None)
+
+
+class ChangesBroadcaster:
+    """
+    Container streaming the `Changes` as Server-Sent Events. One poller per
+    worker reads the new changes and hands each event, encoded once, to the
+    queue of every stream, so the reads do not grow with the streams.
+
+    A stream resumes after its `Last-Event-ID` from the change log, and is
+    ended when its queue of `CHANGES_QUEUE_SIZE` events overflows.
+    """
+
+    # ? Id of the last change handed to the streams
+    position = 0
+
+    _subscribers: Dict[asyncio.Queue, Optional[str]] = {}
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _task: Optional[asyncio.Task] = None
+    _ready: Optional[asyncio.Event] = None
+    _wake: Optional[asyncio.Event] = None
+    _gap_since: Optional[float] = None
+
+    @classmethod
+    def start(cls) -> None:
+        """Starts the poller on the running loop, unless it runs already"""
+        loop = asyncio.get_running_loop()
+        if cls._task and not cls._task.done() and cls._loop is loop:
+            return
+        cls._loop, cls._subscribers, cls._gap_since = loop, {}, None
+        cls._ready, cls._wake = asyncio.Event(), asyncio.Event()
+        cls._task = loop.create_task(cls.poll())
+
+    @classmethod
+    def close(cls) -> None:
+        if cls._task:
+            cls._task.cancel()
+        cls._task, cls._loop = None, None
+
+    @classmethod
+    def wake(cls) -> None:
+        """Reads the changes of this worker without waiting for the next poll"""
+        loop, wake = cls._loop, cls._wake
+        if loop is None or wake is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            # ? The loop closed in the meantime
+            pass
+
+    @classmethod
+    async def poll(cls) -> None:
+        # ? Imported late, the services import the models & their observers
+        from api.services import Executor
+
+        pruned = time.monotonic()
+        while True:
+            cls._wake.clear()
+            read = 0
+            try:
+                if not cls._ready.is_set():
+                    # ? Streams without a `Last-Event-ID` start from now on
+                    cls.position = (await Executor.run(Changes.bounds))[1]
+                    cls._ready.set()
+                rows = await Executor.run(
+                    Changes.since, cls.position, Config.Changes.chunk_size
+                )
+                read = cls.publish(cls.committed(rows))
+                if time.monotonic() - pruned >= Config.Changes.prune_interval:
+                    pruned = time.monotonic()
+                    await Executor.run(Changes.prune)
+            except Exception:
+                logger.exception("Could not read the changes")
+
+            if read == Config.Changes.chunk_size:
+                continue
+            try:
+                await asyncio.wait_for(cls._wake.wait(), Config.Changes.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    @classmethod
+    def committed(cls, rows: List[dict]) -> List[dict]:
+        """
+        Returns the rows before the first gap in the ids. A change can commit
+        after one with a higher id, so a gap is only skipped once it is older
+        than `CHANGES_GAP_TIMEOUT`, its transaction was rolled back then.
+        """
+        last = cls.position
+        for index, row in enumerate(rows):
+            if row["id"] != last + 1:
+                now = time.monotonic()
+                if cls._gap_since is None:
+                    cls._gap_since = now
+                if now - cls._gap_since < Config.Changes.gap_timeout:
+                    return rows[:index]
+            cls._gap_since = None
+            last = row["id"]
+        return rows
+
+    @classmethod
+    def publish(cls, rows: List[dict]) -> int:
+        """Queues the rows to the matching streams, returns how many were sent"""
+        for row in rows:
+            event = (row["id"], cls.encode(row))
+            for queue, entity in list(cls._subscribers.items()):
+                if entity and entity != row["entity"]:
+                    continue
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    cls.drop(queue)
+            cls.position = row["id"]
+        return len(rows)
+
+    @classmethod
+    def drop(cls, queue: asyncio.Queue) -> None:
+        cls._subscribers.pop(queue, None)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(DROPPED)
+
+    @staticmethod
+    def encode(row: dict) -> str:
+        change = ChangesSchema(
+            id=row["id"],
+            entity=row["entity"],
+            event=row["event"],
+            uuid=row["uuid"],
+            data=json.loads(row["data"]) if row["data"] else None,
+            created_at=row["created_at"],
+        )
+        return (
+            f"id: {change.id}\n"
+            f"event: {change.entity}.{change.event}\n"
+            f"data: {change.model_dump_json()}\n\n"
+        )
+
+    @classmethod
+    async def stream(
+        cls, last_event_id: Optional[int] = None, entity: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Yields the events of `entity`, or of all, after `last_event_id` from
+        the change log, then as they are published. A `reset` event tells the
+        client that changes after its id were pruned, and are missing.
+        """
+        cls.start()
+        queue = asyncio.Queue(Config.Changes.queue_size)
+        cls._subscribers[queue] = entity
+        try:
+            # ? Sent right away, so the client sees the stream is open
+            yield ": open\n\n"
+            await cls._ready.wait()
+
+            # ? Events up to `sent` were replayed, the queue may repeat them
+            sent = 0
+            if last_event_id is not None:
+                until = cls.position
+                if last_event_id < until:
+                    async for event in cls.replay(last_event_id, until, entity):
+                        yield event
+                sent = max(last_event_id, until)
+
+            while True:
+                try:
+                    id, event = await asyncio.wait_for(
+                        queue.get(), Config.Changes.heartbeat
+                    )
+                except asyncio.TimeoutError:
+                    # ? Keeps idle proxies from closing the connection
+                    yield ": ping\n\n"
+                    continue
+                if event is None:
+                    return
+                if id > sent:
+                    yield event
+        finally:
+            cls._subscribers.pop(queue, None)
+
+    @classmethod
+    async def replay(
+        cls, after: int, until: int, entity: Optional[str]
+    ) -> AsyncIterator[str]:
+        from api.services import Executor
+
+        oldest = (await Executor.run(Changes.bounds))[0]
+        if after < oldest - 1:
+            yield f"event: reset\ndata: {json.dumps({'oldest': oldest})}\n\n"
+        while after < until:
+            rows = await Executor.run(
+                Changes.since, after, Config.Changes.chunk_size, until, entity
+            )
+            for row in rows:
+                yield cls.encode(row)
+            if len(rows) < Config.Changes.chunk_size:
+                break
+            after = rows[-1]["id"]
+
+
+Changes.listeners.append(ChangesBroadcaster.wake)
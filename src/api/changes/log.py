@@ -0,0 +1,96 @@
+"""File contains the bounded change log of the users & preferences"""
+from datetime import datetime, timezone
+from logging import getLogger
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from masoniteorm.query import QueryBuilder
+from pydantic import BaseModel
+
+from api.responses.fast import secret_fields
+from config import Config
+from config.databases import DB
+
+logger = getLogger(__name__)
+
+
+class Changes:
+    """
+    Container for the `changes` table, the log of the created, updated &
+    deleted users and preferences. Rows are written by the model observers,
+    within the transaction of the change, and read in id order by the
+    `ChangesBroadcaster`, which prunes all but the newest `CHANGES_RETENTION`.
+    """
+
+    # ? Rows per multi-row INSERT statement
+    chunk_size = 500
+
+    # ? Called after every write, from the thread which wrote
+    listeners: List[Callable[[], None]] = []
+
+    @classmethod
+    def record(
+        cls, entity: str, event: str, uuid, data: Optional[BaseModel] = None
+    ) -> None:
+        """Logs an `event` of one entity, with its state after the change"""
+        cls.record_many(entity, event, [(uuid, data)])
+
+    @classmethod
+    def record_many(
+        cls,
+        entity: str,
+        event: str,
+        changes: Iterable[Tuple[object, Optional[BaseModel]]],
+    ) -> None:
+        if not Config.Changes.enabled:
+            return
+
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        rows = [
+            {
+                "entity": entity,
+                "event": event,
+                "uuid": str(uuid),
+                "data": None
+                if data is None
+                else data.model_dump_json(exclude=secret_fields(type(data))),
+                "created_at": now,
+            }
+            for uuid, data in changes
+        ]
+        for start in range(0, len(rows), cls.chunk_size):
+            cls.table().bulk_create(rows[start:start + cls.chunk_size])
+        for listener in cls.listeners:
+            listener()
+
+    @classmethod
+    def since(
+        cls,
+        id: int,
+        limit: int,
+        until: Optional[int] = None,
+        entity: Optional[str] = None,
+    ) -> List[dict]:
+        """Returns up to `limit` changes after `id`, up to `until`, in id order"""
+        builder = cls.table().where("id", ">", id)
+        if until is not None:
+            builder.where("id", "<=", until)
+        if entity:
+            builder.where("entity", entity)
+        return list(builder.order_by("id").limit(limit).get())
+
+    @classmethod
+    def bounds(cls) -> Tuple[int, int]:
+        """Returns the oldest & newest id kept, 0 when the log is empty"""
+        row = cls.table().select_raw("MIN(id) AS oldest, MAX(id) AS newest").first()
+        return (row or {}).get("oldest") or 0, (row or {}).get("newest") or 0
+
+    @classmethod
+    def prune(cls) -> None:
+        """Deletes the changes older than the newest `CHANGES_RETENTION`"""
+        newest = cls.bounds()[1]
+        if newest > Config.Changes.retention:
+            cls.table().where("id", "<=", newest - Config.Changes.retention).delete()
+
+    @staticmethod
+    def table() -> QueryBuilder:
+        return DB.get_query_builder().table("changes")
@@ -0,0 +1,95 @@
+"""Module contains the password hashing engine"""
+import hmac
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from logging import getLogger
+from typing import Iterable, List, Optional, Tuple
+
+from config import Config
+
+from .algorithms import derive, identify
+
+logger = getLogger(__name__)
+
+
+class Hasher:
+    """
+    Container hashing and verifying passwords on a pool of worker processes,
+    keeping slow key derivation off the event loop and outside the GIL.
+    """
+
+    _pool: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def pool(cls) -> Optional[ProcessPoolExecutor]:
+        """Returns the worker pool, None when hashing in-process"""
+        if cls._pool is None and Config.Hashing.workers:
+            cls._pool = ProcessPoolExecutor(
+                max_workers=Config.Hashing.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info("Started %s hashing workers", Config.Hashing.workers)
+        return cls._pool
+
+    @classmethod
+    def hash(cls, password: str, salt: str) -> str:
+        """Hashes a password with the configured algorithm"""
+        return cls.hash_many([(password, salt)])[0]
+
+    @classmethod
+    def hash_many(cls, passwords: Iterable[Tuple[str, str]]) -> List[str]:
+        """Hashes `(password, salt)` pairs, spread over the workers"""
+        algorithm = Config.Hashing.algorithm
+        params = Config.Hashing.params(algorithm)
+        passwords = list(passwords)
+
+        pool = cls.pool()
+        if pool is None or not passwords:
+            return [derive(algorithm, params, *pair) for pair in passwords]
+
+        return list(
+            pool.map(
+                derive,
+                [algorithm] * len(passwords),
+                [params] * len(passwords),
+                *zip(*passwords),
+            )
+        )
+
+    @classmethod
+    def verify(
+        cls, password: str, salt: Optional[str], encoded: Optional[str]
+    ) -> bool:
+        """Checks a password against a stored hash of any supported algorithm"""
+        if salt is None or encoded is None:
+            # ? Users without stored secrets have no password to match
+            return False
+        try:
+            algorithm, params = identify(encoded)
+        except ValueError as e:
+            logger.warning(e)
+            return False
+
+        pool = cls.pool()
+        if pool is None:
+            candidate = derive(algorithm, params, password, salt)
+        else:
+            candidate = pool.submit(derive, algorithm, params, password, salt).result()
+
+        return hmac.compare_digest(candidate.encode("utf-8"), encoded.encode("utf-8"))
+
+    @classmethod
+    def needs_rehash(cls, encoded: str) -> bool:
+        """Whether a stored hash differs from the configured algorithm or cost"""
+        algorithm = Config.Hashing.algorithm
+        try:
+            return identify(encoded) != (algorithm, Config.Hashing.params(algorithm))
+        except ValueError:
+            return True
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stops the worker processes"""
+        if cls._pool is not None:
+            cls._pool.shutdown(wait=True)
+            cls._pool = None
@@ -0,0 +1,69 @@
+"""
+File contains the password hashing algorithms.
+
+Hashes are stored as `$<algorithm>$<params>$<digest>`, the salt is kept in its
+own column. Legacy `sha512` hashes are stored as bare hex digests.
+Functions in this file run in the hashing worker processes, so they only take
+plain arguments and never read the application config themselves.
+"""
+import hashlib
+from base64 import b64encode
+from typing import Dict, Tuple
+
+
+def _sha512(password: str, salt: str, params: Dict[str, int]) -> str:
+    return hashlib.sha512(f"{password}{salt}".encode("utf-8")).hexdigest()
+
+
+def _scrypt(password: str, salt: str, params: Dict[str, int]) -> str:
+    n, r, p = 2 ** params["ln"], params["r"], params["p"]
+    digest = hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt.encode("utf-8"),
+        n=n,
+        r=r,
+        p=p,
+        maxmem=128 * r * (n + p + 2) + 1024 * 1024,
+        dklen=64,
+    )
+    return b64encode(digest).decode("ascii").rstrip("=")
+
+
+def _pbkdf2_sha256(password: str, salt: str, params: Dict[str, int]) -> str:
+    digest = hashlib.pbkdf2_hmac(
+        "sha256", password.encode("utf-8"), salt.encode("utf-8"), params["i"]
+    )
+    return b64encode(digest).decode("ascii").rstrip("=")
+
+
+ALGORITHMS = {
+    "sha512": _sha512,
+    "scrypt": _scrypt,
+    "pbkdf2_sha256": _pbkdf2_sha256,
+}
+
+
+def derive(algorithm: str, params: Dict[str, int], password: str, salt: str) -> str:
+    """Hashes `password` and returns it encoded with its algorithm & params"""
+    digest = ALGORITHMS[algorithm](password, salt or "", params)
+    if algorithm == "sha512":
+        return digest
+
+    encoded_params = ",".join(f"{key}={value}" for key, value in sorted(params.items()))
+    return f"${algorithm}${encoded_params}${digest}"
+
+
+def identify(encoded: str) -> Tuple[str, Dict[str, int]]:
+    """Returns the algorithm and params a stored hash was created with"""
+    if not encoded.startswith("$"):
+        return "sha512", {}
+
+    _, algorithm, encoded_params, _ = encoded.split("$", 3)
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown password hashing algorithm '{algorithm}'")
+
+    params = {}
+    for pair in filter(None, encoded_params.split(",")):
+        key, value = pair.split("=", 1)
+        params[key] = int(value)
+    return algorithm, params
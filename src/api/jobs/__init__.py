@@ -0,0 +1,5 @@
+"""Module contains the durable job queue and its worker pool"""
+from .queue import Jobs
+from .worker import JobsWorker
+
+__all__ = ["Jobs", "JobsWorker"]
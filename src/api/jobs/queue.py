@@ -0,0 +1,177 @@
+"""File contains the durable job queue kept in the `jobs` table"""
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Type
+from uuid import uuid4
+
+from fastapi import BackgroundTasks
+from masoniteorm.expressions import Raw
+from masoniteorm.query import QueryBuilder
+from pydantic import BaseModel
+
+from config import Config
+from config.databases import DB
+
+logger = getLogger(__name__)
+
+Handler = Callable[[List[BaseModel]], Awaitable[None]]
+
+
+class Jobs:
+    """
+    Container of the durable job queue. A job is a row of the `jobs` table,
+    written with one INSERT in the transaction of the services and run by a
+    `JobsWorker` process.
+
+    Claimed jobs are hidden for `JOBS_LEASE` seconds, so the jobs of a worker
+    which died are claimed again once their lease runs out. A job failing
+    `JOBS_MAX_ATTEMPTS` times, or whose payload is invalid, is moved to the
+    `failed_jobs` table.
+    """
+
+    # ? Rows per multi-row INSERT statement
+    chunk_size = 500
+
+    handlers: Dict[str, Tuple[Handler, Type[BaseModel]]] = {}
+
+    @classmethod
+    def handler(cls, name: str, schema: Type[BaseModel]) -> Callable:
+        """Registers the handler of the `name` jobs, given a batch of `schema`"""
+
+        def decorator(func: Handler) -> Handler:
+            cls.handlers[name] = (func, schema)
+            func.job = name
+            return func
+
+        return decorator
+
+    @classmethod
+    def dispatcher(
+        cls, background: BackgroundTasks, handler: Handler
+    ) -> Callable[[List[BaseModel]], None]:
+        """
+        Returns a function queueing payloads for a registered `handler`, which
+        a service calls within its transaction, so the jobs commit with the
+        entities they are about. Runs the handler after the response in this
+        process when the queue is off.
+        """
+
+        def dispatch(payloads: List[BaseModel]) -> None:
+            if not payloads:
+                return
+            if Config.Jobs.enabled:
+                cls.enqueue(handler.job, payloads)
+            else:
+                background.add_task(handler, payloads)
+
+        return dispatch
+
+    @classmethod
+    def enqueue(cls, name: str, payloads: List[BaseModel]) -> None:
+        """Writes a job per payload, with one statement per `chunk_size` jobs"""
+        now = cls.now()
+        jobs = [
+            {
+                "name": name,
+                # ? Secrets are masked by their `SecretStr` fields
+                "payload": payload.model_dump_json(),
+                "attempts": 0,
+                "available_at": now,
+                "created_at": now,
+            }
+            for payload in payloads
+        ]
+        for start in range(0, len(jobs), cls.chunk_size):
+            cls.table().bulk_create(jobs[start:start + cls.chunk_size])
+
+    @classmethod
+    def claim(cls, limit: int, names: Optional[List[str]] = None) -> List[dict]:
+        """
+        Claims up to `limit` available jobs sharing the name of the oldest one.
+        The claim is a conditional UPDATE moving them past their lease, so two
+        workers never claim the same job and no row stays locked.
+        """
+        now = cls.now()
+        builder = cls.table().select("name").where("available_at", "<=", now)
+        if names:
+            builder.where_in("name", names)
+        oldest = builder.order_by("available_at").order_by("id").first()
+        if not oldest:
+            return []
+
+        batch = (
+            cls.table()
+            .select("id")
+            .where("name", oldest["name"])
+            .where("available_at", "<=", now)
+            .order_by("id")
+            .limit(limit)
+            .get()
+        )
+        token = uuid4().hex
+        cls.table().where_in("id", [job["id"] for job in batch]).where(
+            "available_at", "<=", now
+        ).update(
+            {
+                "available_at": cls.now(Config.Jobs.lease),
+                "reserved_by": token,
+                "attempts": Raw("attempts + 1"),
+            }
+        )
+        # ? Jobs claimed by another worker in the meantime are not returned
+        return list(cls.table().where("reserved_by", token).order_by("id").get())
+
+    @classmethod
+    def complete(cls, jobs: List[dict]) -> None:
+        """Deletes run jobs, unless their lease ran out and they were claimed again"""
+        claims: Dict[str, List[int]] = {}
+        for job in jobs:
+            claims.setdefault(job["reserved_by"], []).append(job["id"])
+        for token, ids in claims.items():
+            cls.table().where_in("id", ids).where("reserved_by", token).delete()
+
+    @classmethod
+    def fail(cls, job: dict, error: str, final: bool = False) -> bool:
+        """
+        Schedules the retry of a claimed job, each waiting twice as long as
+        the previous one. Returns whether the job was dead-lettered instead,
+        as it is right away when `final`.
+        """
+        if not final and job["attempts"] < Config.Jobs.max_attempts:
+            delay = min(
+                Config.Jobs.backoff * 2 ** (job["attempts"] - 1),
+                Config.Jobs.backoff_max,
+            )
+            # ? A job whose lease ran out belongs to the worker which claimed it
+            cls.table().where("id", job["id"]).where(
+                "reserved_by", job["reserved_by"]
+            ).update({"available_at": cls.now(delay), "last_error": error})
+            return False
+
+        with DB.transaction():
+            DB.get_query_builder().table("failed_jobs").bulk_create(
+                [
+                    {
+                        "job_id": job["id"],
+                        "name": job["name"],
+                        "payload": job["payload"],
+                        "attempts": job["attempts"],
+                        "error": error,
+                        "created_at": job["created_at"],
+                        "failed_at": cls.now(),
+                    }
+                ]
+            )
+            cls.table().where("id", job["id"]).delete()
+        logger.warning("Job %s %s failed for good: %s", job["name"], job["id"], error)
+        return True
+
+    @staticmethod
+    def table() -> QueryBuilder:
+        return DB.get_query_builder().table("jobs")
+
+    @staticmethod
+    def now(seconds: float = 0) -> str:
+        """Returns the UTC time in `seconds`, as stored in the `jobs` table"""
+        moment = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+        return moment.strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,109 @@
+"""File contains the worker pool running the queued jobs"""
+import asyncio
+import signal
+from logging import getLogger
+from typing import List, Optional
+
+from pydantic import ValidationError
+
+from api.metrics import Metrics
+from api.services import Executor
+from config import Config
+
+from .queue import Jobs
+
+logger = getLogger(__name__)
+
+
+class JobsWorker:
+    """
+    Runs the queued `Jobs` with `JOBS_CONCURRENCY` consumers in one process,
+    apart from the web workers. A consumer claims a batch of jobs sharing a
+    name and hands it to their handler in one call.
+    """
+
+    def __init__(
+        self, names: Optional[List[str]] = None, concurrency: Optional[int] = None
+    ):
+        # ? Jobs of other names are left to other workers
+        self.names = names
+        self.concurrency = concurrency or Config.Jobs.concurrency
+        self.stopping = asyncio.Event()
+
+    async def run(self) -> None:
+        """Runs the consumers until SIGINT or SIGTERM, finishing their batches"""
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.stopping.set)
+        logger.info("Started jobs worker with %s consumers", self.concurrency)
+        await asyncio.gather(*(self.consume() for _ in range(self.concurrency)))
+        logger.info("Stopped jobs worker")
+
+    async def consume(self) -> None:
+        while not self.stopping.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("Could not claim jobs")
+                claimed = 0
+            if not claimed:
+                try:
+                    await asyncio.wait_for(
+                        self.stopping.wait(), Config.Jobs.poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run_once(self) -> int:
+        """Claims & runs one batch, returns the number of claimed jobs"""
+        jobs = await Executor.run(Jobs.claim, Config.Jobs.batch_size, self.names)
+        if jobs:
+            await self.handle(jobs)
+        return len(jobs)
+
+    async def handle(self, jobs: List[dict]) -> None:
+        """
+        Runs the valid jobs of a batch in one call of their handler. Invalid
+        payloads are dead-lettered apart, a failing handler retries the batch
+        as a whole, so no job which ran is run again right away.
+        """
+        name = jobs[0]["name"]
+        if name not in Jobs.handlers:
+            await self.fail(jobs, LookupError(f"No handler for the {name} jobs"))
+            return
+        handler, schema = Jobs.handlers[name]
+
+        valid, payloads = [], []
+        for job in jobs:
+            try:
+                payloads.append(schema.model_validate_json(job["payload"]))
+            except ValidationError as e:
+                # ? Retrying can not make a payload valid
+                await self.fail([job], e, final=True)
+            else:
+                valid.append(job)
+        if not valid:
+            return
+
+        try:
+            await handler(payloads)
+        except Exception as e:
+            await self.fail(valid, e)
+            return
+
+        await Executor.run(Jobs.complete, valid)
+        Metrics.jobs.inc(name, "done", amount=len(valid))
+
+    async def fail(self, jobs: List[dict], error: Exception, final: bool = False):
+        name = jobs[0]["name"]
+        logger.error(
+            "Jobs %s %s failed",
+            name,
+            ", ".join(str(job["id"]) for job in jobs),
+            exc_info=error,
+        )
+        for job in jobs:
+            dead = await Executor.run(
+                Jobs.fail, job, f"{type(error).__name__}: {error}", final
+            )
+            Metrics.jobs.inc(name, "dead" if dead else "retried")
@@ -0,0 +1,303 @@
+"""Module contains the Prometheus metrics of the API"""
+import fcntl
+import json
+import os
+import threading
+import time
+from functools import wraps
+from logging import getLogger
+from time import perf_counter
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple
+
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from api.cache import Cache
+from config import Config
+from databases.connections import (
+    ConnectionPool,
+    InstrumentedConnection,
+    PoolTimeout,
+)
+
+from .registry import Counter, Gauge, Histogram, fold, merge, render
+
+logger = getLogger(__name__)
+
+__all__ = ["Metrics", "MetricsRoute", "Counter", "Gauge", "Histogram"]
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+POOL_GAUGES = ("size", "in_use", "idle", "waiters")
+POOL_COUNTERS = ("checkouts", "timeouts", "created", "discarded")
+
+
+class Metrics:
+    """
+    Container for the metrics of this worker process.
+
+    Every worker writes a snapshot to `METRICS_DIRECTORY/<pid>-<start>.json`
+    every `METRICS_FLUSH_INTERVAL` seconds, the worker serving `/metrics`
+    merges them, so the totals are correct behind any number of uvicorn
+    workers. The snapshots of exited workers are folded into `exited.json`,
+    a reused pid starts a file of its own.
+    """
+
+    requests = Counter(
+        "http_requests_total",
+        "Requests handled, by operation & status",
+        ("operation_id", "method", "status"),
+    )
+    in_flight = Gauge(
+        "http_requests_in_flight",
+        "Requests being handled, by operation",
+        ("operation_id",),
+    )
+    duration = Histogram(
+        "http_request_duration_seconds",
+        "Time until the last byte of the response, by operation",
+        ("operation_id",),
+        REQUEST_BUCKETS,
+    )
+    queries = Histogram(
+        "db_query_duration_seconds",
+        "Database statements, by connection & statement type",
+        ("connection", "statement"),
+        QUERY_BUCKETS,
+    )
+    tasks = Histogram(
+        "background_task_duration_seconds",
+        "Background tasks run after a response, by task",
+        ("task",),
+        REQUEST_BUCKETS,
+    )
+    task_failures = Counter(
+        "background_task_failures_total", "Background tasks which raised", ("task",)
+    )
+    jobs = Counter(
+        "jobs_total", "Queued jobs run by the workers, by job & result", ("job", "result")
+    )
+    cache = Counter(
+        "cache_lookups_total", "Entity cache lookups, by result", ("result",)
+    )
+    pool = Gauge("db_pool_connections", "Pool connections, by state", ("pool", "state"))
+    pool_events = Counter(
+        "db_pool_events_total",
+        "Pool checkouts, timeouts & connections",
+        ("pool", "event"),
+    )
+
+    registry = [
+        requests, in_flight, duration, queries, tasks, task_failures, jobs, cache,
+        pool, pool_events,
+    ]
+
+    _flusher: Optional[threading.Thread] = None
+    _stopped = threading.Event()
+    # ? Pid & start time naming the snapshot of this process
+    _process: Optional[Tuple[int, int]] = None
+
+    @classmethod
+    def record_query(
+        cls, connection: str, query: str, bindings: tuple, elapsed: float
+    ) -> None:
+        """Listener of the `InstrumentedConnection` drivers"""
+        statement = query.lstrip()[:6].lower()
+        if statement not in ("select", "insert", "update", "delete"):
+            statement = "other"
+        cls.queries.observe(connection, statement, value=elapsed)
+
+    @classmethod
+    def task(cls, name: str) -> Callable:
+        """Decorator timing a background task"""
+
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    cls.task_failures.inc(name)
+                    raise
+                finally:
+                    cls.tasks.observe(name, value=perf_counter() - start)
+
+            return wrapper
+
+        return decorator
+
+    @classmethod
+    def collect(cls) -> None:
+        """Copies the statistics kept by the cache & connection pools"""
+        cls.cache.set("hit", value=Cache.hits)
+        cls.cache.set("miss", value=Cache.misses)
+        for name, stats in ConnectionPool.all_stats().items():
+            stats = stats.to_dict()
+            for state in POOL_GAUGES:
+                cls.pool.set(name, state, value=stats[state])
+            for event in POOL_COUNTERS:
+                cls.pool_events.set(name, event, value=stats[event])
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, dict]:
+        cls.collect()
+        return {metric.name: metric.snapshot() for metric in cls.registry}
+
+    @classmethod
+    def flush(cls) -> None:
+        """Writes the snapshot of this worker for the others to merge"""
+        directory = Config.Metrics.directory
+        if not directory:
+            return
+        if cls._process is None or cls._process[0] != os.getpid():
+            # ? Forked processes get a name of their own
+            cls._process = (os.getpid(), time.time_ns())
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "{}-{}.json".format(*cls._process))
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(cls.snapshot(), file)
+        os.replace(f"{path}.tmp", path)
+
+    @staticmethod
+    def alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    @staticmethod
+    def read(path: str) -> Optional[dict]:
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning("Skipping metrics file %s: %s", path, e)
+            return None
+
+    @classmethod
+    def render(cls) -> str:
+        """Returns the metrics of every worker in the Prometheus text format"""
+        directory = Config.Metrics.directory
+        if not directory:
+            return render(merge([(cls.snapshot(), True)]))
+
+        cls.flush()
+        exited = os.path.join(directory, "exited.json")
+        # ? Folding & reading exclude each other, no total is counted twice
+        with open(os.path.join(directory, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            live, dead, folded = [], [], []
+            for entry in os.scandir(directory):
+                if not entry.name.endswith(".json") or entry.path == exited:
+                    continue
+                snapshot = cls.read(entry.path)
+                if snapshot is None:
+                    continue
+                if cls.alive(int(entry.name[:-5].split("-")[0])):
+                    live.append(snapshot)
+                else:
+                    dead.append(snapshot)
+                    folded.append(entry.path)
+
+            if os.path.exists(exited):
+                dead.append(cls.read(exited) or {})
+            if folded:
+                dead = [fold(dead)]
+                with open(f"{exited}.tmp", "w") as file:
+                    json.dump(dead[0], file)
+                os.replace(f"{exited}.tmp", exited)
+                for path in folded:
+                    os.remove(path)
+            snapshots = [(snapshot, True) for snapshot in live]
+            snapshots += [(snapshot, False) for snapshot in dead]
+        return render(merge(snapshots))
+
+    @classmethod
+    def start(cls) -> None:
+        """Starts writing snapshots of this worker in the background"""
+        if cls._flusher is not None or not Config.Metrics.directory:
+            return
+        cls._stopped.clear()
+
+        def flush():
+            while not cls._stopped.wait(Config.Metrics.flush_interval):
+                try:
+                    cls.flush()
+                except OSError as e:
+                    logger.warning("Could not write metrics: %s", e)
+
+        cls._flusher = threading.Thread(target=flush, name="metrics", daemon=True)
+        cls._flusher.start()
+
+    @classmethod
+    def close(cls) -> None:
+        """Writes a last snapshot and stops the background writes"""
+        if cls._flusher is None:
+            return
+        cls._stopped.set()
+        cls._flusher.join()
+        cls._flusher = None
+        cls.flush()
+
+
+InstrumentedConnection.listeners.append(Metrics.record_query)
+
+
+class MetricsRoute(APIRoute):
+    """
+    Route class counting & timing the requests of an endpoint by its
+    `operation_id`, set as the `route_class` of the routers. Streaming
+    responses are timed until their last chunk.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        operation = self.operation_id or self.name
+
+        async def route(request: Request) -> Response:
+            if not Config.Metrics.enabled:
+                return await handler(request)
+
+            method, start = request.method, perf_counter()
+            Metrics.in_flight.inc(operation)
+            try:
+                response = await handler(request)
+            except Exception as e:
+                if isinstance(e, RequestValidationError):
+                    status = 422
+                elif isinstance(e, PoolTimeout):
+                    status = 503
+                else:
+                    status = getattr(e, "status_code", 500)
+                finish(method, status, start)
+                raise
+
+            if isinstance(response, StreamingResponse):
+                response.body_iterator = stream(
+                    response.body_iterator, method, response.status_code, start
+                )
+            else:
+                finish(method, response.status_code, start)
+            return response
+
+        async def stream(
+            body: AsyncIterator, method: str, status: int, start: float
+        ) -> AsyncIterator:
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                finish(method, status, start)
+
+        def finish(method: str, status: int, start: float) -> None:
+            Metrics.in_flight.dec(operation)
+            Metrics.requests.inc(operation, method, str(status))
+            Metrics.duration.observe(operation, value=perf_counter() - start)
+
+        return route
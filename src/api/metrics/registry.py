@@ -0,0 +1,188 @@
+"""File contains the metric types and the Prometheus text format"""
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+
+class Metric:
+    """
+    Base of the metric types. Values are kept per label tuple, an update only
+    holds the metric's own lock for a dictionary write.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values: Dict[Labels, object] = {}
+        self.lock = threading.Lock()
+
+    def snapshot(self) -> dict:
+        """Returns the JSON serializable state, merged across processes"""
+        with self.lock:
+            samples = [[list(labels), value] for labels, value in self.values.items()]
+        return {
+            "type": self.type,
+            "help": self.help,
+            "labels": list(self.labels),
+            "samples": samples,
+        }
+
+
+class Counter(Metric):
+    """Monotonic total, summed over every process that ever reported"""
+
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def set(self, *labels: str, value: float) -> None:
+        """Sets a total which is counted elsewhere, like the pool checkouts"""
+        with self.lock:
+            self.values[labels] = value
+
+
+class Gauge(Metric):
+    """Current value, summed over the live processes"""
+
+    type = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self.lock:
+            self.values[labels] = value
+
+
+class Histogram(Metric):
+    """Observations counted in cumulative buckets, summed like a counter"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = (),
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, *labels: str, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(labels)
+            if state is None:
+                # ? One count per bucket & +Inf, then the sum
+                state = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            samples = [
+                [list(labels), list(state)] for labels, state in self.values.items()
+            ]
+        return {
+            "type": self.type,
+            "help": self.help,
+            "labels": list(self.labels),
+            "buckets": list(self.buckets),
+            "samples": samples,
+        }
+
+
+def merge(snapshots: Iterable[Tuple[dict, bool]]) -> Dict[str, dict]:
+    """
+    Merges `(snapshot, alive)` pairs of several processes. Counters and
+    histograms keep the totals of exited processes, gauges only count the
+    live ones.
+    """
+    merged: Dict[str, dict] = {}
+    for snapshot, alive in snapshots:
+        for name, metric in snapshot.items():
+            if metric["type"] == "gauge" and not alive:
+                continue
+            target = merged.setdefault(name, {**metric, "samples": {}})
+            samples = target["samples"]
+            for labels, value in metric["samples"]:
+                key = tuple(labels)
+                current = samples.get(key)
+                if current is None:
+                    samples[key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    samples[key] = [a + b for a, b in zip(current, value)]
+                else:
+                    samples[key] = current + value
+    return merged
+
+
+def fold(snapshots: Iterable[dict]) -> Dict[str, dict]:
+    """
+    Sums the snapshots of exited processes into one, in the snapshot format.
+    Their gauges are dropped, like `merge` does.
+    """
+    return {
+        name: {
+            **metric,
+            "samples": [[list(labels), value] for labels, value in metric["samples"].items()],
+        }
+        for name, metric in merge((snapshot, False) for snapshot in snapshots).items()
+    }
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def render(metrics: Dict[str, dict]) -> str:
+    """Renders merged metrics in the Prometheus text exposition format 0.0.4"""
+    lines: List[str] = []
+    for name in sorted(metrics):
+        metric = metrics[name]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        names = metric["labels"]
+        for labels, value in sorted(metric["samples"].items()):
+            if metric["type"] != "histogram":
+                formatted = _format_labels(names, labels)
+                lines.append(f"{name}{formatted} {_format_value(value)}")
+                continue
+
+            cumulative = 0
+            bounds = [*map(_format_value, metric["buckets"]), "+Inf"]
+            for bound, count in zip(bounds, value[:-1]):
+                cumulative += count
+                le = _format_labels(names, labels, f'le="{bound}"')
+                lines.append(f"{name}_bucket{le} {cumulative}")
+            formatted = _format_labels(names, labels)
+            lines.append(f"{name}_sum{formatted} {_format_value(value[-1])}")
+            lines.append(f"{name}_count{formatted} {cumulative}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,176 @@
+"""Module contains the per request query profiler of the API"""
+import threading
+from collections import Counter, deque
+from contextvars import ContextVar
+from logging import getLogger
+from time import perf_counter
+from typing import Deque, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.services import Executor
+from config import Config
+from config.databases import DB
+from databases.connections import InstrumentedConnection
+
+logger = getLogger(__name__)
+
+__all__ = ["Profile", "Profiler", "ProfilerMiddleware"]
+
+EXPLAIN = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "mysql": "EXPLAIN ",
+    "postgres": "EXPLAIN ",
+}
+
+
+class Profile:
+    """
+    Statements of a single request. Recorded from the executor threads,
+    which receive a copy of the request context.
+    """
+
+    def __init__(self):
+        self.start = perf_counter()
+        self.queries = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+        self.slow: List[Tuple[str, str, tuple, float]] = []
+        self.lock = threading.Lock()
+
+    def record(self, connection: str, query: str, bindings: tuple, elapsed: float):
+        with self.lock:
+            self.queries += 1
+            self.duration += elapsed
+            # ? The ORM binds values as `?`, identical text is the same statement
+            self.statements[(connection, query)] += 1
+            if elapsed * 1000 >= Config.Profiler.slow_query_ms:
+                self.slow.append((connection, query, tuple(bindings or ()), elapsed))
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        """Returns the statements ran often enough to be an N+1"""
+        threshold = Config.Profiler.repeated_queries
+        with self.lock:
+            return [
+                (query, count)
+                for (_, query), count in self.statements.items()
+                if count >= threshold
+            ]
+
+    def server_timing(self) -> str:
+        """Returns the `Server-Timing` header value, `app` excludes the queries"""
+        total = (perf_counter() - self.start) * 1000
+        with self.lock:
+            queries, db = self.queries, self.duration * 1000
+        return (
+            f'db;dur={db:.2f};desc="{queries} queries", '
+            f"app;dur={max(total - db, 0):.2f}"
+        )
+
+
+class Profiler:
+    """
+    Container for the debug query profiler, enabled with `PROFILER_ENABLED`.
+
+    Every statement of a request is counted & timed, repeated statements are
+    reported as a possible N+1 and slow ones are logged with their `EXPLAIN`.
+    """
+
+    current: ContextVar[Optional[Profile]] = ContextVar("profile", default=None)
+    captured: Deque[dict] = deque(maxlen=Config.Profiler.captured)
+
+    @classmethod
+    def record_query(
+        cls, connection: str, query: str, bindings: tuple, elapsed: float
+    ) -> None:
+        """Listener of the `InstrumentedConnection` drivers"""
+        profile = cls.current.get()
+        if profile is not None:
+            profile.record(connection, query, bindings, elapsed)
+
+    @staticmethod
+    def explain(connection: str, query: str, bindings: tuple) -> List[dict]:
+        """Returns the query plan of a statement, on a connection of its own"""
+        details = Config.Database.databases.get(connection) or {}
+        prefix = EXPLAIN.get(details.get("driver"))
+        if prefix is None:
+            return []
+        try:
+            return list(DB.statement(prefix + query, bindings, connection=connection))
+        except Exception as e:
+            logger.warning("Could not explain %s: %s", query, e)
+            return []
+
+    @classmethod
+    def report(cls, profile: Profile, endpoint: str) -> None:
+        """Logs the possible N+1s & the slow statements of a finished request"""
+        logger.debug(
+            "%s ran %s queries in %.2f ms",
+            endpoint,
+            profile.queries,
+            profile.duration * 1000,
+        )
+        for query, count in profile.repeated():
+            logger.warning(
+                "Possible N+1 in %s, statement ran %s times: %s", endpoint, count, query
+            )
+        for connection, query, bindings, elapsed in profile.slow:
+            plan = []
+            if Config.Profiler.explain:
+                plan = cls.explain(connection, query, bindings)
+            cls.captured.append(
+                {
+                    "endpoint": endpoint,
+                    "connection": connection,
+                    "query": query,
+                    "bindings": bindings,
+                    "duration_ms": round(elapsed * 1000, 2),
+                    "plan": plan,
+                }
+            )
+            logger.warning(
+                "Slow query in %s (%.2f ms): %s %s\n%s",
+                endpoint,
+                elapsed * 1000,
+                query,
+                bindings,
+                "\n".join(str(row) for row in plan),
+            )
+
+
+InstrumentedConnection.listeners.append(Profiler.record_query)
+
+
+class ProfilerMiddleware:
+    """
+    ASGI middleware opening a `Profile` per request when the profiler is
+    enabled, answering with its `Server-Timing` header. Statements of a
+    streamed body are reported, but come after the header was sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not Config.Profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile()
+        token = Profiler.current.set(profile)
+
+        async def send_timed(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            Profiler.current.reset(token)
+            route = scope.get("route")
+            endpoint = f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+            # ? Outside of the profile, the explains are not recorded themselves
+            await Executor.run(Profiler.report, profile, endpoint)
@@ -0,0 +1,102 @@
+"""Module contains the per-client rate limiter"""
+import threading
+from math import ceil
+from typing import Callable, Optional, Union
+
+from fastapi import HTTPException, Request, Response, Security, status
+from fastapi.security import HTTPBasicCredentials
+
+from api.auth import Auth, AuthConfig
+from config import Config
+
+from .backends import MemoryBuckets, SqliteBuckets
+
+__all__ = ["RateLimit", "MemoryBuckets", "SqliteBuckets"]
+
+
+class RateLimit:
+    """
+    Container for the token bucket rate limiter, used as a router dependency.
+    Every router has its own `RATELIMIT_<ROUTER>_RATE` & `_BURST`, a client
+    is its authenticated username, or its address on public endpoints and
+    failed authentications.
+    """
+
+    _backend: Optional[Union[MemoryBuckets, SqliteBuckets]] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def backend(cls) -> Union[MemoryBuckets, SqliteBuckets]:
+        """Returns the configured backend, created on first use"""
+        if cls._backend is None:
+            with cls._lock:
+                if cls._backend is None:
+                    if Config.RateLimit.backend == "sqlite":
+                        cls._backend = SqliteBuckets(Config.RateLimit.path)
+                    else:
+                        cls._backend = MemoryBuckets(Config.RateLimit.max_clients)
+        return cls._backend
+
+    @classmethod
+    def check(cls, name: str, client: str, response: Response) -> None:
+        """Takes a token for `client` or raises 429, sets the `RateLimit-*` headers"""
+        if not Config.RateLimit.enabled:
+            return
+
+        rate, burst = Config.RateLimit.limits(name)
+        allowed, tokens = cls.backend().take(f"{name}:{client}", rate, burst)
+        headers = {
+            "ratelimit-limit": str(burst),
+            "ratelimit-remaining": str(int(tokens)),
+            "ratelimit-reset": str(ceil((burst - tokens) / rate)),
+        }
+        if not allowed:
+            headers["retry-after"] = str(max(ceil((1 - tokens) / rate), 1))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers=headers,
+            )
+        response.headers.update(headers)
+
+    @staticmethod
+    def address(request: Request) -> str:
+        return request.client.host if request.client else "unknown"
+
+    @classmethod
+    def by_client(cls, name: str) -> Callable:
+        """
+        Returns a dependency authenticating with `Auth.basic`, then limiting
+        the username. Failed attempts are charged to the client address, so
+        guessing credentials is limited as well.
+        """
+
+        async def limit(
+            request: Request,
+            response: Response,
+            credentials: HTTPBasicCredentials = Security(AuthConfig.basic),
+        ):
+            try:
+                username = await Auth.basic(credentials)
+            except HTTPException:
+                cls.check(name, f"ip:{cls.address(request)}", response)
+                raise
+            cls.check(name, f"user:{username}", response)
+
+        return limit
+
+    @classmethod
+    def by_address(cls, name: str) -> Callable:
+        """Returns a dependency limiting the client address, for public endpoints"""
+
+        async def limit(request: Request, response: Response):
+            cls.check(name, f"ip:{cls.address(request)}", response)
+
+        return limit
+
+    @classmethod
+    def close(cls) -> None:
+        with cls._lock:
+            if cls._backend is not None:
+                cls._backend.close()
+                cls._backend = None
@@ -0,0 +1,121 @@
+"""File contains the token bucket storage backends"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+
+
+class MemoryBuckets:
+    """
+    In-process token buckets, least recently used clients are evicted.
+    Buckets are private to the worker process.
+    """
+
+    def __init__(self, max_clients: int = 100_000):
+        self.max_clients = max_clients
+        self.buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: int) -> Tuple[bool, float]:
+        """Takes a token from a bucket, returns if it was allowed & tokens left"""
+        now = time.time()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = [float(burst), now]
+                if len(self.buckets) > self.max_clients:
+                    self.buckets.popitem(last=False)
+            else:
+                self.buckets.move_to_end(key)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+
+            allowed = bucket[0] >= 1
+            if allowed:
+                bucket[0] -= 1
+            return allowed, bucket[0]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    def close(self) -> None:
+        self.clear()
+
+
+class SqliteBuckets:
+    """
+    Token buckets in a local SQLite file shared by every worker process on
+    the host, each check is a single UPSERT so workers never race.
+    """
+
+    # ? Seconds between removing buckets which refilled completely
+    prune_interval = 60.0
+
+    take_query = (
+        "INSERT INTO rate_limits (key, tokens, allowed, updated_at, refill)"
+        " VALUES (:key, :burst - 1, 1, :now, :burst / :rate)"
+        " ON CONFLICT (key) DO UPDATE SET"
+        "  tokens = min(:burst, tokens + (:now - updated_at) * :rate)"
+        "   - (min(:burst, tokens + (:now - updated_at) * :rate) >= 1),"
+        "  allowed = min(:burst, tokens + (:now - updated_at) * :rate) >= 1,"
+        "  updated_at = :now,"
+        "  refill = :burst / :rate"
+        " RETURNING allowed, tokens"
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self.local = threading.local()
+        self.pruned_at = time.time()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Returns the connection of the calling thread"""
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # ? Buckets are disposable, losing the last writes on a crash is fine
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                " key TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " allowed INTEGER NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " refill REAL NOT NULL)"
+            )
+            self.local.connection = connection
+        return connection
+
+    def take(self, key: str, rate: float, burst: int) -> Tuple[bool, float]:
+        """Takes a token from a bucket, returns if it was allowed & tokens left"""
+        now = time.time()
+        connection = self.connection
+        allowed, tokens = connection.execute(
+            self.take_query, {"key": key, "rate": rate, "burst": burst, "now": now}
+        ).fetchone()
+
+        if now - self.pruned_at > self.prune_interval:
+            self.pruned_at = now
+            connection.execute(
+                "DELETE FROM rate_limits WHERE updated_at + refill < ?", (now,)
+            )
+        return bool(allowed), tokens
+
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM rate_limits")
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+    def close(self) -> None:
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
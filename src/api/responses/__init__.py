@@ -1,13 +1,21 @@
 """Module loads and contains API Responses"""
+from .changes import ChangesResponses
+from .credentials import CredentialsResponses
+from .fast import FastJSONResponse
 from .generic import GenericResponses
 from .preferences import PreferencesResponses
+from .streaming import ProgressResponse
 from .system import SystemResponses
 from .users import UsersResponses
 
 
 __all__ = [
+    "ChangesResponses",
+    "CredentialsResponses",
+    "FastJSONResponse",
     "GenericResponses",
     "PreferencesResponses",
+    "ProgressResponse",
     "SystemResponses",
     "UsersResponses"
 ]
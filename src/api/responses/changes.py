@@ -0,0 +1,23 @@
+"""File contains responses for the '/changes' endpoint router"""
+from fastapi import status
+
+from .generic import GenericResponses
+
+
+class ChangesResponses:
+    """Class contains changes responses"""
+
+    stream = {
+        status.HTTP_200_OK: {
+            "content": {"text/event-stream": {}},
+            "description": "Changes streamed as Server-Sent Events, until closed",
+            "headers": {
+                "cache-control": {"description": "Cache Control", "type": "string"},
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.unprocessable,
+        **GenericResponses.server_error,
+    }
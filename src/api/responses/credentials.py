@@ -0,0 +1,86 @@
+"""File contains responses for the '/credentials' endpoint router"""
+from fastapi import status
+
+from api.schema.credentials import (
+    CredentialsCreated,
+    CredentialsSchema,
+    CredentialsList,
+)
+
+from .generic import GenericResponses
+
+
+class CredentialsResponses:
+    """Class contains credentials responses"""
+
+    create = {
+        status.HTTP_201_CREATED: {
+            "model": CredentialsCreated,
+            "description": "Credentials created, the secret is only shown once",
+            "headers": {
+                "content-length": {
+                    "description": "Content Length",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.unprocessable,
+        **GenericResponses.server_error,
+        **GenericResponses.conflict
+    }
+
+    retrieve = {
+        status.HTTP_200_OK: {
+            "model": CredentialsSchema,
+            "description": "Credentials successfully retrieved",
+            "headers": {
+                "content-length": {
+                    "description": "Content Length",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.not_found,
+        **GenericResponses.server_error,
+    }
+
+    listed = {
+        status.HTTP_200_OK: {
+            "model": CredentialsList,
+            "description": "Credentials successfully retrieved",
+            "headers": {
+                "content-length": {
+                    "description": "Content Length",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.server_error,
+    }
+
+    delete = {
+        status.HTTP_204_NO_CONTENT: {
+            "content": None,
+            "description": "Credentials successfully revoked",
+            "headers": {
+                "content-length": {
+                    "description": "Content Length",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.not_found,
+        **GenericResponses.server_error,
+    }
@@ -0,0 +1,49 @@
+"""File contains the pydantic-core backed JSON response class"""
+from functools import lru_cache
+from typing import Any, Optional, Type, get_args, get_origin
+
+from fastapi.responses import Response
+from pydantic import BaseModel, SecretStr
+
+
+def _exclude(annotation: Any):
+    """Returns the `exclude` entry of a field annotation, None if it holds no secrets"""
+    if annotation is SecretStr:
+        return True
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return secret_fields(annotation)
+
+    excluded = next(filter(None, map(_exclude, get_args(annotation))), None)
+    if excluded and get_origin(annotation) in (list, set, tuple, frozenset):
+        return {"__all__": excluded}
+    return excluded
+
+
+@lru_cache(maxsize=None)
+def secret_fields(model: Type[BaseModel]) -> Optional[dict]:
+    """Returns the `exclude` mapping of every `SecretStr` field of `model`"""
+    exclude = {}
+    for name, field in model.model_fields.items():
+        excluded = _exclude(field.annotation)
+        if excluded:
+            exclude[name] = excluded
+    return exclude or None
+
+
+class FastJSONResponse(Response):
+    """
+    Encodes a pydantic model straight to bytes with its precompiled serializer,
+    skipping FastAPI's response validation and `jsonable_encoder` pass.
+    `SecretStr` fields are left out instead of masked.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            model = type(content)
+            # ? Models built with `model_construct` hold unvalidated types
+            return model.__pydantic_serializer__.to_json(
+                content, exclude=secret_fields(model), warnings=False
+            )
+        return super().render(content)
@@ -41,6 +41,18 @@ class GenericResponses:
         }
     }
 
+    not_modified = {
+        status.HTTP_304_NOT_MODIFIED: {
+            "content": None,
+            "description": "Resource matches the `If-None-Match` ETag, body is omitted",
+            "headers": {
+                "etag": {"description": "Entity tag of the resource", "type": "string"},
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        }
+    }
+
     # ? 400s
     unauthorized = {
         status.HTTP_401_UNAUTHORIZED: {
@@ -57,6 +69,21 @@ class GenericResponses:
         }
     }
 
+    forbidden = {
+        status.HTTP_403_FORBIDDEN: {
+            "model": List[MessageSchema],
+            "description": "Not allowed to perform the requested operation",
+            "headers": {
+                "content-length": {
+                    "description": "Content Length",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        }
+    }
+
     not_found = {
         status.HTTP_404_NOT_FOUND: {
             "model": List[MessageSchema],
@@ -87,6 +114,21 @@ class GenericResponses:
         }
     }
 
+    precondition_failed = {
+        status.HTTP_412_PRECONDITION_FAILED: {
+            "model": List[MessageSchema],
+            "description": "Resource no longer matches the `If-Match` ETag",
+            "headers": {
+                "content-length": {
+                    "description": "Content Length",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        }
+    }
+
     unprocessable = {
         status.HTTP_422_UNPROCESSABLE_ENTITY: {
             "model": List[MessageSchema],
@@ -102,6 +144,31 @@ class GenericResponses:
         }
     }
 
+    too_many_requests = {
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "model": List[MessageSchema],
+            "description": "Rate limit of the client exceeded",
+            "headers": {
+                "retry-after": {
+                    "description": "Seconds until a request is allowed again",
+                    "type": "int",
+                },
+                "ratelimit-limit": {
+                    "description": "Requests allowed in a burst",
+                    "type": "int",
+                },
+                "ratelimit-remaining": {
+                    "description": "Requests left in the burst",
+                    "type": "int",
+                },
+                "ratelimit-reset": {
+                    "description": "Seconds until the burst is fully available",
+                    "type": "int",
+                },
+            },
+        }
+    }
+
     # ? 500s
     server_error = {
         status.HTTP_500_INTERNAL_SERVER_ERROR: {
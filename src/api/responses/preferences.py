@@ -38,8 +38,10 @@ class PreferencesResponses:
                 },
                 "date": {"description": "Response Date", "type": "Datetime"},
                 "server": {"description": "API Server", "type": "string"},
+                "etag": {"description": "Entity tag of the resource", "type": "string"},
             },
         },
+        **GenericResponses.not_modified,
         **GenericResponses.unauthorized,
         **GenericResponses.not_found,
         **GenericResponses.server_error,
@@ -56,13 +58,50 @@ class PreferencesResponses:
                 },
                 "date": {"description": "Response Date", "type": "Datetime"},
                 "server": {"description": "API Server", "type": "string"},
+                "etag": {"description": "Entity tag of the resource", "type": "string"},
             },
         },
+        **GenericResponses.not_modified,
         **GenericResponses.unauthorized,
         **GenericResponses.not_found,
         **GenericResponses.server_error,
     }
 
+    total = {
+        status.HTTP_200_OK: {
+            "content": None,
+            "description": "Preferences successfully counted",
+            "headers": {
+                "x-total-count": {
+                    "description": "Number of items in the list",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.server_error,
+    }
+
+    export = {
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "Preferences streamed one row per line, without secrets",
+            "headers": {
+                "content-disposition": {
+                    "description": "Attachment filename",
+                    "type": "string",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.unprocessable,
+        **GenericResponses.server_error,
+    }
+
     create = {
         status.HTTP_201_CREATED: {
             "model": PreferencesSchema,
@@ -87,6 +126,7 @@ class PreferencesResponses:
             "model": PreferencesSchema,
             "description": "Preferences successfully updated",
             "headers": {
+                "etag": {"description": "Entity tag of the new version", "type": "string"},
                 "content-length": {
                     "description": "Content Length",
                     "type": "int",
@@ -97,6 +137,7 @@ class PreferencesResponses:
         },
         **GenericResponses.unauthorized,
         **GenericResponses.not_found,
+        **GenericResponses.precondition_failed,
         **GenericResponses.server_error,
     }
 
@@ -105,6 +146,7 @@ class PreferencesResponses:
             "model": PreferencesSchema,
             "description": "Preferences successfully replaced",
             "headers": {
+                "etag": {"description": "Entity tag of the new version", "type": "string"},
                 "content-length": {
                     "description": "Content Length",
                     "type": "int",
@@ -115,6 +157,7 @@ class PreferencesResponses:
         },
         **GenericResponses.unauthorized,
         **GenericResponses.not_found,
+        **GenericResponses.precondition_failed,
         **GenericResponses.server_error,
     }
 
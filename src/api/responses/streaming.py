@@ -0,0 +1,18 @@
+"""File contains the streaming response used while the request is still read"""
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class ProgressResponse(StreamingResponse):
+    """
+    `StreamingResponse` which reports progress while the request body is read.
+
+    Starlette listens for the client disconnecting on `receive` while it
+    streams, which would consume the body chunks the endpoint still reads.
+    A disconnect surfaces from `Request.stream` instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -2,6 +2,8 @@
 from fastapi import status
 from fastapi.responses import HTMLResponse
 
+from api.schema import CacheStatsSchema
+
 from .generic import GenericResponses
 
 
@@ -24,3 +26,37 @@ class SystemResponses:
         **GenericResponses.server_error,
         **GenericResponses.unauthorized,
     }
+
+    cache = {
+        status.HTTP_200_OK: {
+            "model": CacheStatsSchema,
+            "description": "Cache statistics successfully retrieved",
+            "headers": {
+                "content-length": {
+                    "description": "Content Length",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.server_error,
+    }
+
+    metrics = {
+        status.HTTP_200_OK: {
+            "content": {"text/plain": {}},
+            "description": "Metrics of every worker in the Prometheus text format",
+            "headers": {
+                "content-length": {
+                    "description": "Content Length",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.server_error,
+    }
@@ -3,7 +3,15 @@ from typing import List
 
 from fastapi import status
 
-from api.schema.users import UsersSchema, UsersList
+from api.schema.preferences import PreferencesSchema
+from api.schema.users import (
+    UsersSchema,
+    UsersDetailSchema,
+    UsersDetailList,
+    UsersSearchList,
+    UsersBulkList,
+    UsersImportSummary,
+)
 
 from .generic import GenericResponses
 
@@ -29,7 +37,7 @@ class UsersResponses:
 
     retrieve = {
         status.HTTP_200_OK: {
-            "model": UsersSchema,
+            "model": UsersDetailSchema,
             "description": "Users successfully retrieved",
             "headers": {
                 "content-length": {
@@ -38,8 +46,10 @@ class UsersResponses:
                 },
                 "date": {"description": "Response Date", "type": "Datetime"},
                 "server": {"description": "API Server", "type": "string"},
+                "etag": {"description": "Entity tag of the resource", "type": "string"},
             },
         },
+        **GenericResponses.not_modified,
         **GenericResponses.unauthorized,
         **GenericResponses.not_found,
         **GenericResponses.server_error,
@@ -47,7 +57,7 @@ class UsersResponses:
 
     listed = {
         status.HTTP_200_OK: {
-            "model": UsersList,
+            "model": UsersDetailList,
             "description": "UsersList successfully retrieved",
             "headers": {
                 "content-length": {
@@ -56,13 +66,89 @@ class UsersResponses:
                 },
                 "date": {"description": "Response Date", "type": "Datetime"},
                 "server": {"description": "API Server", "type": "string"},
+                "etag": {"description": "Entity tag of the resource", "type": "string"},
             },
         },
+        **GenericResponses.not_modified,
         **GenericResponses.unauthorized,
         **GenericResponses.not_found,
         **GenericResponses.server_error,
     }
 
+    total = {
+        status.HTTP_200_OK: {
+            "content": None,
+            "description": "Users successfully counted",
+            "headers": {
+                "x-total-count": {
+                    "description": "Number of items matching the filters",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.unprocessable,
+        **GenericResponses.server_error,
+    }
+
+    preferences = {
+        status.HTTP_200_OK: {
+            "model": PreferencesSchema,
+            "description": "Preferences of the Users successfully retrieved",
+            "headers": {
+                "content-length": {
+                    "description": "Content Length",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+                "etag": {"description": "Entity tag of the resource", "type": "string"},
+            },
+        },
+        **GenericResponses.not_modified,
+        **GenericResponses.unauthorized,
+        **GenericResponses.not_found,
+        **GenericResponses.server_error,
+    }
+
+    search = {
+        status.HTTP_200_OK: {
+            "model": UsersSearchList,
+            "description": "Matching Users successfully retrieved",
+            "headers": {
+                "content-length": {
+                    "description": "Content Length",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.unprocessable,
+        **GenericResponses.server_error,
+    }
+
+    export = {
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "Users streamed one row per line, without secrets",
+            "headers": {
+                "content-disposition": {
+                    "description": "Attachment filename",
+                    "type": "string",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.unprocessable,
+        **GenericResponses.server_error,
+    }
+
     create = {
         status.HTTP_201_CREATED: {
             "model": UsersSchema,
@@ -82,11 +168,49 @@ class UsersResponses:
         **GenericResponses.conflict
     }
 
+    bulk = {
+        status.HTTP_207_MULTI_STATUS: {
+            "model": UsersBulkList,
+            "description": "Users processed, see the status of each item",
+            "headers": {
+                "content-length": {
+                    "description": "Content Length",
+                    "type": "int",
+                },
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.unprocessable,
+        **GenericResponses.server_error,
+        **GenericResponses.conflict
+    }
+
+    imported = {
+        status.HTTP_200_OK: {
+            "model": UsersImportSummary,
+            "content": {"application/x-ndjson": {}},
+            "description": (
+                "Users imported, see the failed lines. With "
+                "`Accept: application/x-ndjson` every error & progress event is "
+                "streamed as a line while the file is read, then the summary"
+            ),
+            "headers": {
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.server_error,
+    }
+
     update = {
         status.HTTP_200_OK: {
             "model": UsersSchema,
             "description": "Users successfully updated",
             "headers": {
+                "etag": {"description": "Entity tag of the new version", "type": "string"},
                 "content-length": {
                     "description": "Content Length",
                     "type": "int",
@@ -97,6 +221,7 @@ class UsersResponses:
         },
         **GenericResponses.unauthorized,
         **GenericResponses.not_found,
+        **GenericResponses.precondition_failed,
         **GenericResponses.server_error,
     }
 
@@ -105,6 +230,7 @@ class UsersResponses:
             "model": UsersSchema,
             "description": "Users successfully replaced",
             "headers": {
+                "etag": {"description": "Entity tag of the new version", "type": "string"},
                 "content-length": {
                     "description": "Content Length",
                     "type": "int",
@@ -115,6 +241,22 @@ class UsersResponses:
         },
         **GenericResponses.unauthorized,
         **GenericResponses.not_found,
+        **GenericResponses.precondition_failed,
+        **GenericResponses.server_error,
+    }
+
+    verify = {
+        status.HTTP_204_NO_CONTENT: {
+            "content": None,
+            "description": "Users password is correct",
+            "headers": {
+                "date": {"description": "Response Date", "type": "Datetime"},
+                "server": {"description": "API Server", "type": "string"},
+            },
+        },
+        **GenericResponses.unauthorized,
+        **GenericResponses.forbidden,
+        **GenericResponses.unprocessable,
         **GenericResponses.server_error,
     }
 
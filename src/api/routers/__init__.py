@@ -1,9 +1,13 @@
 """Module loads and contains API Routers"""
+from .changes import router as changes_router
+from .credentials import router as credentials_router
 from .preferences import router as preferences_router
 from .system import router as system_router
 from .users import router as users_router
 
 routers = [
+    changes_router,
+    credentials_router,
     preferences_router,
     system_router,
     users_router
@@ -0,0 +1,54 @@
+"""File contains endpoint router for '/changes'"""
+from logging import getLogger
+from typing import Optional
+
+from fastapi import APIRouter, Header, Query, Security
+from fastapi.responses import StreamingResponse
+
+from api.changes import ChangesBroadcaster
+from api.metrics import MetricsRoute
+from api.ratelimit import RateLimit
+from api.responses import ChangesResponses, GenericResponses
+from api.schema import ChangesEntity
+
+# ? Router Configuration
+logger = getLogger(__name__)
+router = APIRouter(
+    route_class=MetricsRoute,
+    prefix="/api/changes",
+    tags=["Changes"],
+    dependencies=[Security(RateLimit.by_client("changes"))],
+    responses=GenericResponses.too_many_requests,
+)
+
+
+# ? Router endpoints
+@router.get(
+    path="/stream",
+    operation_id="api.changes.stream",
+    responses=ChangesResponses.stream,
+)
+async def stream_changes(
+    entity: Optional[ChangesEntity] = Query(
+        None, description="Only stream the changes of this entity"
+    ),
+    last_event_id: Optional[int] = Query(
+        None, ge=0, description="Resume after this change, for clients without headers"
+    ),
+    last_event_id_header: Optional[int] = Header(
+        None, alias="last-event-id", ge=0, description="Resume after this change"
+    ),
+) -> StreamingResponse:
+    """
+    Endpoint is used to stream the created, updated & deleted `Users` and
+    `Preferences` entities as Server-Sent Events
+    """
+    # ? Sent by reconnecting clients, it is newer than the id they started with
+    if last_event_id_header is not None:
+        last_event_id = last_event_id_header
+
+    return StreamingResponse(
+        ChangesBroadcaster.stream(last_event_id, entity),
+        media_type="text/event-stream",
+        headers={"cache-control": "no-cache", "x-accel-buffering": "no"},
+    )
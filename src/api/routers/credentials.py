@@ -0,0 +1,90 @@
+"""File contains endpoint router for '/credentials'"""
+from logging import getLogger
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Path, Query, Security, status
+from fastapi.responses import Response
+
+from api.auth import Auth
+from api.metrics import MetricsRoute
+from api.responses import CredentialsResponses
+from api.schema import (
+    CredentialsCreateSchema,
+    CredentialsCreated,
+    CredentialsList,
+    CredentialsSchema,
+)
+from api.services import CredentialsService, Executor
+
+# ? Router Configuration
+logger = getLogger(__name__)
+router = APIRouter(
+    route_class=MetricsRoute,
+    prefix="/api/credentials",
+    tags=["Credentials"],
+    dependencies=[Security(Auth.admin)],
+)
+
+
+# ? Router Endpoints
+@router.post(
+    path="/",
+    operation_id="api.credentials.create",
+    responses=CredentialsResponses.create,
+    status_code=201,
+)
+async def create_credentials(
+    credentials: CredentialsCreateSchema,
+    service=Depends(CredentialsService),
+) -> CredentialsCreated:
+    """Endpoint is used to create `Credentials` for a client, with a generated secret"""
+    return await Executor.run(service.create, credentials)
+
+
+@router.get(
+    path="/",
+    operation_id="api.credentials.listed",
+    responses=CredentialsResponses.listed,
+)
+async def retrieve_credentials_list(
+    page_nr: int = Query(1, description="Page number to retrieve", ge=1),
+    limit: int = Query(10, description="Number of items to retrieve", ge=1),
+    cursor: Optional[str] = Query(
+        None, description="`next_cursor` of the previous page, replaces `page_nr`"
+    ),
+    service=Depends(CredentialsService),
+) -> CredentialsList:
+    """Endpoint is used to retrieve a list of active `Credentials`"""
+    return await Executor.run(
+        service.listed, limit=limit, page_nr=page_nr, cursor=cursor
+    )
+
+
+@router.get(
+    path="/{uuid}",
+    operation_id="api.credentials.retrieve",
+    responses=CredentialsResponses.retrieve,
+)
+async def retrieve_credentials(
+    uuid: UUID = Path(description="Unique Identifier for the Credentials to retrieve"),
+    service=Depends(CredentialsService),
+) -> CredentialsSchema:
+    """Endpoint is used to retrieve active `Credentials`"""
+    return await Executor.run(service.retrieve, uuid)
+
+
+@router.delete(
+    path="/{uuid}",
+    operation_id="api.credentials.delete",
+    responses=CredentialsResponses.delete,
+    status_code=204,
+)
+async def delete_credentials(
+    uuid: UUID = Path(description="Unique Identifier for the Credentials to revoke"),
+    service=Depends(CredentialsService),
+):
+    """Endpoint is used to revoke `Credentials`, effective immediately"""
+    await Executor.run(service.delete, uuid)
+
+    return Response(content=None, status_code=status.HTTP_204_NO_CONTENT)
@@ -1,5 +1,7 @@
 """File contains endpoint router for '/preferences'"""
+from datetime import datetime
 from logging import getLogger
+from typing import Literal, Optional
 from uuid import UUID
 
 from fastapi import (
@@ -8,25 +10,38 @@ from fastapi import (
     Depends,
     Path,
     Query,
+    Request,
     Security,
     status,
 )
 from fastapi.exceptions import HTTPException
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 
-from api.auth import Auth
+from api.metrics import MetricsRoute
+from api.ratelimit import RateLimit
+from api.responses.fast import FastJSONResponse
+from api.responses.generic import GenericResponses
 from api.responses.preferences import PreferencesResponses
 from api.schema.preferences import PreferencesSchema, PreferencesList
+from api.services.etag import ETag
+from api.services.executor import Executor
+from api.services.export import Export
+from api.services.fields import Fields, Fieldset
 from api.services.preferences import PreferencesService
+from config import Config
 
 # ? Router Configuration
 logger = getLogger(__name__)
 router = APIRouter(
+    route_class=MetricsRoute,
     prefix="/api/preferences",
     tags=["Preferences CRUD"],
-    dependencies=[Security(Auth.basic)],
+    dependencies=[Security(RateLimit.by_client("preferences"))],
+    responses=GenericResponses.too_many_requests,
 )
 
+preferences_fields = Fields.query(PreferencesSchema)
+
 # ? Router CRUD Endpoints
 @router.options(
     path="/",
@@ -48,42 +63,143 @@ async def preferences_options(service=Depends(PreferencesService)):
 )
 async def create_preferences(
     preferences: PreferencesSchema,
+    response: Response,
     service=Depends(PreferencesService),
 ):
     """Endpoint is used to create a `Preferences` entity"""
-    result = service.create(preferences)
+    result = await Executor.run(service.create, preferences)
+    response.headers["etag"] = ETag.entity(result.version)
 
     return result
 
 
+@router.head(
+    path="/", operation_id="api.preferences.total", responses=PreferencesResponses.total
+)
+async def count_preferences(service=Depends(PreferencesService)) -> Response:
+    """Endpoint is used to count the `Preferences` entities, as `X-Total-Count`"""
+    total = await Executor.run(service.total)
+
+    return Response(headers={"x-total-count": str(total)})
+
+
 @router.get(
     path="/", operation_id="api.preferences.listed", responses=PreferencesResponses.listed
 )
 async def retrieve_preferences_list(
+    request: Request,
+    response: Response,
     page_nr: int = Query(1, description="Page number to retrieve", ge=1),
     limit: int = Query(10, description="Number of items to retrieve", ge=1),
+    cursor: Optional[str] = Query(
+        None, description="`next_cursor` of the previous page, replaces `page_nr`"
+    ),
+    fields: Fieldset = Depends(preferences_fields),
+    with_total: bool = Query(False, description="Add `meta.total`, kept by counters"),
     service=Depends(PreferencesService),
 ) -> PreferencesList:
     """Endpoint is used to retrieve a list of `Preferences` entities"""
-    result = service.listed(limit=limit, page_nr=page_nr)
+    if_none_match = request.headers.get("if-none-match")
+    total = await Executor.run(service.total) if with_total else None
+    if if_none_match and not fields:
+        etag = await Executor.run(
+            service.listed_etag,
+            limit=limit,
+            page_nr=page_nr,
+            cursor=cursor,
+            total=total,
+        )
+        if ETag.matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": etag}
+            )
+
+    result = await Executor.run(
+        service.listed,
+        limit=limit,
+        page_nr=page_nr,
+        cursor=cursor,
+        fields=fields,
+        total=total,
+    )
+    if fields:
+        return Fields.response(result, if_none_match)
+    etag = ETag.page(result)
+    if Config.Responses.fast_json:
+        return FastJSONResponse(result, headers={"etag": etag})
+    response.headers["etag"] = etag
 
     return result
 
 
+@router.get(
+    path="/export",
+    operation_id="api.preferences.export",
+    responses=PreferencesResponses.export,
+)
+async def export_preferences(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Export format"),
+    created_after: Optional[datetime] = Query(
+        None, description="Only rows created at or after"
+    ),
+    created_before: Optional[datetime] = Query(
+        None, description="Only rows created at or before"
+    ),
+    updated_after: Optional[datetime] = Query(
+        None, description="Only rows updated at or after"
+    ),
+    updated_before: Optional[datetime] = Query(
+        None, description="Only rows updated at or before"
+    ),
+    service=Depends(PreferencesService),
+) -> StreamingResponse:
+    """Endpoint is used to stream every `Preferences` entity as NDJSON or CSV"""
+    rows = Executor.iterate(
+        service.export,
+        format=format,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+
+    return StreamingResponse(
+        rows,
+        media_type=Export.media_types[format],
+        headers={"content-disposition": f'attachment; filename="preferences.{format}"'},
+    )
+
+
 @router.get(
     path="/{uuid}",
     operation_id="api.preferences.retrieve",
     responses=PreferencesResponses.retrieve,
 )
 async def retrieve_preferences(
+    request: Request,
+    response: Response,
     uuid: UUID = Path(
         description="Unique Identifier for the Preferences Entity to retrieve",
     ),
+    fields: Fieldset = Depends(preferences_fields),
     service=Depends(PreferencesService),
 ):
     """Endpoint is used to retrieve a `Preferences` entity"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and not fields:
+        etag = await Executor.run(service.etag, uuid)
+        if ETag.matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": etag}
+            )
 
-    result = service.retrieve(uuid)
+    result = await Executor.run(service.retrieve, uuid, fields)
+    if fields:
+        return Fields.response(result, if_none_match)
+    etag = ETag.entity(result.version)
+    if Config.Responses.fast_json:
+        return FastJSONResponse(result, headers={"etag": etag})
+    response.headers["etag"] = etag
 
     return result
 
@@ -94,6 +210,8 @@ async def retrieve_preferences(
     responses=PreferencesResponses.replace,
 )
 async def replace_preferences(
+    request: Request,
+    response: Response,
     preferences: PreferencesSchema,
     uuid: str = Path(
         ...,
@@ -102,7 +220,10 @@ async def replace_preferences(
     service=Depends(PreferencesService),
 ):
     """Endpoint is used to replace a `Preferences` entity"""
-    result = service.replace(uuid, preferences)
+    result = await Executor.run(
+        service.replace, uuid, preferences, request.headers.get("if-match")
+    )
+    response.headers["etag"] = ETag.entity(result.version)
 
     return result
 
@@ -113,6 +234,8 @@ async def replace_preferences(
     responses=PreferencesResponses.update,
 )
 async def update_preferences(
+    request: Request,
+    response: Response,
     preferences: PreferencesSchema,
     uuid: str = Path(
         ...,
@@ -121,7 +244,10 @@ async def update_preferences(
     service=Depends(PreferencesService),
 ):
     """Endpoint is used to update a `Preferences` entity"""
-    result = service.update(uuid, preferences)
+    result = await Executor.run(
+        service.update, uuid, preferences, request.headers.get("if-match")
+    )
+    response.headers["etag"] = ETag.entity(result.version)
 
     return result
 
@@ -140,6 +266,6 @@ async def delete_preferences(
     service=Depends(PreferencesService),
 ):
     """Endpoint is used to delete a `Preferences` entity"""
-    service.delete(uuid)
+    await Executor.run(service.delete, uuid)
 
     return Response(content=None, status_code=status.HTTP_204_NO_CONTENT)
@@ -1,28 +1,74 @@
 """File contains system endpoint router and template controller"""
+from functools import lru_cache
 from logging import getLogger
 
-from fastapi import APIRouter, Request
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, Request, Security
+from fastapi.responses import PlainTextResponse
 
-from api.responses import SystemResponses
+from api.metrics import Metrics, MetricsRoute
+from api.cache import Cache
+from api.ratelimit import RateLimit
+from api.responses import GenericResponses, SystemResponses
+from api.schema import CacheStatsSchema
+from api.services import Executor
 
 # ? Setup Router
 logger = getLogger(__name__)
-templates = Jinja2Templates(directory="frontend/templates")
 router = APIRouter(
+    route_class=MetricsRoute,
     tags=["System"],
+    responses=GenericResponses.too_many_requests,
 )
 
 
+@lru_cache(maxsize=None)
+def templates():
+    """Returns the front-end templates, jinja2 is loaded by the first page served"""
+    from fastapi.templating import Jinja2Templates
+
+    return Jinja2Templates(directory="frontend/templates")
+
+
 # ? Router endpoints
 @router.get(
     path="/",
     operation_id="api.system.index",
     status_code=200,
     responses=SystemResponses.index,
+    dependencies=[Depends(RateLimit.by_address("system"))],
 )
 async def index(request: Request):
     """
     Serves front-end templates
     """
-    return templates.TemplateResponse(request, "pages/index.html")
+    return templates().TemplateResponse(request, "pages/index.html")
+
+
+@router.get(
+    path="/api/system/cache",
+    operation_id="api.system.cache",
+    responses=SystemResponses.cache,
+    dependencies=[Security(RateLimit.by_client("system"))],
+)
+async def cache_stats() -> CacheStatsSchema:
+    """
+    Returns the entity cache statistics of the worker serving the request
+    """
+    result = await Executor.run(Cache.stats)
+
+    return CacheStatsSchema(**result)
+
+
+@router.get(
+    path="/metrics",
+    operation_id="api.system.metrics",
+    responses=SystemResponses.metrics,
+    dependencies=[Security(RateLimit.by_client("system"))],
+)
+async def metrics() -> PlainTextResponse:
+    """
+    Returns the metrics of every worker in the Prometheus text format
+    """
+    result = await Executor.run(Metrics.render)
+
+    return PlainTextResponse(result, media_type="text/plain; version=0.0.4")
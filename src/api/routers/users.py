@@ -1,34 +1,112 @@
 """File contains endpoint router for '/users'"""
+import json
+from datetime import datetime
+from functools import partial
 from logging import getLogger
+from typing import List, Literal, Optional
 from uuid import UUID
 
 from fastapi import (
     APIRouter,
     BackgroundTasks,
+    Body,
     Depends,
     Path,
     Query,
+    Request,
     Security,
     status,
 )
 from fastapi.exceptions import HTTPException
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 
-from api.auth import Auth
-from api.responses import UsersResponses
-from api.schema import UsersSchema, UsersList
-from api.services import UsersService
+from api.jobs import Jobs
+from api.metrics import MetricsRoute
+from api.ratelimit import RateLimit
+from api.responses import (
+    FastJSONResponse,
+    GenericResponses,
+    ProgressResponse,
+    UsersResponses,
+)
+from api.schema import (
+    PreferencesSchema,
+    UsersSchema,
+    UsersDetailSchema,
+    UsersDetailList,
+    UsersFilters,
+    UsersSort,
+    UsersSearchList,
+    UsersBulkList,
+    UsersImportError,
+    UsersImportSummary,
+    UsersPasswordSchema,
+)
+from api.schema.users import USERS_BULK_LIMIT, USERS_IMPORT_MAX_ERRORS
+from api.services import (
+    ETag,
+    Executor,
+    Export,
+    Fields,
+    Fieldset,
+    Import,
+    PreferencesService,
+    UsersService,
+)
 from api.tasks import UsersTasks
+from config import Config
 
 # ? Router Configuration
 logger = getLogger(__name__)
 router = APIRouter(
+    route_class=MetricsRoute,
     prefix="/api/users",
     tags=["Users CRUD"],
-    dependencies=[Security(Auth.basic)],
+    dependencies=[Security(RateLimit.by_client("users"))],
+    responses=GenericResponses.too_many_requests,
 )
 
 
+# ? Relations which reads can include, loaded with one query per response
+Include = Optional[Literal["preferences"]]
+INCLUDE_DESCRIPTION = "Relation to include in each user, loaded in one query"
+SORT_DESCRIPTION = "Column to sort by, descending with a leading `-`"
+TOTAL_DESCRIPTION = "Add `meta.total`, kept by counters unless the list is filtered"
+users_fields = Fields.query(UsersSchema)
+
+
+def users_filters(
+    email: Optional[str] = Query(None, description="Exact email"),
+    name: Optional[str] = Query(None, description="Name prefix", min_length=1),
+    gender: Optional[str] = Query(None, description="Exact gender"),
+    min_age: Optional[int] = Query(None, description="Minimum age, inclusive", ge=0),
+    max_age: Optional[int] = Query(None, description="Maximum age, inclusive", ge=0),
+    created_after: Optional[datetime] = Query(
+        None, description="Only rows created at or after"
+    ),
+    created_before: Optional[datetime] = Query(
+        None, description="Only rows created at or before"
+    ),
+    updated_after: Optional[datetime] = Query(
+        None, description="Only rows updated at or after"
+    ),
+    updated_before: Optional[datetime] = Query(
+        None, description="Only rows updated at or before"
+    ),
+) -> UsersFilters:
+    """Collects the list filters of the `Users` endpoints"""
+    return UsersFilters(
+        email=email,
+        name=name,
+        gender=gender,
+        min_age=min_age,
+        max_age=max_age,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+
 # ? Router Endpoints
 @router.options(
     path="/",
@@ -49,61 +127,368 @@ async def users_options(service=Depends(UsersService)) -> UsersSchema:
 )
 async def create_users(
     users: UsersSchema,
+    response: Response,
     background: BackgroundTasks,
     service=Depends(UsersService),
 ) -> UsersSchema:
     """Endpoint is used to create a `Users` entity"""
-    result = service.create(users)
-
-    # ? Is executed after the router has returned a response
-    background.add_task(UsersTasks.do_after, entity=result)
+    # ? Is executed by the jobs worker, after the router has returned a response
+    dispatch = Jobs.dispatcher(background, UsersTasks.do_after)
+    result = await Executor.run(service.create, users, dispatch)
+    response.headers["etag"] = ETag.entity(result.version)
 
     return result
 
 
+@router.post(
+    path="/bulk",
+    operation_id="api.users.bulk",
+    responses=UsersResponses.bulk,
+    status_code=207,
+)
+async def create_users_bulk(
+    background: BackgroundTasks,
+    users: List[UsersSchema] = Body(
+        ..., min_length=1, max_length=USERS_BULK_LIMIT
+    ),
+    service=Depends(UsersService),
+) -> UsersBulkList:
+    """Endpoint is used to create many `Users` entities in one request"""
+    # ? Is executed by the jobs worker, after the router has returned a response
+    dispatch = Jobs.dispatcher(background, UsersTasks.do_after)
+    return await Executor.run(service.bulk_create, users, dispatch)
+
+
+@router.post(
+    path="/import",
+    operation_id="api.users.import",
+    responses=UsersResponses.imported,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "description": "One `Users` entity per line, password & salt included",
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def import_users(
+    request: Request,
+    service=Depends(UsersService),
+) -> UsersImportSummary:
+    """Endpoint is used to create `Users` entities from an NDJSON upload"""
+    importer = Import(
+        write=partial(Executor.run, service.import_chunk),
+        error=lambda line, status, detail: UsersImportError(
+            line=line, status=status, detail=detail
+        ),
+    )
+    events = importer.run(request.stream())
+
+    # ? Streams every error & progress event while the upload is read
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+
+        async def lines():
+            async for event in events:
+                if isinstance(event, UsersImportError):
+                    event = {"event": "error", **event.model_dump()}
+                else:
+                    event = {"event": "progress", **event}
+                yield json.dumps(event) + "\n"
+            yield json.dumps({"event": "summary", **importer.progress()}) + "\n"
+
+        return ProgressResponse(lines(), media_type="application/x-ndjson")
+
+    errors = []
+    async for event in events:
+        if not isinstance(event, UsersImportError):
+            continue
+        if len(errors) < USERS_IMPORT_MAX_ERRORS:
+            errors.append(event)
+
+    return UsersImportSummary(**importer.progress(), errors=errors)
+
+
+@router.head(
+    path="/",
+    operation_id="api.users.total",
+    responses=UsersResponses.total,
+)
+async def count_users(
+    filters: UsersFilters = Depends(users_filters),
+    service=Depends(UsersService),
+) -> Response:
+    """Endpoint is used to count the `Users` entities, as `X-Total-Count`"""
+    total = await Executor.run(service.total, filters)
+
+    return Response(headers={"x-total-count": str(total)})
+
+
 @router.get(
     path="/",
     operation_id="api.users.listed",
     responses=UsersResponses.listed
 )
 async def retrieve_users_list(
+    request: Request,
+    response: Response,
     page_nr: int = Query(1, description="Page number to retrieve", ge=1),
     limit: int = Query(10, description="Number of items to retrieve", ge=1),
+    cursor: Optional[str] = Query(
+        None, description="`next_cursor` of the previous page, replaces `page_nr`"
+    ),
+    include: Include = Query(None, description=INCLUDE_DESCRIPTION),
+    fields: Fieldset = Depends(users_fields),
+    filters: UsersFilters = Depends(users_filters),
+    sort: UsersSort = Query("created_at", description=SORT_DESCRIPTION),
+    with_total: bool = Query(False, description=TOTAL_DESCRIPTION),
     service=Depends(UsersService),
-) -> UsersList:
+) -> UsersDetailList:
     """Endpoint is used to retrieve a list of `Users` entities"""
-    result = service.listed(limit=limit, page_nr=page_nr)
+    if_none_match = request.headers.get("if-none-match")
+    total = None
+    if with_total:
+        total = await Executor.run(service.total, filters)
+    # ? The narrow query only knows the versions of the users themselves
+    if if_none_match and not include and not fields:
+        etag = await Executor.run(
+            service.listed_etag,
+            limit=limit,
+            page_nr=page_nr,
+            cursor=cursor,
+            filters=filters,
+            sort=sort,
+            total=total,
+        )
+        if ETag.matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": etag}
+            )
+
+    result = await Executor.run(
+        service.listed,
+        limit=limit,
+        page_nr=page_nr,
+        cursor=cursor,
+        include=include,
+        fields=fields,
+        filters=filters,
+        sort=sort,
+        total=total,
+    )
+    if fields:
+        return Fields.response(result, if_none_match)
+    etag = ETag.page(result)
+    if include and ETag.matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": etag}
+        )
+    if Config.Responses.fast_json:
+        return FastJSONResponse(result, headers={"etag": etag})
+    response.headers["etag"] = etag
 
     return result
 
 
+@router.head(
+    path="/deleted",
+    operation_id="api.users.deleted_total",
+    responses=UsersResponses.total,
+)
+async def count_deleted_users(
+    filters: UsersFilters = Depends(users_filters),
+    service=Depends(UsersService),
+) -> Response:
+    """Endpoint is used to count the deleted `Users` entities, as `X-Total-Count`"""
+    total = await Executor.run(service.deleted_total, filters)
+
+    return Response(headers={"x-total-count": str(total)})
+
+
 @router.get(
     path="/deleted",
     operation_id="api.users.deleted",
     responses=UsersResponses.listed,
 )
 async def retrieve_deleted_users(
+    request: Request,
+    response: Response,
     page_nr: int = Query(1, description="Page number to retrieve", ge=1),
     limit: int = Query(10, description="Number of items to retrieve", ge=1),
+    cursor: Optional[str] = Query(
+        None, description="`next_cursor` of the previous page, replaces `page_nr`"
+    ),
+    include: Include = Query(None, description=INCLUDE_DESCRIPTION),
+    fields: Fieldset = Depends(users_fields),
+    filters: UsersFilters = Depends(users_filters),
+    sort: UsersSort = Query("created_at", description=SORT_DESCRIPTION),
+    with_total: bool = Query(False, description=TOTAL_DESCRIPTION),
     service=Depends(UsersService),
-) -> UsersList:
+) -> UsersDetailList:
     """Endpoint is used to retrieve a list of `Users` entities"""
-    result = service.deleted(limit=limit, page_nr=page_nr)
+    if_none_match = request.headers.get("if-none-match")
+    total = None
+    if with_total:
+        total = await Executor.run(service.deleted_total, filters)
+    # ? The narrow query only knows the versions of the users themselves
+    if if_none_match and not include and not fields:
+        etag = await Executor.run(
+            service.deleted_etag,
+            limit=limit,
+            page_nr=page_nr,
+            cursor=cursor,
+            filters=filters,
+            sort=sort,
+            total=total,
+        )
+        if ETag.matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": etag}
+            )
+
+    result = await Executor.run(
+        service.deleted,
+        limit=limit,
+        page_nr=page_nr,
+        cursor=cursor,
+        include=include,
+        fields=fields,
+        filters=filters,
+        sort=sort,
+        total=total,
+    )
+    if fields:
+        return Fields.response(result, if_none_match)
+    etag = ETag.page(result)
+    if include and ETag.matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": etag}
+        )
+    if Config.Responses.fast_json:
+        return FastJSONResponse(result, headers={"etag": etag})
+    response.headers["etag"] = etag
 
     return result
 
 
+@router.get(
+    path="/search",
+    operation_id="api.users.search",
+    responses=UsersResponses.search,
+)
+async def search_users(
+    q: str = Query(
+        ..., description="Prefix of the name, a word of it, or the email", min_length=1
+    ),
+    limit: int = Query(
+        10,
+        description="Number of items to retrieve",
+        ge=1,
+        le=Config.Search.max_results,
+    ),
+    service=Depends(UsersService),
+) -> UsersSearchList:
+    """Endpoint is used to search `Users` entities as the user types"""
+    return await Executor.run(service.search, q, limit)
+
+
+@router.get(
+    path="/export",
+    operation_id="api.users.export",
+    responses=UsersResponses.export,
+)
+async def export_users(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Export format"),
+    include_deleted: bool = Query(False, description="Include soft-deleted rows"),
+    created_after: Optional[datetime] = Query(
+        None, description="Only rows created at or after"
+    ),
+    created_before: Optional[datetime] = Query(
+        None, description="Only rows created at or before"
+    ),
+    updated_after: Optional[datetime] = Query(
+        None, description="Only rows updated at or after"
+    ),
+    updated_before: Optional[datetime] = Query(
+        None, description="Only rows updated at or before"
+    ),
+    service=Depends(UsersService),
+) -> StreamingResponse:
+    """Endpoint is used to stream every `Users` entity as NDJSON or CSV"""
+    rows = Executor.iterate(
+        service.export,
+        format=format,
+        include_deleted=include_deleted,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+
+    return StreamingResponse(
+        rows,
+        media_type=Export.media_types[format],
+        headers={"content-disposition": f'attachment; filename="users.{format}"'},
+    )
+
+
 @router.get(
     path="/{uuid}",
     operation_id="api.users.retrieve",
     responses=UsersResponses.retrieve,
 )
 async def retrieve_users(
+    request: Request,
+    response: Response,
     uuid: UUID = Path(description="Unique Identifier for the Users Entity to retrieve"),
+    include: Include = Query(None, description=INCLUDE_DESCRIPTION),
+    fields: Fieldset = Depends(users_fields),
     service=Depends(UsersService),
-) -> UsersSchema:
+) -> UsersDetailSchema:
     """Endpoint is used to retrieve a `Users` entity"""
-    result = service.retrieve(uuid)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and not include and not fields:
+        etag = await Executor.run(service.etag, uuid)
+        if ETag.matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": etag}
+            )
+
+    result = await Executor.run(service.retrieve, uuid, include, fields)
+    if fields:
+        return Fields.response(result, if_none_match)
+    etag = ETag.model(result)
+    if include and ETag.matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": etag}
+        )
+    if Config.Responses.fast_json:
+        return FastJSONResponse(result, headers={"etag": etag})
+    response.headers["etag"] = etag
+
+    return result
+
+
+@router.get(
+    path="/{uuid}/preferences",
+    operation_id="api.users.preferences",
+    responses=UsersResponses.preferences,
+)
+async def retrieve_users_preferences(
+    request: Request,
+    response: Response,
+    uuid: UUID = Path(description="Unique Identifier of the Users Entity"),
+    service=Depends(PreferencesService),
+) -> PreferencesSchema:
+    """Endpoint is used to retrieve the `Preferences` entity of a `Users` entity"""
+    result = await Executor.run(service.for_user, uuid)
+    etag = ETag.entity(result.version)
+    if ETag.matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": etag}
+        )
+    if Config.Responses.fast_json:
+        return FastJSONResponse(result, headers={"etag": etag})
+    response.headers["etag"] = etag
 
     return result
 
@@ -114,6 +499,8 @@ async def retrieve_users(
     responses=UsersResponses.replace,
 )
 async def replace_users(
+    request: Request,
+    response: Response,
     users: UsersSchema,
     uuid: str = Path(
         ..., description="Unique Identifier for the Users Entity to update"
@@ -121,7 +508,11 @@ async def replace_users(
     service=Depends(UsersService),
 ) -> UsersSchema:
     """Endpoint is used to replace a `Users` entity"""
-    result = service.replace(uuid, users)
+    # ? With `If-Match` the write only applies to the version the client read
+    result = await Executor.run(
+        service.replace, uuid, users, request.headers.get("if-match")
+    )
+    response.headers["etag"] = ETag.entity(result.version)
 
     return result
 
@@ -132,6 +523,8 @@ async def replace_users(
     responses=UsersResponses.update
 )
 async def update_users(
+    request: Request,
+    response: Response,
     users: UsersSchema,
     uuid: str = Path(
         ..., description="Unique Identifier for the Users Entity to update"
@@ -139,11 +532,33 @@ async def update_users(
     service=Depends(UsersService),
 ) -> UsersSchema:
     """Endpoint is used to update a `Users` entity"""
-    result = service.update(uuid, users)
+    result = await Executor.run(
+        service.update, uuid, users, request.headers.get("if-match")
+    )
+    response.headers["etag"] = ETag.entity(result.version)
 
     return result
 
 
+@router.post(
+    path="/{uuid}/verify",
+    operation_id="api.users.verify",
+    responses=UsersResponses.verify,
+    status_code=204,
+)
+async def verify_users(
+    password: UsersPasswordSchema,
+    uuid: UUID = Path(
+        ..., description="Unique Identifier for the Users Entity to verify"
+    ),
+    service=Depends(UsersService),
+) -> None:
+    """Endpoint is used to verify the password of a `Users` entity"""
+    await Executor.run(service.verify, uuid, password)
+
+    return Response(content=None, status_code=status.HTTP_204_NO_CONTENT)
+
+
 @router.delete(
     path="/{uuid}",
     operation_id="api.users.delete",
@@ -157,6 +572,6 @@ async def delete_users(
     service=Depends(UsersService),
 ) -> None:
     """Endpoint is used to delete a `Users` entity"""
-    service.delete(uuid)
+    await Executor.run(service.delete, uuid)
 
     return Response(content=None, status_code=status.HTTP_204_NO_CONTENT)
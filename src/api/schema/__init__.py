@@ -1,13 +1,52 @@
 """Module loads and contains API Schema"""
 from .generic import MetaSchema, MessageSchema
+from .changes import ChangesEntity, ChangesEvent, ChangesSchema
+from .credentials import (
+    CredentialsCreateSchema,
+    CredentialsCreated,
+    CredentialsSchema,
+    CredentialsList,
+)
 from .preferences import PreferencesSchema, PreferencesList
-from .users import UsersSchema, UsersList
+from .system import CacheStatsSchema
+from .users import (
+    UsersSchema,
+    UsersList,
+    UsersDetailSchema,
+    UsersDetailList,
+    UsersFilters,
+    UsersSort,
+    UsersSearchList,
+    UsersBulkList,
+    UsersBulkResult,
+    UsersImportError,
+    UsersImportSummary,
+    UsersPasswordSchema,
+)
 
 __all__ = [
+    "CacheStatsSchema",
+    "ChangesEntity",
+    "ChangesEvent",
+    "ChangesSchema",
+    "CredentialsCreateSchema",
+    "CredentialsCreated",
+    "CredentialsSchema",
+    "CredentialsList",
     "MetaSchema",
     "MessageSchema",
     "PreferencesSchema",
     "PreferencesList",
     "UsersSchema",
-    "UsersList"
+    "UsersList",
+    "UsersDetailSchema",
+    "UsersDetailList",
+    "UsersFilters",
+    "UsersSort",
+    "UsersSearchList",
+    "UsersBulkList",
+    "UsersBulkResult",
+    "UsersImportError",
+    "UsersImportSummary",
+    "UsersPasswordSchema",
 ]
@@ -0,0 +1,22 @@
+"""File contains the models of the change feed"""
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+ChangesEntity = Literal["users", "preferences"]
+ChangesEvent = Literal["created", "updated", "deleted"]
+
+
+class ChangesSchema(BaseModel):
+    """Model for the `data` of a change feed event"""
+
+    id: int = Field(..., description="Position in the feed, the `Last-Event-ID`")
+    entity: ChangesEntity = Field(..., description="Kind of the changed entity")
+    event: ChangesEvent = Field(..., description="What happened to the entity")
+    uuid: UUID = Field(..., description="Unique IDentifier of the entity")
+    data: Optional[Dict[str, Any]] = Field(
+        None, description="Entity after the change, without secrets, null when deleted"
+    )
+    created_at: datetime = Field(..., description="When the change was logged, in UTC")
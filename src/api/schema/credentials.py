@@ -0,0 +1,47 @@
+"""
+File contains response model/schema for the `Credentials` table
+"""
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field, ConfigDict
+
+from api.schema import MetaSchema
+
+
+class CredentialsCreateSchema(BaseModel):
+    """Model for a `Credentials` request, the secret is generated"""
+
+    username: str = Field(
+        ..., description="Basic Auth Username", min_length=1, max_length=64,
+        pattern=r"^[^:]+$",
+    )
+
+
+class CredentialsSchema(BaseModel):
+    """Model for a `Credentials` object, without its secret"""
+
+    uuid: UUID = Field(..., description="Unique IDentifier")
+    username: str = Field(..., description="Basic Auth Username")
+
+    created_at: Optional[datetime] = Field(None, description="When the record was created")
+    updated_at: Optional[datetime] = Field(
+        None, description="When the record was last updated"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CredentialsCreated(CredentialsSchema):
+    """Model for a created `Credentials` object, the only time its secret is shown"""
+
+    secret: str = Field(..., description="Basic Auth Password, not retrievable later")
+
+
+class CredentialsList(BaseModel):
+    """Model for a list of `Credentials` objects"""
+
+    data: List[CredentialsSchema]
+    meta: MetaSchema
+    model_config = ConfigDict(from_attributes=True)
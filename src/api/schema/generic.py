@@ -14,6 +14,14 @@ class MetaSchema(BaseModel):
     """Generic meta model"""
 
     count: int = Field(..., description="Total number of items in the list")
-    current_page: int = Field(..., description="Current page of the list")
+    current_page: Optional[int] = Field(
+        None, description="Current page of the list, unset when using a cursor"
+    )
     next_page: Optional[int] = Field(..., description="Next page of the list")
     previous_page: Optional[int] = Field(..., description="Previous page of the list")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor to pass as `cursor` for the next page of the list"
+    )
+    total: Optional[int] = Field(
+        None, description="Total number of items in every page, with `with_total`"
+    )
@@ -28,6 +28,9 @@ class PreferencesSchema(BaseModel):
     updated_at: Optional[datetime] = Field(
         None, description="When the record was last updated",
     )
+    version: Optional[int] = Field(
+        None, description="Version of the record, its `ETag` for `If-Match`"
+    )
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -0,0 +1,13 @@
+"""
+File contains response model/schema for the system endpoints
+"""
+from pydantic import BaseModel, Field
+
+
+class CacheStatsSchema(BaseModel):
+    """Model for the entity cache statistics"""
+
+    backend: str = Field(..., description="Cache backend in use")
+    entries: int = Field(..., description="Number of cached entries")
+    hits: int = Field(..., description="Lookups answered by the cache, this worker")
+    misses: int = Field(..., description="Lookups loaded from the database, this worker")
@@ -4,18 +4,31 @@ File contains response model/schema for the `Users` table
 from datetime import datetime
 from random import choice
 from secrets import token_urlsafe
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import UUID, uuid4
 
-from faker import Faker
-from pydantic import BaseModel, EmailStr, Field, SecretStr, ConfigDict, field_serializer
+from pydantic import (
+    BaseModel,
+    EmailStr,
+    Field,
+    SecretStr,
+    ConfigDict,
+    field_serializer,
+    model_serializer,
+)
 
 from .generic import MetaSchema
+from .preferences import PreferencesSchema
 
-fake = Faker()
-fake_age = fake.random_int(min=25, max=55)
-fake_name = fake.name()
-fake_email = f"{fake_name.lower().replace(' ', '_')}{fake_age}@example.com"
+# ? Maximum number of items accepted by a bulk request
+USERS_BULK_LIMIT = 1000
+# ? Maximum number of errors listed in an import summary
+USERS_IMPORT_MAX_ERRORS = 1000
+
+# ? Placeholders of the omitted fields, the seeders generate realistic users
+default_age = 30
+default_name = "Jane Doe"
+default_email = "jane_doe30@example.com"
 
 
 class UsersSchema(BaseModel):
@@ -25,20 +38,22 @@ class UsersSchema(BaseModel):
         description="Unique IDentifier", default_factory=uuid4, alias="uuid"
     )
 
-    name: str = Field(fake_name, description="Who to say users to")
-    age: int = Field(fake_age, description="User age", gt=18, lt=110)
-    email: EmailStr = Field(fake_email, description="User email")
+    name: str = Field(default_name, description="Who to say users to")
+    age: int = Field(default_age, description="User age", gt=18, lt=110)
+    email: EmailStr = Field(default_email, description="User email")
     gender: Optional[str] = Field(
         choice(["Male", "Female", "Nonbinary"]),
         description="User gender identification",
     )
 
-    # ? Private fields
+    # ? Private fields, generated per user when not given
     password: Optional[SecretStr] = Field(
-        token_urlsafe(16), description="User password"
+        default_factory=lambda: SecretStr(token_urlsafe(16)),
+        description="User password",
     )
     salt: Optional[SecretStr] = Field(
-        token_urlsafe(128), description="Salt for password"
+        default_factory=lambda: SecretStr(token_urlsafe(128)),
+        description="Salt for password",
     )
 
     created_at: Optional[datetime] = Field(None, description="When the record was created")
@@ -46,6 +61,9 @@ class UsersSchema(BaseModel):
         None, description="When the record was last updated"
     )
     deleted_at: Optional[datetime] = Field(None, description="When the record was deleted")
+    version: Optional[int] = Field(
+        None, description="Version of the record, its `ETag` for `If-Match`"
+    )
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -57,9 +75,109 @@ class UsersSchema(BaseModel):
         }
 
 
+class UsersDetailSchema(UsersSchema):
+    """Model for a `Users` object read with its included relations"""
+
+    preferences: Optional[PreferencesSchema] = Field(
+        None, description="Preferences of the user, with `include=preferences`"
+    )
+
+    @model_serializer(mode="wrap")
+    def _exclude_not_included(self, handler):
+        # ? Relations which were not included are left out, not sent as null
+        data = handler(self)
+        if self.preferences is None:
+            data.pop("preferences", None)
+        return data
+
+
+class UsersPasswordSchema(BaseModel):
+    """Model for verifying the password of a `Users` object"""
+
+    password: SecretStr = Field(..., description="Password to verify")
+
+
+UsersSort = Literal[
+    "created_at",
+    "-created_at",
+    "updated_at",
+    "-updated_at",
+    "name",
+    "-name",
+    "email",
+    "-email",
+    "age",
+    "-age",
+]
+
+
+class UsersFilters(BaseModel):
+    """Model for the filters of a `Users` list, each served by an index"""
+
+    email: Optional[str] = None
+    name: Optional[str] = None
+    gender: Optional[str] = None
+    min_age: Optional[int] = None
+    max_age: Optional[int] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+
+
 class UsersList(BaseModel):
     """Model for a `Users` object"""
 
     data: List[UsersSchema]
     meta: MetaSchema
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UsersDetailList(BaseModel):
+    """Model for a list of `Users` objects with their included relations"""
+
+    data: List[UsersDetailSchema]
+    meta: MetaSchema
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UsersSearchList(BaseModel):
+    """Model for the `Users` matching a search, best match first"""
+
+    data: List[UsersSchema]
+
+
+class UsersBulkResult(BaseModel):
+    """Model for the outcome of one item of a bulk `Users` request"""
+
+    index: int = Field(..., description="Position of the item in the request")
+    uuid: UUID = Field(..., description="Unique IDentifier of the item")
+    status: int = Field(..., description="HTTP status code of the item")
+    detail: Optional[str] = Field(None, description="Why the item was not created")
+
+
+class UsersBulkList(BaseModel):
+    """Model for the outcome of a bulk `Users` request"""
+
+    data: List[UsersBulkResult]
+    created: int = Field(..., description="Number of created items")
+    conflicts: int = Field(..., description="Number of conflicting items")
+
+
+class UsersImportError(BaseModel):
+    """Model for a line of a `Users` import which was not created"""
+
+    line: int = Field(..., description="Line number in the uploaded file, from 1")
+    status: int = Field(..., description="HTTP status code of the line")
+    detail: str = Field(..., description="Why the line was not created")
+
+
+class UsersImportSummary(BaseModel):
+    """Model for the outcome of a `Users` import"""
+
+    lines: int = Field(..., description="Number of records read")
+    created: int = Field(..., description="Number of created users")
+    failed: int = Field(..., description="Number of records not created")
+    errors: List[UsersImportError] = Field(
+        [], description="Failed records, the first `USERS_IMPORT_MAX_ERRORS` only"
+    )
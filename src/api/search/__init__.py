@@ -0,0 +1,209 @@
+"""Module contains the type-ahead search over the users"""
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from logging import getLogger
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from config import Config
+from config.databases import DB
+
+from .index import PrefixIndex, UsersIndex
+
+logger = getLogger(__name__)
+
+__all__ = ["UsersSearch", "PrefixIndex", "UsersIndex"]
+
+
+class UsersSearch:
+    """
+    Container for the `UsersIndex` of this worker process.
+
+    The index is built from the table at startup, or on the first search,
+    and kept current by the `UsersObserver`. Every `SEARCH_SYNC_INTERVAL`
+    seconds the rows changed since the last read are applied as well, they
+    may have been written by another worker.
+    """
+
+    _index: Optional[UsersIndex] = None
+    _lock = threading.Lock()
+    # ? Latest `updated_at` & `deleted_at` read, the next sync starts there
+    _watermarks: Dict[str, Optional[datetime]] = {}
+    _syncer: Optional[threading.Thread] = None
+    _stopped = threading.Event()
+    # ? Changes of the transactions open on each thread, see `deferred`
+    _pending = threading.local()
+
+    @classmethod
+    def index(cls) -> UsersIndex:
+        """Returns the index, built on first use"""
+        if cls._index is None:
+            with cls._lock:
+                if cls._index is None:
+                    cls._index = cls.build()
+        return cls._index
+
+    @classmethod
+    def build(cls) -> UsersIndex:
+        """Reads the users in `SEARCH_CHUNK_SIZE` rows per query"""
+        start = perf_counter()
+        # ? Read first, rows changing while building are applied by the sync
+        cls._watermarks = {
+            column: cls._latest(column) for column in ("updated_at", "deleted_at")
+        }
+        index, last = UsersIndex(), ""
+        while True:
+            rows = (
+                DB.get_query_builder()
+                .table("users")
+                .select("uuid", "name", "email")
+                .where_null("deleted_at")
+                .where("uuid", ">", last)
+                .order_by("uuid")
+                .limit(Config.Search.chunk_size)
+                .get()
+            )
+            if not rows:
+                break
+            index.load((row["uuid"], row["name"], row["email"]) for row in rows)
+            last = rows[-1]["uuid"]
+
+        logger.info(
+            "Indexed %d users in %.2fs, %d bytes per user",
+            len(index),
+            perf_counter() - start,
+            index.size() // max(len(index), 1),
+        )
+        return index
+
+    @classmethod
+    def _latest(cls, column: str) -> Optional[datetime]:
+        row = (
+            DB.get_query_builder()
+            .table("users")
+            .select(column)
+            .where_not_null(column)
+            .order_by(column, "desc")
+            .first()
+        )
+        return cls._moment(row[column]) if row else None
+
+    @staticmethod
+    def _moment(value: Union[str, datetime, None]) -> Optional[datetime]:
+        """Returns a timestamp as a naive datetime, SQLite returns strings"""
+        if not value:
+            return None
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        return value.replace(tzinfo=None)
+
+    @staticmethod
+    def _later(
+        first: Optional[datetime], second: Optional[datetime]
+    ) -> Optional[datetime]:
+        if first is None or second is None:
+            return first or second
+        return max(first, second)
+
+    @staticmethod
+    def _binding(moment: datetime) -> str:
+        """Returns a watermark in the format the timestamps are stored in"""
+        return moment.isoformat(sep=" ")
+
+    @classmethod
+    def search(cls, query: str, limit: int) -> List[str]:
+        """Returns the uuids of the users matching `query`, best match first"""
+        return cls.index().search(query, limit)
+
+    @classmethod
+    def added(cls, uuid: str, name: Optional[str], email: Optional[str]) -> None:
+        """Indexes a created or updated user, once the index is built"""
+        cls._apply(lambda index: index.add(uuid, name, email))
+
+    @classmethod
+    def removed(cls, uuid: str) -> None:
+        """Drops a deleted user, once the index is built"""
+        cls._apply(lambda index: index.remove(uuid))
+
+    @classmethod
+    def _apply(cls, change: Callable[[UsersIndex], None]) -> None:
+        pending = getattr(cls._pending, "changes", None)
+        if pending is not None:
+            pending.append(change)
+        elif cls._index is not None:
+            change(cls._index)
+
+    @classmethod
+    @contextmanager
+    def deferred(cls) -> Iterator[None]:
+        """
+        Holds back the changes of the calling thread until the block ends,
+        and drops them when it raises. Wraps a transaction, so the index only
+        sees committed rows.
+        """
+        cls._pending.changes = []
+        try:
+            yield
+            changes = cls._pending.changes
+        finally:
+            cls._pending.changes = None
+        if cls._index is not None:
+            for change in changes:
+                change(cls._index)
+
+    @classmethod
+    def sync(cls) -> None:
+        """Applies the rows changed since the latest read, by any worker"""
+        if cls._index is None:
+            return
+        updated = cls._watermarks.get("updated_at")
+        deleted = cls._watermarks.get("deleted_at")
+        builder = (
+            DB.get_query_builder()
+            .table("users")
+            .select("uuid", "name", "email", "updated_at", "deleted_at")
+        )
+        # ? Both columns are indexed, the OR reads two ranges. Without a
+        # ? watermark the table was empty when the index was built, rows
+        # ? deleted since are newer than the latest update read
+        if updated:
+            builder.where("updated_at", ">=", cls._binding(updated)).or_where(
+                "deleted_at", ">=", cls._binding(deleted or updated)
+            )
+        for row in builder.get():
+            if row["deleted_at"]:
+                cls._index.remove(row["uuid"])
+                deleted = cls._later(deleted, cls._moment(row["deleted_at"]))
+            else:
+                cls._index.add(row["uuid"], row["name"], row["email"])
+            updated = cls._later(updated, cls._moment(row["updated_at"]))
+        cls._watermarks = {"updated_at": updated, "deleted_at": deleted}
+
+    @classmethod
+    def start(cls) -> None:
+        """Builds the index and starts syncing it in the background"""
+        cls.index()
+        if cls._syncer is not None or not Config.Search.sync_interval:
+            return
+        cls._stopped.clear()
+
+        def sync():
+            while not cls._stopped.wait(Config.Search.sync_interval):
+                try:
+                    cls.sync()
+                except Exception as e:
+                    logger.warning("Could not sync the search index: %s", e)
+
+        cls._syncer = threading.Thread(target=sync, name="search", daemon=True)
+        cls._syncer.start()
+
+    @classmethod
+    def close(cls) -> None:
+        """Stops the background sync and drops the index"""
+        if cls._syncer is not None:
+            cls._stopped.set()
+            cls._syncer.join()
+            cls._syncer = None
+        with cls._lock:
+            cls._index = None
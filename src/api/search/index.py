@@ -0,0 +1,196 @@
+"""File contains the in-process prefix indexes of the type-ahead search"""
+import sys
+import threading
+from bisect import bisect_left, insort
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# ? Separates the key from the id, sorts before any character of a key
+SEPARATOR = "\x00"
+
+
+class PrefixIndex:
+    """
+    Sorted array of `key SEPARATOR id` entries, kept in buckets of at most
+    `2 * load` entries so an insert only moves one bucket. A prefix is found
+    with two binary searches, its matches are the entries following it.
+    """
+
+    load = 1000
+
+    def __init__(self):
+        self.buckets: List[List[str]] = []
+        # ? Last entry of each bucket, to find the bucket of an entry
+        self.maxes: List[str] = []
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[str]:
+        return chain.from_iterable(self.buckets)
+
+    def insert(self, entry: str) -> None:
+        if not self.buckets:
+            self.buckets, self.maxes = [[entry]], [entry]
+            self.length = 1
+            return
+
+        position = min(bisect_left(self.maxes, entry), len(self.maxes) - 1)
+        bucket = self.buckets[position]
+        insort(bucket, entry)
+        self.maxes[position] = bucket[-1]
+        self.length += 1
+        if len(bucket) > 2 * self.load:
+            self.buckets[position:position + 1] = [
+                bucket[:self.load], bucket[self.load:]
+            ]
+            self.maxes.insert(position, bucket[self.load - 1])
+
+    def discard(self, entry: str) -> None:
+        position = bisect_left(self.maxes, entry)
+        if position == len(self.maxes):
+            return
+        bucket = self.buckets[position]
+        index = bisect_left(bucket, entry)
+        if index == len(bucket) or bucket[index] != entry:
+            return
+
+        del bucket[index]
+        self.length -= 1
+        if bucket:
+            self.maxes[position] = bucket[-1]
+        else:
+            del self.buckets[position]
+            del self.maxes[position]
+
+    def extend(self, entries: Iterable[str]) -> None:
+        """Adds many entries with a single sort, used to build the index"""
+        merged = sorted(chain(self, entries))
+        self.buckets = [
+            merged[start:start + self.load]
+            for start in range(0, len(merged), self.load)
+        ]
+        self.maxes = [bucket[-1] for bucket in self.buckets]
+        self.length = len(merged)
+
+    def match(self, prefix: str, limit: int, seen: Set[str]) -> List[str]:
+        """Returns up to `limit` ids with a key starting with `prefix`, not in `seen`"""
+        found = []
+        position = bisect_left(self.maxes, prefix)
+        if position == len(self.maxes):
+            return found
+        index = bisect_left(self.buckets[position], prefix)
+        for bucket in islice(self.buckets, position, None):
+            for entry in islice(bucket, index, None):
+                if len(found) == limit or not entry.startswith(prefix):
+                    return found
+                id = entry.rpartition(SEPARATOR)[2]
+                if id not in seen:
+                    seen.add(id)
+                    found.append(id)
+            index = 0
+        return found
+
+
+class UsersIndex:
+    """
+    Prefix index over the name & email of the users. A search returns the
+    users whose whole name or email starts with the query first, then those
+    with a later word of their name starting with it, each in key order so
+    an exact match comes before longer ones.
+    """
+
+    def __init__(self):
+        self.primary = PrefixIndex()
+        self.words = PrefixIndex()
+        # ? The entries of every user, to remove them once it changes
+        self.users: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    @staticmethod
+    def normalize(text: Optional[str]) -> str:
+        return " ".join((text or "").casefold().split())
+
+    @classmethod
+    def entries(
+        cls, uuid: str, name: Optional[str], email: Optional[str]
+    ) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Returns the primary & word entries of a user"""
+        name, email = cls.normalize(name), cls.normalize(email)
+        primary = {key for key in (name, email) if key}
+        words = set(name.split()[1:]) - primary
+        return (
+            tuple(f"{key}{SEPARATOR}{uuid}" for key in primary),
+            tuple(f"{key}{SEPARATOR}{uuid}" for key in words),
+        )
+
+    def add(self, uuid: str, name: Optional[str], email: Optional[str]) -> None:
+        """Adds a user, or replaces the entries it was indexed with"""
+        uuid = str(uuid)
+        entries = self.entries(uuid, name, email)
+        with self.lock:
+            previous = self.users.get(uuid)
+            if previous == entries:
+                return
+            if previous is not None:
+                self._discard(previous)
+            for entry in entries[0]:
+                self.primary.insert(entry)
+            for entry in entries[1]:
+                self.words.insert(entry)
+            self.users[uuid] = entries
+
+    def remove(self, uuid: str) -> None:
+        with self.lock:
+            previous = self.users.pop(str(uuid), None)
+            if previous is not None:
+                self._discard(previous)
+
+    def _discard(self, entries: Tuple[Tuple[str, ...], Tuple[str, ...]]) -> None:
+        for entry in entries[0]:
+            self.primary.discard(entry)
+        for entry in entries[1]:
+            self.words.discard(entry)
+
+    def load(self, rows: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> None:
+        """Adds `(uuid, name, email)` rows of users not indexed yet, sorting once"""
+        primary, words = [], []
+        with self.lock:
+            for uuid, name, email in rows:
+                uuid = str(uuid)
+                if uuid in self.users:
+                    continue
+                entries = self.users[uuid] = self.entries(uuid, name, email)
+                primary.extend(entries[0])
+                words.extend(entries[1])
+            self.primary.extend(primary)
+            self.words.extend(words)
+
+    def search(self, query: str, limit: int) -> List[str]:
+        """Returns the uuids of up to `limit` users matching `query`, ranked"""
+        prefix = self.normalize(query)
+        if not prefix:
+            return []
+        seen: Set[str] = set()
+        with self.lock:
+            found = self.primary.match(prefix, limit, seen)
+            found += self.words.match(prefix, limit - len(found), seen)
+        return found
+
+    def size(self) -> int:
+        """Returns the bytes held by the index, shared strings counted once"""
+        with self.lock:
+            size = sys.getsizeof(self.users)
+            for index in (self.primary, self.words):
+                size += sys.getsizeof(index.buckets) + sys.getsizeof(index.maxes)
+                size += sum(sys.getsizeof(bucket) for bucket in index.buckets)
+            for uuid, entries in self.users.items():
+                size += sys.getsizeof(uuid) + sys.getsizeof(entries)
+                for group in entries:
+                    size += sys.getsizeof(group)
+                    size += sum(sys.getsizeof(entry) for entry in group)
+        return size
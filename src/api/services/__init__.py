@@ -1,8 +1,21 @@
 """Module loads and contains API Services"""
+from .credentials import CredentialsService
+from .etag import ETag
+from .executor import Executor
+from .export import Export
+from .fields import Fields, Fieldset
+from .imports import Import
 from .preferences import PreferencesService
 from .users import UsersService
 
 __all__ = [
+    "CredentialsService",
+    "ETag",
+    "Executor",
+    "Export",
+    "Fields",
+    "Fieldset",
+    "Import",
     "PreferencesService",
     "UsersService"
 ]
@@ -0,0 +1,94 @@
+"""File contains the CredentialsService class."""
+import secrets
+from logging import getLogger
+from typing import Optional
+
+from fastapi import status
+from fastapi.exceptions import HTTPException
+from masoniteorm.exceptions import QueryException
+
+from api.hashing import Hasher
+from api.schema import (
+    CredentialsCreateSchema,
+    CredentialsCreated,
+    CredentialsList,
+    CredentialsSchema,
+)
+from config import Config
+from config.databases import DB
+from databases.models import CredentialsModel
+
+from .pagination import CursorPaginator
+
+logger = getLogger(__name__)
+
+
+class CredentialsService:
+    """Service class for the CredentialsRouter."""
+
+    def create(self, data: CredentialsCreateSchema) -> CredentialsCreated:
+        """
+        Creates a `Credentials` Entity with a generated, hashed secret. A
+        revoked `Credentials` holding the username is removed, so a client
+        can be issued its name again.
+        """
+        if data.username == Config.Auth.username:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Credentials already exists",
+            )
+
+        secret, salt = secrets.token_urlsafe(32), secrets.token_hex(16)
+        try:
+            with DB.transaction():
+                DB.get_query_builder().table("credentials").where(
+                    "username", data.username
+                ).where_not_null("deleted_at").delete()
+                credentials = CredentialsModel.create(
+                    {
+                        "username": data.username,
+                        "secret": Hasher.hash(secret, salt),
+                        "salt": salt,
+                    }
+                ).fresh()
+        except QueryException as e:
+            logger.warning(e)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Credentials already exists",
+            )
+        return CredentialsCreated(**credentials.serialize(), secret=secret)
+
+    def retrieve(self, uuid: str) -> CredentialsSchema:
+        """Retrieves a `CredentialsSchema` Entity by uuid"""
+        credentials = CredentialsModel.find(uuid)
+        if not credentials:
+            raise HTTPException(status.HTTP_404_NOT_FOUND)
+        return CredentialsSchema.model_validate(credentials)
+
+    def listed(
+        self, limit: int = 10, page_nr: int = 1, cursor: Optional[str] = None
+    ) -> CredentialsList:
+        """Retrieves a page of `CredentialsSchema` Entities"""
+        credentials = CursorPaginator(
+            CredentialsModel().get_builder(), limit, page_nr, cursor
+        )
+        return credentials.validate(CredentialsList)
+
+    def delete(self, uuid: str) -> None:
+        """Revokes a `Credentials` Entity by uuid, its observer evicts it from auth"""
+        credentials = CredentialsModel.find(uuid)
+        if not credentials:
+            raise HTTPException(status.HTTP_404_NOT_FOUND)
+        credentials.delete()
+
+    def authenticate(self, username: str, password: str) -> bool:
+        """Whether a username & password match an active `Credentials` Entity"""
+        credentials = (
+            CredentialsModel.select("username", "secret", "salt")
+            .where("username", username)
+            .first()
+        )
+        if not credentials:
+            return False
+        return Hasher.verify(password, credentials.salt, credentials.secret)
@@ -0,0 +1,92 @@
+"""File contains the entity tag helpers used for conditional requests."""
+from hashlib import blake2b
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+Version = Optional[int]
+
+
+class ETag:
+    """
+    Strong entity tags derived from `(uuid, version)`, so they can be
+    computed from a narrow query without loading or serializing the rows.
+    The tag of a single entity is its quoted version, which `If-Match`
+    sends back to make a write conditional.
+    """
+
+    @staticmethod
+    def version(uuid, version: Version) -> str:
+        """Returns the version of one entity, as part of a digest"""
+        return f"{uuid}@{version}"
+
+    @staticmethod
+    def digest(*parts: str) -> str:
+        digest = blake2b("\n".join(parts).encode("utf-8"), digest_size=16)
+        return f'"{digest.hexdigest()}"'
+
+    @staticmethod
+    def content(body: bytes) -> str:
+        """Returns the tag of a rendered body"""
+        return f'"{blake2b(body, digest_size=16).hexdigest()}"'
+
+    @staticmethod
+    def entity(version: Version) -> str:
+        """Returns the tag of one entity"""
+        return f'"{version}"'
+
+    @staticmethod
+    def versions(item: BaseModel) -> Iterator[Tuple[object, Version]]:
+        """Yields the version of a model, then those of its included entities"""
+        yield item.uuid, item.version
+        for value in item.__dict__.values():
+            if isinstance(value, BaseModel) and hasattr(value, "version"):
+                yield value.uuid, value.version
+
+    @classmethod
+    def model(cls, item: BaseModel) -> str:
+        """Returns the tag of a serialized entity, with its included entities"""
+        versions = list(cls.versions(item))
+        if len(versions) == 1:
+            return cls.entity(versions[0][1])
+        return cls.digest(*(cls.version(*version) for version in versions))
+
+    @classmethod
+    def listed(cls, versions: Iterable[Tuple[object, Version]], meta: dict) -> str:
+        """Returns the tag of a page, from its entities and pagination meta"""
+        parts = [cls.version(uuid, version) for uuid, version in versions]
+        parts.append(repr(sorted(meta.items())))
+        return cls.digest(*parts)
+
+    @classmethod
+    def page(cls, result) -> str:
+        """Returns the tag of a serialized `*List` page"""
+        return cls.listed(
+            (version for item in result.data for version in cls.versions(item)),
+            result.meta.model_dump(),
+        )
+
+    @staticmethod
+    def matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+        """Whether an `If-None-Match` header matches `etag`, weakly compared"""
+        if not if_none_match or not etag:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        candidates = (tag.strip() for tag in if_none_match.split(","))
+        return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+    @staticmethod
+    def required(if_match: Optional[str]) -> Optional[List[int]]:
+        """
+        Returns the versions an `If-Match` header allows, None when it allows
+        any. Weak & unknown tags never match, as `If-Match` compares strongly.
+        """
+        if not if_match or if_match.strip() == "*":
+            return None
+        versions = []
+        for tag in if_match.split(","):
+            tag = tag.strip()
+            if tag.startswith('"') and tag.endswith('"') and tag[1:-1].isdecimal():
+                versions.append(int(tag[1:-1]))
+        return versions
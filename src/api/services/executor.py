@@ -0,0 +1,122 @@
+"""File contains the Executor used to run blocking service calls."""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from logging import getLogger
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from config import Config
+
+logger = getLogger(__name__)
+
+
+class Executor:
+    """
+    Container running blocking (ORM) service calls on a bounded thread pool,
+    so a slow query only occupies one executor thread instead of the event loop.
+    Streamed responses run on a pool of their own, so long exports cannot
+    occupy the threads of the other calls.
+    """
+
+    _pool: Optional[ThreadPoolExecutor] = None
+    _streams: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def pool(cls) -> ThreadPoolExecutor:
+        """Returns the executor thread pool, creating it on first use"""
+        if cls._pool is None:
+            cls._pool = ThreadPoolExecutor(
+                max_workers=Config.Executor.max_workers,
+                thread_name_prefix="service",
+            )
+            logger.info(
+                "Started service executor with %s threads",
+                Config.Executor.max_workers,
+            )
+        return cls._pool
+
+    @classmethod
+    def streams(cls) -> ThreadPoolExecutor:
+        """Returns the thread pool of the streamed responses"""
+        if cls._streams is None:
+            cls._streams = ThreadPoolExecutor(
+                max_workers=Config.Executor.max_streams,
+                thread_name_prefix="stream",
+            )
+        return cls._streams
+
+    @classmethod
+    async def run(cls, func: Callable, *args, **kwargs) -> Any:
+        """Runs `func` on the executor, or inline when the executor is disabled"""
+        if not Config.Executor.enabled:
+            return func(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        # ? Request scoped context (the profiler) follows the call to the thread
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            cls.pool(), partial(context.run, func, *args, **kwargs)
+        )
+
+    @classmethod
+    async def iterate(
+        cls, func: Callable[..., Iterator], *args, buffer: int = 4, **kwargs
+    ) -> AsyncIterator:
+        """
+        Runs the generator `func` on a single stream thread and yields its
+        items on the event loop. The thread stays at most `buffer` items ahead
+        of the consumer, and stops when the consumer goes away.
+        """
+        if not Config.Executor.enabled:
+            for item in func(*args, **kwargs):
+                yield item
+            return
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        slots = threading.Semaphore(buffer)
+        stopped = threading.Event()
+        end = object()
+
+        def produce():
+            try:
+                iterator = func(*args, **kwargs)
+                try:
+                    for item in iterator:
+                        slots.acquire()
+                        if stopped.is_set():
+                            break
+                        loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+                finally:
+                    # ? Runs the generator's cleanup on the thread which used it
+                    getattr(iterator, "close", lambda: None)()
+            except BaseException as e:
+                loop.call_soon_threadsafe(queue.put_nowait, (end, e))
+            else:
+                loop.call_soon_threadsafe(queue.put_nowait, (end, None))
+
+        loop.run_in_executor(cls.streams(), contextvars.copy_context().run, produce)
+        try:
+            while True:
+                item, error = await queue.get()
+                if item is end:
+                    if error is not None:
+                        raise error
+                    return
+                slots.release()
+                yield item
+        finally:
+            stopped.set()
+            slots.release()
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Waits for running calls and stops the executor threads"""
+        if cls._streams is not None:
+            cls._streams.shutdown(wait=True)
+            cls._streams = None
+        if cls._pool is not None:
+            cls._pool.shutdown(wait=True)
+            cls._pool = None
@@ -0,0 +1,109 @@
+"""File contains the streaming exporter shared by the services."""
+import csv
+import io
+from datetime import datetime
+from typing import Iterator, List, Optional, Type
+
+import pendulum
+from masoniteorm.models import Model
+from masoniteorm.query import QueryBuilder
+from pydantic import BaseModel
+
+from api.responses.fast import secret_fields
+from databases.connections import stream
+
+from .pagination import construct
+
+
+class Export:
+    """
+    Encodes every row selected by a query as NDJSON or CSV, chunk by chunk.
+    Secret columns are never selected.
+    """
+
+    media_types = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+    # ? Rows fetched and encoded per chunk
+    chunk_size = 1000
+
+    def __init__(self, model: Type[Model], schema: Type[BaseModel], format: str):
+        self.model = model
+        self.schema = schema
+        self.format = format
+        secrets = secret_fields(schema) or {}
+        self.columns = [name for name in schema.model_fields if name not in secrets]
+
+    @staticmethod
+    def filter(
+        builder: QueryBuilder,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None,
+    ) -> QueryBuilder:
+        """Applies the export filters, bounds are inclusive"""
+        table = builder.get_table_name()
+        for column, operator, value in (
+            ("created_at", ">=", created_after),
+            ("created_at", "<=", created_before),
+            ("updated_at", ">=", updated_after),
+            ("updated_at", "<=", updated_before),
+        ):
+            if value is not None:
+                value = Export.to_database(builder, value)
+                builder.where(f"{table}.{column}", operator, value)
+        return builder
+
+    @staticmethod
+    def to_database(builder: QueryBuilder, value: datetime) -> str:
+        """Formats a filter the way timestamps are stored, in the model's timezone"""
+        if value.tzinfo is not None:
+            timezone = builder._model.__timezone__ if builder._model else "UTC"
+            value = pendulum.instance(value).in_timezone(timezone)
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+
+    def stream(self, builder: QueryBuilder) -> Iterator[bytes]:
+        """Yields the encoded rows of `builder`, oldest first"""
+        table = builder.get_table_name()
+        builder.select(*(f"{table}.{column}" for column in self.columns))
+        builder.order_by(f"{table}.created_at").order_by(f"{table}.uuid")
+
+        if self.format == "csv":
+            yield self.encode_csv_header()
+        for rows in stream(builder, self.chunk_size):
+            models = self.model.hydrate(rows)
+            if self.format == "csv":
+                yield self.encode_csv(models)
+            else:
+                yield self.encode_ndjson(models)
+
+    def encode_ndjson(self, models: List[Model]) -> bytes:
+        serializer, include = self.schema.__pydantic_serializer__, set(self.columns)
+        return b"".join(
+            serializer.to_json(
+                construct(self.schema, model), include=include, warnings=False
+            )
+            + b"\n"
+            for model in models
+        )
+
+    def encode_csv_header(self) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(self.columns)
+        return buffer.getvalue().encode("utf-8")
+
+    def encode_csv(self, models: List[Model]) -> bytes:
+        serializer = self.schema.__pydantic_serializer__
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for model in models:
+            row = serializer.to_python(
+                construct(self.schema, model),
+                mode="json",
+                include=set(self.columns),
+                warnings=False,
+            )
+            writer.writerow(
+                "" if row[column] is None else row[column] for column in self.columns
+            )
+        return buffer.getvalue().encode("utf-8")
@@ -0,0 +1,115 @@
+"""File contains the sparse fieldsets (`fields=`) shared by the routers."""
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple, Type, get_args
+
+from fastapi import Query, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from masoniteorm.query import QueryBuilder
+from pydantic import BaseModel, ConfigDict, create_model
+
+from api.responses.fast import FastJSONResponse, secret_fields
+from api.schema import MetaSchema
+
+from .etag import ETag
+
+Fieldset = Optional[Tuple[str, ...]]
+
+# ? Columns always selected, the pagination & relations depend on them
+KEYS = ("uuid", "created_at")
+
+
+class Fields:
+    """
+    Sparse fieldsets: `fields=uuid,name` selects only those columns and
+    answers with the schema trimmed to them. Secrets can not be requested.
+    """
+
+    @staticmethod
+    def allowed(schema: Type[BaseModel]) -> Tuple[str, ...]:
+        """Returns the fields of `schema` which can be requested"""
+        secrets = secret_fields(schema) or {}
+        return tuple(name for name in schema.model_fields if name not in secrets)
+
+    @classmethod
+    def query(cls, schema: Type[BaseModel]) -> Callable[..., Fieldset]:
+        """Returns the dependency parsing the `fields` query parameter of `schema`"""
+        allowed = cls.allowed(schema)
+
+        def fields(
+            fields: Optional[str] = Query(
+                None,
+                description=f"Comma separated fields to return, of {','.join(allowed)}",
+            ),
+        ) -> Fieldset:
+            if fields is None:
+                return None
+            names = {name.strip() for name in fields.split(",")} - {""}
+            unknown = sorted(names - set(allowed))
+            if unknown or not names:
+                message = f"Unknown fields: {', '.join(unknown)}"
+                raise RequestValidationError(
+                    [
+                        {
+                            "type": "value_error",
+                            "loc": ("query", "fields"),
+                            "msg": message if unknown else "No fields requested",
+                            "input": fields,
+                        }
+                    ]
+                )
+            # ? The order of the schema, so each fieldset builds one model
+            return tuple(name for name in allowed if name in names)
+
+        return fields
+
+    @staticmethod
+    def select(
+        builder: QueryBuilder, fields: Tuple[str, ...], *keys: str
+    ) -> QueryBuilder:
+        """Selects the columns of `fields`, the `KEYS` and extra `keys` only"""
+        table = builder.get_table_name()
+        columns = dict.fromkeys((*KEYS, *keys, *fields))
+        return builder.select(*(f"{table}.{column}" for column in columns))
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def model(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+        """Returns `schema` trimmed to `fields`, built once per fieldset"""
+        return create_model(
+            f"{schema.__name__}Fields",
+            __config__=ConfigDict(from_attributes=True),
+            **{
+                name: (schema.model_fields[name].annotation, schema.model_fields[name])
+                for name in fields
+            },
+        )
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def listed(
+        cls, schema: Type[BaseModel], fields: Tuple[str, ...]
+    ) -> Type[BaseModel]:
+        """Returns the `*List` schema with its items trimmed to `fields`"""
+        item = get_args(schema.model_fields["data"].annotation)[0]
+        return create_model(
+            f"{schema.__name__}Fields",
+            __config__=ConfigDict(from_attributes=True),
+            data=(List[cls.model(item, fields)], ...),
+            meta=(MetaSchema, ...),
+        )
+
+    @staticmethod
+    def response(result: BaseModel, if_none_match: Optional[str]) -> Response:
+        """
+        Answers with a trimmed model, tagged by its content since it may not
+        hold the versions the other tags are derived from.
+        """
+        response = FastJSONResponse(result)
+        etag = ETag.content(response.body)
+        if ETag.matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": etag}
+            )
+        response.headers["etag"] = etag
+        return response
@@ -0,0 +1,89 @@
+"""File contains the streaming NDJSON importer shared by the services."""
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+Line = Tuple[int, bytes]
+
+
+class Import:
+    """
+    Reads an NDJSON body incrementally and hands it to `write` chunk by chunk.
+
+    The next part of the body is only read once `write` finished the previous
+    chunk, so a fast uploader is held back by TCP flow control instead of
+    piling records up in memory.
+    """
+
+    # ? Records validated and written per transaction
+    chunk_size = 500
+
+    # ? Longest accepted line, longer ones are reported and skipped
+    max_line_bytes = 1024 * 1024
+
+    def __init__(
+        self,
+        write: Callable[[List[Line]], Awaitable[Tuple[int, list]]],
+        error: Callable[[int, int, str], object],
+    ):
+        self.write = write
+        self.error = error
+        self.lines = 0
+        self.created = 0
+        self.failed = 0
+
+    async def split(
+        self, body: AsyncIterator[bytes]
+    ) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+        """Yields the numbered, non-empty lines of `body`, None if too long"""
+        buffer, number, skipping = bytearray(), 0, False
+        async for chunk in body:
+            buffer += chunk
+            *complete, rest = bytes(buffer).split(b"\n")
+            buffer = bytearray(rest)
+            for line in complete:
+                number += 1
+                if skipping:
+                    skipping = False
+                elif len(line) > self.max_line_bytes:
+                    yield number, None
+                elif line.strip():
+                    yield number, line
+            if len(buffer) > self.max_line_bytes and not skipping:
+                yield number + 1, None
+                buffer.clear()
+                skipping = True
+            elif skipping:
+                buffer.clear()
+        if buffer.strip() and not skipping:
+            yield number + 1, bytes(buffer)
+
+    async def run(self, body: AsyncIterator[bytes]) -> AsyncIterator[object]:
+        """Yields every error, and the running totals after each chunk"""
+        chunk: List[Line] = []
+        async for number, line in self.split(body):
+            if line is None:
+                self.lines += 1
+                self.failed += 1
+                yield self.error(number, 413, "Line is too long")
+                continue
+
+            chunk.append((number, line))
+            if len(chunk) >= self.chunk_size:
+                async for event in self.flush(chunk):
+                    yield event
+                chunk = []
+
+        if chunk:
+            async for event in self.flush(chunk):
+                yield event
+
+    async def flush(self, chunk: List[Line]) -> AsyncIterator[object]:
+        created, errors = await self.write(chunk)
+        self.lines += len(chunk)
+        self.created += created
+        self.failed += len(errors)
+        for error in errors:
+            yield error
+        yield self.progress()
+
+    def progress(self) -> dict:
+        return {"lines": self.lines, "created": self.created, "failed": self.failed}
@@ -0,0 +1,228 @@
+"""File contains the keyset (cursor) paginator shared by the services."""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Optional, Tuple, Type, get_args
+
+from fastapi import status
+from fastapi.exceptions import HTTPException
+from masoniteorm.models import Model
+from masoniteorm.query import QueryBuilder
+from pydantic import BaseModel
+
+from api.schema import MetaSchema
+
+
+@lru_cache(maxsize=None)
+def _fields_of_type(schema: Type[BaseModel], kind: type) -> FrozenSet[str]:
+    return frozenset(
+        name
+        for name, field in schema.model_fields.items()
+        if kind in (field.annotation, *get_args(field.annotation))
+    )
+
+
+@lru_cache(maxsize=None)
+def _related_schema(schema: Type[BaseModel], name: str) -> Type[BaseModel]:
+    """Returns the model of the `Optional[Model]` relation field `name`"""
+    annotation = schema.model_fields[name].annotation
+    return next(
+        arg
+        for arg in (annotation, *get_args(annotation))
+        if isinstance(arg, type) and issubclass(arg, BaseModel)
+    )
+
+
+def construct(schema: Type[BaseModel], row: Model, **included) -> BaseModel:
+    """
+    Builds `schema` from a database row without validating it again, only
+    casting dates the way `Model.serialize` does. For trusted output only.
+    The `included` relations are passed as already built models.
+    """
+    attributes, dates = row.__attributes__, row.get_dates()
+    datetimes = _fields_of_type(schema, datetime)
+    booleans = _fields_of_type(schema, bool)
+
+    values = {}
+    for name in schema.model_fields:
+        if name not in attributes:
+            continue
+        value = attributes[name]
+        if value is not None and name in dates:
+            value = row.get_new_date(value)
+        elif isinstance(value, str) and name in datetimes:
+            value = datetime.fromisoformat(value)
+        elif isinstance(value, int) and name in booleans:
+            # ? SQLite & MySQL return booleans as integers
+            value = bool(value)
+        values[name] = value
+    return schema.model_construct(**values, **included)
+
+
+def validate(schema: Type[BaseModel], row: Model, **included) -> BaseModel:
+    """
+    Validates `schema` from a database row. The `included` relations are
+    passed as models, so their lazy ORM relationships are never loaded.
+    """
+    if not included:
+        return schema.model_validate(row)
+    attributes = row.__attributes__
+    values = {
+        name: getattr(row, name)
+        for name in schema.model_fields
+        if name in attributes and name not in included
+    }
+    return schema.model_validate({**values, **included})
+
+
+class Cursor:
+    """
+    Opaque pagination cursor pointing after a `(sort value, uuid)` pair.
+    Cursors of other sorts than `created_at` also carry their sort.
+    """
+
+    @staticmethod
+    def encode(value, uuid, sort: str = "created_at") -> str:
+        if isinstance(value, datetime):
+            value = value.strftime("%Y-%m-%d %H:%M:%S")
+        elif not isinstance(value, (int, float)):
+            value = str(value)
+        parts = [value, str(uuid)] + ([sort] if sort != "created_at" else [])
+        payload = json.dumps(parts, separators=(",", ":"))
+        return urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str, sort: str = "created_at") -> Tuple[object, str]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            value, uuid, *rest = json.loads(urlsafe_b64decode(padded))
+            if rest != ([sort] if sort != "created_at" else []):
+                raise ValueError("Cursor of another sort")
+            if not isinstance(value, (str, int, float)):
+                raise TypeError("Cursor value must be a scalar")
+            return value, str(uuid)
+        except (ValueError, TypeError):
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+class CursorPaginator:
+    """
+    Paginates a query ordered by `(sort, uuid)`, `(created_at, uuid)` unless
+    another column is given; a leading `-` sorts descending.
+
+    With a `cursor` only rows after it are selected (keyset pagination),
+    which stays fast on deep pages and is stable under concurrent writes.
+    Without one `page_nr` is applied as an OFFSET for compatibility.
+    A `total` counted by the service is passed through to the meta.
+    """
+
+    def __init__(
+        self,
+        builder: QueryBuilder,
+        limit: int = 10,
+        page_nr: int = 1,
+        cursor: Optional[str] = None,
+        sort: str = "created_at",
+        total: Optional[int] = None,
+    ):
+        table = builder.get_table_name()
+        column = sort.lstrip("-")
+        direction, after = ("desc", "<") if sort.startswith("-") else ("asc", ">")
+        builder.order_by(f"{table}.{column}", direction)
+        builder.order_by(f"{table}.uuid", direction)
+
+        if cursor:
+            value, uuid = Cursor.decode(cursor, sort)
+            builder.where(
+                lambda query: query.where(f"{table}.{column}", after, value)
+                .or_where(
+                    lambda tie: tie.where(f"{table}.{column}", value)
+                    .where(f"{table}.uuid", after, uuid)
+                )
+            )
+        else:
+            builder.offset((page_nr - 1) * limit)
+
+        # ? One extra row tells whether there is a next page
+        result = builder.limit(limit + 1).get()
+        self.has_more = len(result) > limit
+        self.result = result.take(limit) if self.has_more else result
+
+        self.cursor = cursor
+        self.count = len(self.result)
+        self.total = total
+        self.current_page = None if cursor else page_nr
+        self.next_page = page_nr + 1 if self.has_more and not cursor else None
+        self.previous_page = page_nr - 1 if page_nr > 1 and not cursor else None
+
+        self.included: Dict[str, Dict[str, Model]] = {}
+        self.next_cursor = None
+        if self.has_more:
+            last = self.result.last()
+            self.next_cursor = Cursor.encode(
+                last.get_raw_attribute(column), last.get_raw_attribute("uuid"), sort
+            )
+
+    def include(
+        self, name: str, related: Type[Model], foreign_key: str
+    ) -> "CursorPaginator":
+        """
+        Loads the `related` rows of the whole page in one query, by their
+        `foreign_key` to the rows' uuid, as the `name` field of the items.
+        """
+        keys = [str(row.get_raw_attribute("uuid")) for row in self.result]
+        rows = related.where_in(foreign_key, keys).get() if keys else []
+        self.included[name] = {
+            str(row.get_raw_attribute(foreign_key)): row for row in rows
+        }
+        return self
+
+    def _related(self, item: Type[BaseModel], row: Model, build: Callable) -> dict:
+        """Returns the included relations of `row`, built by `build(schema, row)`"""
+        uuid = str(row.get_raw_attribute("uuid"))
+        return {
+            name: (
+                build(_related_schema(item, name), rows[uuid]) if uuid in rows else None
+            )
+            for name, rows in self.included.items()
+        }
+
+    def meta(self) -> dict:
+        return {
+            "count": self.count,
+            "current_page": self.current_page,
+            "next_page": self.next_page,
+            "previous_page": self.previous_page,
+            "next_cursor": self.next_cursor,
+            "total": self.total,
+        }
+
+    def validate(self, schema: Type[BaseModel]) -> BaseModel:
+        """Validates the page into a `*List` schema straight from the ORM rows"""
+        if not self.included:
+            data = self.result.all()
+        else:
+            item = get_args(schema.model_fields["data"].annotation)[0]
+            data = [
+                validate(item, row, **self._related(item, row, validate))
+                for row in self.result
+            ]
+        return schema.model_validate({"data": data, "meta": self.meta()})
+
+    def construct(self, schema: Type[BaseModel]) -> BaseModel:
+        """Builds the page into a `*List` schema without validating the rows again"""
+        item = get_args(schema.model_fields["data"].annotation)[0]
+        return schema.model_construct(
+            data=[
+                construct(item, row, **self._related(item, row, construct))
+                for row in self.result
+            ],
+            meta=MetaSchema.model_construct(**self.meta()),
+        )
+
+    def serialize(self, *args, **kwargs) -> dict:
+        return {
+            "data": self.result.serialize(*args, **kwargs),
+            "meta": self.meta(),
+        }
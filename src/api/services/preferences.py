@@ -1,16 +1,31 @@
 """File contains the PreferencesService class."""
-from typing import List
+from datetime import datetime
+from typing import Iterator, List, Optional
 from logging import getLogger
 
 from masoniteorm.exceptions import QueryException
+from masoniteorm.expressions import Raw
 from fastapi import status
 from fastapi.exceptions import HTTPException
 
+from api.cache import Cache, Totals
 from api.schema import PreferencesSchema, PreferencesList
+from config import Config
+from config.databases import DB
+from databases.connections import InstrumentedConnection
 from databases.models import PreferencesModel
 
+from .etag import ETag
+from .export import Export
+from .fields import Fields, Fieldset
+from .pagination import CursorPaginator, construct
+
 logger = getLogger(__name__)
 
+# ? Columns written from a `PreferencesSchema`
+PREFERENCES_TOGGLES = {"toggle_dark_mode", "toggle_email", "toggle_notifications"}
+PREFERENCES_COLUMNS = {"user_id", *PREFERENCES_TOGGLES}
+
 
 class PreferencesService:
     """Service class for the PreferencesRouter."""
@@ -30,34 +45,115 @@ class PreferencesService:
             )
         return PreferencesSchema(**preferences.serialize())
 
-    def retrieve(self, uuid: str) -> PreferencesSchema:
-        """Retrieves a `PreferencesSchema` Entity by uuid"""
-        preferences = PreferencesModel.find(uuid)
-
+    def retrieve(self, uuid: str, fields: Fieldset = None) -> PreferencesSchema:
+        """
+        Retrieves a `PreferencesSchema` Entity by uuid, read through the `Cache`.
+        `fields` trims the cached entry.
+        """
+
+        def load() -> dict:
+            preferences = PreferencesModel.find(uuid)
+            if not preferences:
+                raise HTTPException(status.HTTP_404_NOT_FOUND)
+            return PreferencesSchema.model_validate(preferences).model_dump(mode="json")
+
+        cached = Cache.remember("preferences", uuid, load)
+        schema = PreferencesSchema
+        if fields:
+            schema = Fields.model(PreferencesSchema, fields)
+        if Config.Responses.fast_json:
+            return schema.model_construct(**cached)
+        return schema(**cached)
+
+    def for_user(self, user_id: str) -> PreferencesSchema:
+        """
+        Retrieves the `PreferencesSchema` Entity of a user which is not deleted,
+        with a single join
+        """
+        preferences = (
+            PreferencesModel.select("preferences.*")
+            .join("users", "users.uuid", "=", "preferences.user_id")
+            .where("users.uuid", str(user_id))
+            .where_null("users.deleted_at")
+            .first()
+        )
         if not preferences:
             raise HTTPException(status.HTTP_404_NOT_FOUND)
 
-        return PreferencesSchema(**preferences.serialize())
+        if Config.Responses.fast_json:
+            return construct(PreferencesSchema, preferences)
+        return PreferencesSchema.model_validate(preferences)
+
+    def etag(self, uuid: str) -> Optional[str]:
+        """Returns the `ETag` of a `PreferencesSchema` Entity, None if it is missing"""
+        cached = Cache.peek("preferences", uuid)
+        if cached and "version" in cached:
+            return ETag.entity(cached["version"])
+
+        preferences = PreferencesModel.select("uuid", "version").find(uuid)
+        if not preferences:
+            return None
+        return ETag.entity(preferences.version)
 
     def listed(
-        self, limit: int = 10, page_nr: int = 1
+        self,
+        limit: int = 10,
+        page_nr: int = 1,
+        cursor: Optional[str] = None,
+        fields: Fieldset = None,
+        total: Optional[int] = None,
     ) -> PreferencesList:
         """Retrieves a `PreferencesSchema` Entity by uuid"""
-        preferences = PreferencesModel.simple_paginate(
-            limit, page_nr
+        builder = PreferencesModel().get_builder()
+        schema = PreferencesList
+        if fields:
+            Fields.select(builder, fields)
+            schema = Fields.listed(PreferencesList, fields)
+        preferences = CursorPaginator(builder, limit, page_nr, cursor, total=total)
+        if Config.Responses.fast_json:
+            return preferences.construct(schema)
+        return preferences.validate(schema)
+
+    def listed_etag(
+        self,
+        limit: int = 10,
+        page_nr: int = 1,
+        cursor: Optional[str] = None,
+        total: Optional[int] = None,
+    ) -> str:
+        """Returns the `ETag` of a `listed` page, selecting only the versions"""
+        builder = PreferencesModel.select("uuid", "created_at", "version")
+        page = CursorPaginator(builder, limit, page_nr, cursor, total=total)
+        return ETag.listed(
+            ((preferences.uuid, preferences.version) for preferences in page.result),
+            page.meta(),
         )
-        return PreferencesList(**preferences.serialize())
 
-    def update(self, uuid: str, data: PreferencesSchema) -> PreferencesSchema:
-        """Updates a `PreferencesSchema` Entity by uuid with data"""
-        preferences = PreferencesModel.find(uuid)
-
-        if not preferences:
-            raise HTTPException(status.HTTP_404_NOT_FOUND)
-        else:
-            preferences.update(data.model_dump())
+    def total(self) -> int:
+        """Returns the number of `listed` Entities, kept by the `Totals` counters"""
+        return Totals.get("preferences", PreferencesModel().get_builder().count)
+
+    def export(
+        self,
+        format: str = "ndjson",
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None,
+    ) -> Iterator[bytes]:
+        """Streams every `PreferencesSchema` Entity matching the filters"""
+        builder = PreferencesModel().get_builder()
+        Export.filter(
+            builder, created_after, created_before, updated_after, updated_before
+        )
+        yield from Export(PreferencesModel, PreferencesSchema, format).stream(builder)
 
-        return PreferencesSchema(**preferences.serialize())
+    def update(
+        self, uuid: str, data: PreferencesSchema, if_match: Optional[str] = None
+    ) -> PreferencesSchema:
+        """Updates the given fields of a `PreferencesSchema` Entity by uuid"""
+        fields = set(data.model_fields_set) & PREFERENCES_COLUMNS
+        return self._write(uuid, data.model_dump(include=fields), if_match)
 
     def delete(self, uuid: str) -> None:
         """Delete a `PreferencesSchema` Entity by uuid"""
@@ -68,14 +164,50 @@ class PreferencesService:
         else:
             preferences.delete()
 
-    def replace(self, uuid: str, data: PreferencesSchema) -> PreferencesSchema:
-        """Replaces a `PreferencesSchema` Entity by uuid with data"""
-        preferences = PreferencesModel.find(uuid)
-
-        if not preferences:
-            raise HTTPException(status.HTTP_404_NOT_FOUND)
+    def replace(
+        self, uuid: str, data: PreferencesSchema, if_match: Optional[str] = None
+    ) -> PreferencesSchema:
+        """
+        Replaces a `PreferencesSchema` Entity by uuid with data, in place: the
+        uuid & creation time are kept, as is the user unless given.
+        """
+        fields = {*PREFERENCES_TOGGLES, *(data.model_fields_set & {"user_id"})}
+        return self._write(uuid, data.model_dump(include=fields), if_match)
+
+    def _write(
+        self, uuid: str, values: dict, if_match: Optional[str]
+    ) -> PreferencesSchema:
+        """
+        Writes `values` with one UPDATE bumping the version, then reads the
+        row back, in a transaction. With `If-Match` the UPDATE only matches
+        the allowed versions, see `UsersService._write`.
+        """
+        versions = ETag.required(if_match)
+        if "user_id" in values:
+            values["user_id"] = str(values["user_id"])
+        values["version"] = Raw("version + 1")
+        values["updated_at"] = PreferencesModel().get_new_date().to_datetime_string()
+
+        builder = DB.get_query_builder().table("preferences").where("uuid", str(uuid))
+        if versions is not None:
+            builder.where_in("version", versions)
+        try:
+            with DB.transaction():
+                builder.update(values)
+                if InstrumentedConnection.rowcount.get() == 0:
+                    raise HTTPException(
+                        status.HTTP_412_PRECONDITION_FAILED
+                        if if_match
+                        else status.HTTP_404_NOT_FOUND
+                    )
+                preferences = PreferencesModel.find(uuid)
+                # ? The UPDATE bypasses the model, its observers get the row
+                # ? read back, and log the change in the same transaction
+                preferences.observe_events(preferences, "updated")
+        except QueryException as e:
+            logger.warning(e)
+            raise HTTPException(status_code=409, detail="Preferences conflict")
 
-        preferences = preferences.serialize()
-        preferences.update(data)
-        self.delete(uuid)
-        return self.create(data)
+        # ? Entries read before the commit may hold the previous row
+        Cache.forget("preferences", uuid)
+        return PreferencesSchema(**preferences.serialize())
@@ -1,28 +1,78 @@
 """File contains the UsersService class."""
-from typing import List
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 from logging import getLogger
+from uuid import uuid4
 from masoniteorm.exceptions import QueryException
+from masoniteorm.expressions import Raw
+from masoniteorm.query import QueryBuilder
 from fastapi import status
 from fastapi.exceptions import HTTPException
-from api.schema import UsersSchema, UsersList
-from databases.models import UsersModel
+from pydantic import ValidationError
+from api.cache import Cache, Totals
+from api.changes import Changes
+from api.hashing import Hasher
+from api.search import UsersSearch
+from api.schema import (
+    PreferencesSchema,
+    UsersSchema,
+    UsersList,
+    UsersDetailSchema,
+    UsersDetailList,
+    UsersFilters,
+    UsersSearchList,
+    UsersBulkList,
+    UsersBulkResult,
+    UsersImportError,
+    UsersPasswordSchema,
+)
+from config import Config
+from config.databases import DB
+from databases.connections import InstrumentedConnection
+from databases.models import PreferencesModel, UsersModel
+
+from .etag import ETag
+from .export import Export
+from .fields import Fields, Fieldset
+from .pagination import CursorPaginator
 
 logger = getLogger(__name__)
 
+# ? Columns written from a `UsersSchema`, the secrets are hashed first
+USERS_COLUMNS = {"name", "age", "email", "gender"}
+
 
 class UsersService:
     """Service class for the UsersRouter."""
 
+    # ? Rows per multi-row INSERT statement
+    bulk_chunk_size = 500
+
     def options(self):
         return ["HEAD", "OPTIONS", "GET", "POST", "PUT", "PATCH", "DELETE"]
 
-    def create(self, data: UsersSchema):
-        """Creates a `UsersSchema` Entity from data"""
+    def create(
+        self,
+        data: UsersSchema,
+        dispatch: Optional[Callable[[List[UsersSchema]], None]] = None,
+    ):
+        """
+        Creates a `UsersSchema` Entity from data.
+
+        The user and its preferences (see `UsersObserver.created`) are written
+        in one transaction, and the response is built from the inserted values.
+        `dispatch` queues the follow-up jobs of the user in that transaction.
+        """
         try:
             secrets = data.get_secrets()
             data = data.model_dump()
             data.update(secrets)
-            user = UsersModel.create(data).fresh()
+            with UsersSearch.deferred(), DB.transaction():
+                user = UsersModel.create(data)
+                # ? The version is the column default, not read back
+                result = UsersSchema(**{**user.serialize(), "version": 1})
+                if dispatch:
+                    dispatch([result])
         except QueryException as e:
             logger.warning(e)
             raise HTTPException(
@@ -30,45 +80,460 @@ class UsersService:
                 detail="User already exists",
             )
 
-        return UsersSchema(**user.serialize())
+        return result
 
-    def retrieve(self, uuid: str) -> UsersSchema:
-        """Retrieves a `UsersSchema` Entity by uuid"""
-        user = UsersModel.find(uuid)
+    def bulk_create(
+        self,
+        data: List[UsersSchema],
+        dispatch: Optional[Callable[[List[UsersSchema]], None]] = None,
+    ) -> UsersBulkList:
+        """
+        Creates `UsersSchema` Entities and their preferences with multi-row
+        INSERTs in a single transaction. Items whose uuid already exists, or
+        repeats within the request, are reported as conflicts. `dispatch`
+        queues the follow-up jobs of the created users in that transaction.
+        """
+        results: List[Optional[UsersBulkResult]] = [None] * len(data)
 
-        if not user:
-            raise HTTPException(status.HTTP_404_NOT_FOUND)
+        pending = {}
+        for index, item in enumerate(data):
+            if str(item.uuid) in pending:
+                results[index] = UsersBulkResult(
+                    index=index,
+                    uuid=item.uuid,
+                    status=status.HTTP_409_CONFLICT,
+                    detail="Duplicate uuid in request",
+                )
+            else:
+                pending[str(item.uuid)] = index
 
-        return UsersSchema(**user.serialize())
+        self._existing(data, pending, results)
+
+        # ? Passwords are hashed in parallel on the hashing workers
+        secrets = [data[index].get_secrets() for index in pending.values()]
+        passwords = Hasher.hash_many(
+            (secret["password"], secret["salt"]) for secret in secrets
+        )
+
+        now = UsersModel().get_new_date().to_datetime_string()
+        users, preferences = [], []
+        for (uuid, index), secret, password in zip(pending.items(), secrets, passwords):
+            item = data[index]
+            user = item.model_dump(include={"name", "age", "email", "gender"})
+            user.update(
+                uuid=uuid,
+                password=password,
+                salt=secret["salt"],
+                created_at=now,
+                updated_at=now,
+            )
+            users.append(user)
+            preferences.append(
+                {
+                    "uuid": str(uuid4()),
+                    "user_id": uuid,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+
+        while users:
+            try:
+                with DB.transaction():
+                    self._bulk_insert("users", users)
+                    self._bulk_insert("preferences", preferences)
+                    Changes.record_many(
+                        "users",
+                        "created",
+                        ((user["uuid"], UsersSchema(**user)) for user in users),
+                    )
+                    Changes.record_many(
+                        "preferences",
+                        "created",
+                        (
+                            (item["uuid"], PreferencesSchema(**item))
+                            for item in preferences
+                        ),
+                    )
+                    if dispatch:
+                        dispatch([data[index] for index in pending.values()])
+            except QueryException as e:
+                logger.warning(e)
+                # ? Created by a concurrent request since the check, the rest is retried
+                taken = self._existing(data, pending, results)
+                if not taken:
+                    raise HTTPException(
+                        status_code=409,
+                        detail="Users were created concurrently, retry the request",
+                    )
+                users = [user for user in users if user["uuid"] not in taken]
+                preferences = [
+                    item for item in preferences if item["user_id"] not in taken
+                ]
+                continue
+            # ? The multi-row INSERTs do not fire the model observers
+            for user in users:
+                UsersSearch.added(user["uuid"], user["name"], user["email"])
+            Totals.add("users", len(users))
+            Totals.add("preferences", len(preferences))
+            break
+
+        for uuid, index in pending.items():
+            results[index] = UsersBulkResult(
+                index=index, uuid=uuid, status=status.HTTP_201_CREATED
+            )
+
+        return UsersBulkList(
+            data=results,
+            created=len(pending),
+            conflicts=len(data) - len(pending),
+        )
+
+    @staticmethod
+    def _existing(
+        data: List[UsersSchema],
+        pending: Dict[str, int],
+        results: List[Optional[UsersBulkResult]],
+    ) -> Set[str]:
+        """
+        Reports the `pending` items whose uuid is taken as conflicts, and
+        removes them. Returns their uuids.
+        """
+        if not pending:
+            return set()
+        existing = (
+            UsersModel.with_trashed().where_in("uuid", list(pending)).select("uuid").get()
+        )
+        taken = {str(user.uuid) for user in existing}
+        for uuid in taken:
+            index = pending.pop(uuid)
+            results[index] = UsersBulkResult(
+                index=index,
+                uuid=data[index].uuid,
+                status=status.HTTP_409_CONFLICT,
+                detail="User already exists",
+            )
+        return taken
+
+    def import_chunk(
+        self, lines: List[Tuple[int, bytes]]
+    ) -> Tuple[int, List[UsersImportError]]:
+        """
+        Validates numbered NDJSON lines as `UsersSchema` and creates the valid
+        ones through `bulk_create`, in one transaction.
+        Returns the number of created users and the errors by line.
+        """
+        errors, records, numbers = [], [], []
+        for number, line in lines:
+            try:
+                record = UsersSchema.model_validate_json(line)
+            except ValidationError as e:
+                detail = "; ".join(
+                    f"{'.'.join(map(str, error['loc'])) or 'record'}: {error['msg']}"
+                    for error in e.errors()
+                )
+                errors.append(UsersImportError(line=number, status=422, detail=detail))
+                continue
+            if not {"password", "salt"} <= record.model_fields_set:
+                errors.append(
+                    UsersImportError(
+                        line=number, status=422, detail="password and salt are required"
+                    )
+                )
+                continue
+            records.append(record)
+            numbers.append(number)
+
+        if not records:
+            return 0, errors
+
+        try:
+            result = self.bulk_create(records)
+        except HTTPException as e:
+            errors.extend(
+                UsersImportError(line=number, status=e.status_code, detail=e.detail)
+                for number in numbers
+            )
+            return 0, sorted(errors, key=lambda error: error.line)
+
+        errors.extend(
+            UsersImportError(
+                line=numbers[item.index], status=item.status, detail=item.detail
+            )
+            for item in result.data
+            if item.status != status.HTTP_201_CREATED
+        )
+        return result.created, sorted(errors, key=lambda error: error.line)
+
+    def _bulk_insert(self, table: str, rows: List[dict]) -> None:
+        """Inserts rows with one statement per `bulk_chunk_size` rows"""
+        for start in range(0, len(rows), self.bulk_chunk_size):
+            DB.get_query_builder().table(table).bulk_create(
+                rows[start:start + self.bulk_chunk_size]
+            )
+
+    def retrieve(
+        self, uuid: str, include: Optional[str] = None, fields: Fieldset = None
+    ) -> UsersSchema:
+        """
+        Retrieves a `UsersSchema` Entity by uuid, read through the `Cache`.
+        The cached entry is the response model, with secrets already masked.
+        `include="preferences"` adds the preferences with one more query,
+        `fields` trims the cached entry.
+        """
+
+        def load() -> dict:
+            user = UsersModel.find(uuid)
+            if not user:
+                raise HTTPException(status.HTTP_404_NOT_FOUND)
+            return UsersSchema.model_validate(user).model_dump(mode="json")
+
+        cached = Cache.remember("users", uuid, load)
+        schema = UsersSchema
+        if include == "preferences":
+            preferences = PreferencesModel.where("user_id", str(uuid)).first()
+            if preferences:
+                cached = {
+                    **cached,
+                    "preferences": PreferencesSchema.model_validate(preferences),
+                }
+            schema = UsersDetailSchema
+        if fields:
+            schema = Fields.model(schema, self._fieldset(fields, include))
+
+        if Config.Responses.fast_json:
+            return schema.model_construct(**cached)
+        return schema(**cached)
+
+    def search(self, query: str, limit: int = 10) -> UsersSearchList:
+        """
+        Searches `UsersSchema` Entities by the prefix of their name or email
+        in the `UsersSearch` index, then loads the matches with one query.
+        """
+        uuids = UsersSearch.search(query, limit)
+        users = {}
+        if uuids:
+            found = UsersModel.where_in("uuid", uuids).get()
+            users = {str(user.uuid): user for user in found}
+        # ? Users deleted since they were found are left out
+        return UsersSearchList(
+            data=[
+                UsersSchema.model_validate(users[uuid])
+                for uuid in uuids
+                if uuid in users
+            ]
+        )
+
+    def etag(self, uuid: str) -> Optional[str]:
+        """Returns the `ETag` of a `UsersSchema` Entity, None if it does not exist"""
+        cached = Cache.peek("users", uuid)
+        if cached and "version" in cached:
+            return ETag.entity(cached["version"])
+
+        user = UsersModel.select("uuid", "version").find(uuid)
+        if not user:
+            return None
+        return ETag.entity(user.version)
 
     def listed(
-        self, limit: int = 10, page_nr: int = 1, **kwargs
+        self,
+        limit: int = 10,
+        page_nr: int = 1,
+        cursor: Optional[str] = None,
+        include: Optional[str] = None,
+        fields: Fieldset = None,
+        filters: Optional[UsersFilters] = None,
+        sort: str = "created_at",
+        total: Optional[int] = None,
+        **kwargs,
     ) -> List[UsersSchema]:
         """Retrieves a `UsersSchema` Entity by uuid"""
-        # ? Removes all empty kwarg pairs =)
-        user = UsersModel.simple_paginate(limit, page_nr)
-        return UsersList(**user.serialize())
+        builder = self._filter(UsersModel().get_builder(), filters)
+        if fields:
+            Fields.select(builder, fields, sort.lstrip("-"))
+        user = CursorPaginator(builder, limit, page_nr, cursor, sort, total)
+        return self._page(user, include, fields)
 
-    def update(self, uuid: str, data: UsersSchema) -> UsersSchema:
-        """Updates a `UsersSchema` Entity by uuid with data"""
-        user = UsersModel.find(uuid)
-    
-        if not user:
-            raise HTTPException(status.HTTP_404_NOT_FOUND)
+    def listed_etag(
+        self,
+        limit: int = 10,
+        page_nr: int = 1,
+        cursor: Optional[str] = None,
+        filters: Optional[UsersFilters] = None,
+        sort: str = "created_at",
+        total: Optional[int] = None,
+    ) -> str:
+        """Returns the `ETag` of a `listed` page, selecting only the versions"""
+        builder = self._filter(UsersModel().get_builder(), filters)
+        Fields.select(builder, ("version",), sort.lstrip("-"))
+        return self._page_etag(
+            CursorPaginator(builder, limit, page_nr, cursor, sort, total)
+        )
+
+    def total(self, filters: Optional[UsersFilters] = None) -> int:
+        """Returns the number of `listed` Entities matching the filters"""
+        return self._total("users", UsersModel().get_builder(), filters)
+
+    def deleted_total(self, filters: Optional[UsersFilters] = None) -> int:
+        """Returns the number of `deleted` Entities matching the filters"""
+        return self._total("users:deleted", UsersModel.only_trashed(), filters)
+
+    def _total(
+        self, name: str, builder: QueryBuilder, filters: Optional[UsersFilters]
+    ) -> int:
+        """
+        Unfiltered totals are kept by the `Totals` counters, filtered ones
+        are counted over the range of the index serving the filter.
+        """
+        if filters is None or not filters.model_dump(exclude_none=True):
+            return Totals.get(name, builder.count)
+        return self._filter(builder, filters).count()
+
+    @staticmethod
+    def _filter(builder: QueryBuilder, filters: Optional[UsersFilters]) -> QueryBuilder:
+        """
+        Applies the `UsersFilters`. The name prefix is a range rather than a
+        `LIKE`, so every database can serve it from the name index.
+        """
+        if filters is None:
+            return builder
+
+        table = builder.get_table_name()
+        for column in ("email", "gender"):
+            value = getattr(filters, column)
+            if value is not None:
+                builder.where(f"{table}.{column}", value)
+        if filters.name:
+            builder.where(f"{table}.name", ">=", filters.name)
+            last = ord(filters.name[-1])
+            if last < 0x10FFFF:
+                builder.where(
+                    f"{table}.name", "<", filters.name[:-1] + chr(last + 1)
+                )
+        if filters.min_age is not None:
+            builder.where(f"{table}.age", ">=", filters.min_age)
+        if filters.max_age is not None:
+            builder.where(f"{table}.age", "<=", filters.max_age)
+        return Export.filter(
+            builder,
+            filters.created_after,
+            filters.created_before,
+            filters.updated_after,
+            filters.updated_before,
+        )
+
+    def export(
+        self,
+        format: str = "ndjson",
+        include_deleted: bool = False,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None,
+    ) -> Iterator[bytes]:
+        """Streams every `UsersSchema` Entity matching the filters, without secrets"""
+        if include_deleted:
+            builder = UsersModel.with_trashed()
         else:
-            user.update(data.model_dump(exclude_defaults=True, exclude=["uuid"]))
+            builder = UsersModel().get_builder()
+        Export.filter(
+            builder, created_after, created_before, updated_after, updated_before
+        )
+        yield from Export(UsersModel, UsersSchema, format).stream(builder)
+
+    def update(
+        self, uuid: str, data: UsersSchema, if_match: Optional[str] = None
+    ) -> UsersSchema:
+        """Updates the given fields of a `UsersSchema` Entity by uuid"""
+        values = data.model_dump(include=set(data.model_fields_set) & USERS_COLUMNS)
+        return self._write(uuid, data, values, if_match)
 
+    def replace(
+        self, uuid: str, data: UsersSchema, if_match: Optional[str] = None
+    ) -> UsersSchema:
+        """
+        Replaces a `UsersSchema` Entity by uuid with data, in place: the uuid,
+        creation time & preferences are kept, as are the secrets unless given.
+        """
+        values = data.model_dump(include=USERS_COLUMNS)
+        return self._write(uuid, data, values, if_match)
+
+    def _write(
+        self, uuid: str, data: UsersSchema, values: dict, if_match: Optional[str]
+    ) -> UsersSchema:
+        """
+        Writes `values` & the given secrets with one UPDATE bumping the version,
+        then reads the row back, in a transaction. With `If-Match` the UPDATE
+        only matches the allowed versions, so a concurrent writer gets a 412
+        rather than overwriting, without a read or a lock before the write.
+        """
+        versions = ETag.required(if_match)
+        values.update(self._secrets(data))
+        values["version"] = Raw("version + 1")
+        values["updated_at"] = UsersModel().get_new_date().to_datetime_string()
+
+        builder = (
+            DB.get_query_builder()
+            .table("users")
+            .where("uuid", str(uuid))
+            .where_null("deleted_at")
+        )
+        if versions is not None:
+            builder.where_in("version", versions)
+        try:
+            with UsersSearch.deferred(), DB.transaction():
+                builder.update(values)
+                if InstrumentedConnection.rowcount.get() == 0:
+                    raise HTTPException(
+                        status.HTTP_412_PRECONDITION_FAILED
+                        if if_match
+                        else status.HTTP_404_NOT_FOUND
+                    )
+                user = UsersModel.find(uuid)
+                # ? The UPDATE bypasses the model, its observers get the row
+                # ? read back, and log the change in the same transaction
+                user.observe_events(user, "updated")
+        except QueryException as e:
+            logger.warning(e)
+            raise HTTPException(status_code=409, detail="User already exists")
+
+        # ? Entries read before the commit may hold the previous row
+        Cache.forget("users", uuid)
         return UsersSchema(**user.serialize())
 
-    def replace(self, uuid: str, data: UsersSchema) -> UsersSchema:
-        """Replaces a `UsersSchema` Entity by uuid with data"""
-        user = UsersModel.find(uuid)
+    @staticmethod
+    def _secrets(data: UsersSchema) -> dict:
+        """Returns the hashed password & salt to store, if a password was given"""
+        given = data.model_fields_set & {"password", "salt"}
+        if not given:
+            return {}
+        if "password" not in given:
+            raise HTTPException(
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="salt can only change with the password",
+            )
+        # ? Without a salt the password is hashed with a new one
+        secrets = data.get_secrets()
+        return {
+            "password": Hasher.hash(secrets["password"], secrets["salt"]),
+            "salt": secrets["salt"],
+        }
 
-        if not user:
-            raise HTTPException(status.HTTP_404_NOT_FOUND)
+    def verify(self, uuid: str, data: UsersPasswordSchema) -> None:
+        """
+        Verifies the password of a `UsersSchema` Entity by uuid. Hashes made
+        with an outdated algorithm or cost are replaced on success.
+        """
+        password = data.password.get_secret_value()
+        user = UsersModel.select("uuid", "password", "salt").find(uuid)
+        if not user or not Hasher.verify(password, user.salt, user.password):
+            raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Incorrect password")
 
-        self.delete(uuid)
-        return self.create(data)
+        if Hasher.needs_rehash(user.password):
+            # ? Not a change of the user, `updated_at` is kept as is
+            DB.get_query_builder().table("users").where("uuid", str(uuid)).update(
+                {"password": Hasher.hash(password, user.salt)}
+            )
 
     def delete(self, uuid: str) -> None:
         """Delete a `UsersSchema` Entity by uuid"""
@@ -79,7 +544,58 @@ class UsersService:
             user.delete()
 
     def deleted(
-        self, limit: int = 10, page_nr: int = 1
+        self,
+        limit: int = 10,
+        page_nr: int = 1,
+        cursor: Optional[str] = None,
+        include: Optional[str] = None,
+        fields: Fieldset = None,
+        filters: Optional[UsersFilters] = None,
+        sort: str = "created_at",
+        total: Optional[int] = None,
     ) -> List[UsersSchema]:
-        user = UsersModel.only_trashed().simple_paginate(limit, page_nr)
-        return UsersList(**user.serialize())
+        builder = self._filter(UsersModel.only_trashed(), filters)
+        if fields:
+            Fields.select(builder, fields, sort.lstrip("-"))
+        user = CursorPaginator(builder, limit, page_nr, cursor, sort, total)
+        return self._page(user, include, fields)
+
+    def deleted_etag(
+        self,
+        limit: int = 10,
+        page_nr: int = 1,
+        cursor: Optional[str] = None,
+        filters: Optional[UsersFilters] = None,
+        sort: str = "created_at",
+        total: Optional[int] = None,
+    ) -> str:
+        """Returns the `ETag` of a `deleted` page, selecting only the versions"""
+        builder = self._filter(UsersModel.only_trashed(), filters)
+        Fields.select(builder, ("version",), sort.lstrip("-"))
+        return self._page_etag(
+            CursorPaginator(builder, limit, page_nr, cursor, sort, total)
+        )
+
+    def _page(
+        self, page: CursorPaginator, include: Optional[str], fields: Fieldset
+    ) -> UsersList:
+        """Builds a page, with the preferences of all its users in one query"""
+        schema = UsersList
+        if include == "preferences":
+            page.include("preferences", PreferencesModel, "user_id")
+            schema = UsersDetailList
+        if fields:
+            schema = Fields.listed(schema, self._fieldset(fields, include))
+        if Config.Responses.fast_json:
+            return page.construct(schema)
+        return page.validate(schema)
+
+    @staticmethod
+    def _fieldset(fields: Tuple[str, ...], include: Optional[str]) -> Tuple[str, ...]:
+        """Included relations are part of every fieldset"""
+        return (*fields, include) if include else fields
+
+    def _page_etag(self, page: CursorPaginator) -> str:
+        return ETag.listed(
+            ((user.uuid, user.version) for user in page.result), page.meta()
+        )
@@ -1,10 +1,17 @@
 """File contains the UsersTasks container"""
+from typing import List
+
+from api.jobs import Jobs
+from api.metrics import Metrics
 from api.schema.users import UsersSchema
 
 
 class UsersTasks:
-    """Tasks container for the UsersRouter"""
+    """Tasks container for the UsersRouter, run by the `JobsWorker`"""
 
     @staticmethod
-    async def do_after(entity: UsersSchema):
-        print(f"User.Name: {entity.name}")
+    @Jobs.handler("users.do_after", UsersSchema)
+    @Metrics.task("users.do_after")
+    async def do_after(entities: List[UsersSchema]):
+        for entity in entities:
+            print(f"User.Name: {entity.name}")
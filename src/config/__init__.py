@@ -4,13 +4,33 @@ This is implemented using Pydantic for type safety and docker secerts support.
 """
 from .api import APIConfig
 from .auth import AuthConfig
+from .cache import CacheConfig
+from .changes import ChangesConfig
 from .databases import DatabaseConfig
+from .executor import ExecutorConfig
+from .hashing import HashingConfig
+from .jobs import JobsConfig
+from .metrics import MetricsConfig
+from .profiler import ProfilerConfig
+from .ratelimit import RateLimitConfig
+from .responses import ResponsesConfig
+from .search import SearchConfig
 
 
 class ConfigContainer:
     Api: APIConfig = APIConfig()
     Auth: AuthConfig = AuthConfig()
+    Cache: CacheConfig = CacheConfig()
+    Changes: ChangesConfig = ChangesConfig()
     Database: DatabaseConfig = DatabaseConfig()
+    Executor: ExecutorConfig = ExecutorConfig()
+    Hashing: HashingConfig = HashingConfig()
+    Jobs: JobsConfig = JobsConfig()
+    Metrics: MetricsConfig = MetricsConfig()
+    Profiler: ProfilerConfig = ProfilerConfig()
+    RateLimit: RateLimitConfig = RateLimitConfig()
+    Responses: ResponsesConfig = ResponsesConfig()
+    Search: SearchConfig = SearchConfig()
 
 
 Config = ConfigContainer()
@@ -8,6 +8,16 @@ class AuthConfig(BaseSettings):
 
     username: str = Field("admin", description="Basic Auth Username")
     password: str = Field("admin", description="Basic Auth Password")
+    cache_ttl: float = Field(
+        60, description="Seconds a verified database credential is trusted"
+    )
+    cache_max_entries: int = Field(
+        10_000, description="Verified database credentials kept per worker"
+    )
+    revocations_path: str = Field(
+        "/tmp/template-api-revocations.sqlite3",
+        description="File sharing the revoked credentials between workers",
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,30 @@
+"""File contains Cache Config Container"""
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class CacheConfig(BaseSettings):
+    """Cache Config Container"""
+
+    enabled: bool = Field(True, description="Cache retrieved entities")
+    backend: Literal["memory", "sqlite"] = Field(
+        "memory", description="`sqlite` shares the cache between workers"
+    )
+    max_entries: int = Field(10_000, description="Entries kept before evicting", ge=1)
+    ttl: float = Field(60, description="Seconds an entry is kept", gt=0)
+    totals_ttl: float = Field(
+        300, description="Seconds a list total is kept before it is counted again", gt=0
+    )
+    path: str = Field(
+        "/tmp/template-api-cache.sqlite3", description="File of the `sqlite` backend"
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="CACHE_",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
@@ -0,0 +1,36 @@
+"""File contains Changes Config Container"""
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ChangesConfig(BaseSettings):
+    """Changes Config Container"""
+
+    enabled: bool = Field(True, description="Log the changes of users & preferences")
+    retention: int = Field(
+        100_000, description="Newest changes kept, older ones can't be resumed", ge=1
+    )
+    poll_interval: float = Field(
+        0.5, description="Seconds between reads of the changes of other workers", gt=0
+    )
+    chunk_size: int = Field(500, description="Changes read per query", ge=1)
+    queue_size: int = Field(
+        1000, description="Changes buffered per stream before it is dropped", ge=1
+    )
+    heartbeat: float = Field(
+        15, description="Seconds of silence before a stream sends a comment", gt=0
+    )
+    gap_timeout: float = Field(
+        2, description="Seconds to wait for a missing id to commit, before skipping", ge=0
+    )
+    prune_interval: float = Field(
+        60, description="Seconds between deletes of the changes past retention", gt=0
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="CHANGES_",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
@@ -1,13 +1,16 @@
 """
 File contains DATABASE configurations
 """
+import threading
 from pathlib import Path
-from typing import Union, Optional
+from typing import TYPE_CHECKING, Union, Optional
 
-from masoniteorm.connections import ConnectionResolver
 from pydantic import Field, root_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+if TYPE_CHECKING:
+    from masoniteorm.connections import ConnectionResolver
+
 
 class Database(BaseSettings):
     """
@@ -28,6 +31,21 @@ class Database(BaseSettings):
     root_user: Optional[str] = Field(None)
     root_password: Optional[str] = Field(None)
 
+    # ? Connection pool, used by the `mysql` driver
+    pool_enabled: bool = Field(True, description="Pool connections")
+    pool_min_size: int = Field(1, description="Connections kept open", ge=0)
+    pool_max_size: int = Field(10, description="Max open connections", ge=1)
+    pool_idle_timeout: float = Field(
+        300.0, description="Seconds before idle connections above min are closed"
+    )
+    pool_max_lifetime: float = Field(
+        1800.0, description="Seconds before a connection is replaced"
+    )
+    pool_pre_ping: bool = Field(True, description="Validate connections on checkout")
+    pool_timeout: float = Field(
+        10.0, description="Seconds to wait for a free connection"
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_prefix="DB_",
@@ -42,7 +60,7 @@ class DatabaseConfig(BaseSettings):
     Container for all Database configs
     """
 
-    databases: dict = Database().model_dump()
+    databases: dict = Field(default_factory=lambda: Database().model_dump())
 
     @root_validator(skip_on_failure=True)
     def parse_to_orm_format(cls, values):
@@ -61,4 +79,42 @@ class DatabaseConfig(BaseSettings):
         return values
 
 
-DB = ConnectionResolver().set_connection_details(DatabaseConfig().databases)
+# ? The ORM connection resolver, built on first use by `__getattr__`
+DB: "ConnectionResolver"
+_lock = threading.Lock()
+
+
+def connect() -> "ConnectionResolver":
+    """
+    Builds the ORM connection resolver from `Config.Database`, so the settings
+    are parsed once and the ORM is only imported by the code using it.
+    """
+    from masoniteorm.connections import ConnectionFactory, ConnectionResolver
+
+    from config import Config
+    from databases.connections import (
+        DriverRegistry,
+        InstrumentedSQLiteConnection,
+        PooledMySQLConnection,
+        ThreadLocalConnections,
+    )
+
+    # ? Transactions are bound to the thread which opened them
+    ConnectionResolver._connections = ThreadLocalConnections()
+
+    # ? Keeps the drivers registered below when the ORM registers its defaults again
+    ConnectionFactory._connections = DriverRegistry(ConnectionFactory._connections)
+
+    resolver = ConnectionResolver().set_connection_details(Config.Database.databases)
+    resolver.register(PooledMySQLConnection)
+    resolver.register(InstrumentedSQLiteConnection)
+    return resolver
+
+
+def __getattr__(name: str):
+    if name != "DB":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _lock:
+        if "DB" not in globals():
+            globals()["DB"] = connect()
+    return globals()["DB"]
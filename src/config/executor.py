@@ -0,0 +1,28 @@
+"""File contains Executor Config Container"""
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ExecutorConfig(BaseSettings):
+    """Executor Config Container"""
+
+    enabled: bool = Field(
+        True, description="Run blocking service calls off the event loop"
+    )
+    max_workers: int = Field(
+        16, description="Maximum number of executor threads", ge=1
+    )
+    max_streams: int = Field(
+        4,
+        description="Maximum number of threads running streamed responses, "
+        "further streams wait for one to end",
+        ge=1,
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="EXECUTOR_",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
@@ -0,0 +1,39 @@
+"""File contains Hashing Config Container"""
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class HashingConfig(BaseSettings):
+    """Hashing Config Container"""
+
+    algorithm: Literal["sha512", "scrypt", "pbkdf2_sha256"] = Field(
+        "scrypt", description="Algorithm used for new password hashes"
+    )
+    workers: int = Field(
+        2, description="Hashing worker processes, 0 hashes in-process", ge=0
+    )
+
+    scrypt_ln: int = Field(14, description="scrypt cost as log2(N)", ge=1)
+    scrypt_r: int = Field(8, description="scrypt block size", ge=1)
+    scrypt_p: int = Field(1, description="scrypt parallelism", ge=1)
+    pbkdf2_iterations: int = Field(
+        600_000, description="PBKDF2-SHA256 iterations", ge=1
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="HASH_",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
+
+    def params(self, algorithm: str) -> dict:
+        """Returns the configured cost parameters of `algorithm`"""
+        if algorithm == "scrypt":
+            return {"ln": self.scrypt_ln, "r": self.scrypt_r, "p": self.scrypt_p}
+        if algorithm == "pbkdf2_sha256":
+            return {"i": self.pbkdf2_iterations}
+        return {}
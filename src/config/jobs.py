@@ -0,0 +1,32 @@
+"""File contains Jobs Config Container"""
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class JobsConfig(BaseSettings):
+    """Jobs Config Container"""
+
+    enabled: bool = Field(
+        True, description="Queue jobs for the worker, else run them after the response"
+    )
+    concurrency: int = Field(4, description="Batches a worker runs at once", ge=1)
+    batch_size: int = Field(50, description="Jobs of one name per batch", ge=1)
+    max_attempts: int = Field(
+        5, description="Runs of a job before it is dead-lettered", ge=1
+    )
+    backoff: float = Field(2, description="Seconds before the first retry", ge=0)
+    backoff_max: float = Field(300, description="Longest delay between retries", ge=0)
+    lease: int = Field(
+        300, description="Seconds a claimed job is hidden from other workers", ge=1
+    )
+    poll_interval: float = Field(
+        1, description="Seconds an idle worker waits before looking again", gt=0
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="JOBS_",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
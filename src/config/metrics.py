@@ -0,0 +1,24 @@
+"""File contains Metrics Config Container"""
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class MetricsConfig(BaseSettings):
+    """Metrics Config Container"""
+
+    enabled: bool = Field(True, description="Record request, query & task metrics")
+    directory: str = Field(
+        "/tmp/template-api-metrics",
+        description="Shared by the workers to aggregate, empty for this process only",
+    )
+    flush_interval: float = Field(
+        5.0, description="Seconds between writes of a worker's metrics", gt=0
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="METRICS_",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
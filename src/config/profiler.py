@@ -0,0 +1,29 @@
+"""File contains Profiler Config Container"""
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ProfilerConfig(BaseSettings):
+    """Profiler Config Container"""
+
+    enabled: bool = Field(
+        False, description="Profile the queries of each request, for debugging"
+    )
+    slow_query_ms: float = Field(
+        100.0, description="Statements slower than this are logged & explained", ge=0
+    )
+    repeated_queries: int = Field(
+        5, description="Identical statements per request flagged as N+1", ge=2
+    )
+    explain: bool = Field(True, description="Capture the EXPLAIN of slow statements")
+    captured: int = Field(
+        100, description="Slow statements kept in memory for inspection", ge=0
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="PROFILER_",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
@@ -0,0 +1,45 @@
+"""File contains Rate Limit Config Container"""
+from typing import Literal, Tuple
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class RateLimitConfig(BaseSettings):
+    """Rate Limit Config Container"""
+
+    enabled: bool = Field(True, description="Rate limit requests per client")
+    backend: Literal["memory", "sqlite"] = Field(
+        "memory", description="`sqlite` shares the buckets between workers"
+    )
+    path: str = Field(
+        "/tmp/template-api-ratelimit.sqlite3",
+        description="File of the `sqlite` backend",
+    )
+    max_clients: int = Field(
+        100_000, description="Buckets kept in memory before evicting", ge=1
+    )
+
+    # ? Per router, requests per second refilled & requests allowed in a burst
+    users_rate: float = Field(50, description="Users router refill rate", gt=0)
+    users_burst: int = Field(100, description="Users router burst", ge=1)
+    preferences_rate: float = Field(
+        50, description="Preferences router refill rate", gt=0
+    )
+    preferences_burst: int = Field(100, description="Preferences router burst", ge=1)
+    system_rate: float = Field(10, description="System router refill rate", gt=0)
+    system_burst: int = Field(20, description="System router burst", ge=1)
+    changes_rate: float = Field(1, description="Changes router refill rate", gt=0)
+    changes_burst: int = Field(10, description="Changes router burst", ge=1)
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="RATELIMIT_",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
+
+    def limits(self, name: str) -> Tuple[float, int]:
+        """Returns the `(rate, burst)` of a router"""
+        return getattr(self, f"{name}_rate"), getattr(self, f"{name}_burst")
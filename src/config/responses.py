@@ -0,0 +1,20 @@
+"""File contains Responses Config Container"""
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ResponsesConfig(BaseSettings):
+    """Responses Config Container"""
+
+    fast_json: bool = Field(
+        False,
+        description="Encode entity responses once with pydantic-core, omitting secrets",
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="RESPONSES_",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
@@ -0,0 +1,25 @@
+"""File contains Search Config Container"""
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class SearchConfig(BaseSettings):
+    """Search Config Container"""
+
+    max_results: int = Field(50, description="Largest `limit` of a search", ge=1)
+    chunk_size: int = Field(
+        10_000, description="Rows read per query when building the index", ge=1
+    )
+    sync_interval: float = Field(
+        5,
+        description="Seconds between reads of the rows other workers changed, 0 never",
+        ge=0,
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="SEARCH_",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
@@ -0,0 +1,19 @@
+"""Module contains database connection drivers and pooling"""
+from .drivers import DriverRegistry
+from .instrumented import InstrumentedConnection, InstrumentedSQLiteConnection
+from .mysql import PooledMySQLConnection
+from .pool import ConnectionPool, PoolStats, PoolTimeout
+from .streaming import stream
+from .transactions import ThreadLocalConnections
+
+__all__ = [
+    "ConnectionPool",
+    "DriverRegistry",
+    "InstrumentedConnection",
+    "InstrumentedSQLiteConnection",
+    "PooledMySQLConnection",
+    "PoolStats",
+    "PoolTimeout",
+    "ThreadLocalConnections",
+    "stream",
+]
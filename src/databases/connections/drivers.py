@@ -0,0 +1,18 @@
+"""File contains the registry of connection drivers"""
+
+
+class DriverRegistry(dict):
+    """
+    Replacement for `ConnectionFactory._connections`.
+
+    Every `ConnectionResolver()`, created for each statement, registers the
+    ORM's stock drivers again, which would replace the drivers of this project
+    after the first query. A registered subclass of a stock driver is kept.
+    """
+
+    def update(self, drivers: dict) -> None:
+        for key, driver in drivers.items():
+            current = self.get(key)
+            if current is not None and issubclass(current, driver):
+                continue
+            self[key] = driver
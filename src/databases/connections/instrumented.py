@@ -0,0 +1,32 @@
+"""File contains the statement timing shared by the connection drivers"""
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable, List
+
+from masoniteorm.connections import SQLiteConnection
+
+
+class InstrumentedConnection:
+    """
+    Connection mixin timing every statement and reporting it to the
+    `listeners` as `(connection name, statement, bindings, seconds)`.
+    """
+
+    listeners: List[Callable[[str, str, tuple, float], None]] = []
+    # ? Rows changed by the last statement of the context, the builders drop it
+    rowcount: ContextVar[int] = ContextVar("rowcount", default=-1)
+
+    def statement(self, query, bindings=()):
+        start = perf_counter()
+        try:
+            result = super().statement(query, bindings)
+            InstrumentedConnection.rowcount.set(self._cursor.rowcount)
+            return result
+        finally:
+            elapsed = perf_counter() - start
+            for listener in InstrumentedConnection.listeners:
+                listener(self.name, query, bindings, elapsed)
+
+
+class InstrumentedSQLiteConnection(InstrumentedConnection, SQLiteConnection):
+    """SQLite connection driver reporting its statements, registered as `sqlite`"""
@@ -0,0 +1,140 @@
+"""File contains the pooled MySQL connection driver"""
+from functools import partial
+
+from masoniteorm.connections import MySQLConnection
+
+from .instrumented import InstrumentedConnection
+from .pool import ConnectionPool
+
+
+def _close(connection):
+    """Closes the socket, bypassing the `close` override set on checkout"""
+    type(connection).close(connection)
+
+
+def _ping(connection):
+    connection.ping(reconnect=False)
+
+
+def _reset(connection):
+    """Rolls back transactions left open by a failed request"""
+    from pymysql.constants import SERVER_STATUS
+
+    if connection.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+        connection.rollback()
+
+
+class PooledMySQLConnection(InstrumentedConnection, MySQLConnection):
+    """
+    MySQL connection driver checking its connections out of a `ConnectionPool`.
+
+    Registered as the `mysql` driver, pool settings are read from the
+    `pool_*` keys of the connection details (`DB_POOL_*` env vars).
+    """
+
+    def pool(self) -> ConnectionPool:
+        """Returns the process wide pool for this connection"""
+        return ConnectionPool.get_or_create(self.name, self._make_pool)
+
+    def _make_pool(self) -> ConnectionPool:
+        import pymysql
+
+        details = self.full_details
+        connect = partial(
+            pymysql.connect,
+            cursorclass=pymysql.cursors.DictCursor,
+            autocommit=True,
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            port=self.port,
+            database=self.database,
+            **self.options,
+        )
+        return ConnectionPool(
+            connect=connect,
+            close=_close,
+            ping=_ping,
+            reset=_reset,
+            min_size=details.get("pool_min_size", 1),
+            max_size=details.get("pool_max_size", 10),
+            idle_timeout=details.get("pool_idle_timeout", 300.0),
+            max_lifetime=details.get("pool_max_lifetime", 1800.0),
+            pre_ping=details.get("pool_pre_ping", True),
+            timeout=details.get("pool_timeout", 10.0),
+        )
+
+    def create_connection(self, autocommit=True):
+        if not self.full_details.get("pool_enabled", True):
+            return super().create_connection(autocommit)
+
+        import pendulum
+        import pymysql.converters
+
+        pymysql.converters.conversions[pendulum.DateTime] = (
+            pymysql.converters.escape_datetime
+        )
+
+        connection = self.pool().checkout()
+        # ? The ORM closes connections after each query, this returns them instead
+        connection.close = self.close_connection
+        self.open = 1
+
+        return connection
+
+    def close_connection(self):
+        if not self.full_details.get("pool_enabled", True):
+            return super().close_connection()
+
+        if self._connection is not None:
+            self.pool().checkin(self._connection)
+        self.open = 0
+        self._connection = None
+
+    def stream(self, query, bindings=(), chunk_size=1000):
+        """
+        Yields the rows of `query` in chunks from an unbuffered (server-side)
+        cursor, so memory stays flat regardless of the size of the result.
+        """
+        import pymysql
+
+        if not self.open:
+            self._connection = self.create_connection()
+
+        self._cursor = self._connection.cursor(pymysql.cursors.SSDictCursor)
+        complete = False
+        try:
+            self.statement(query.replace("'?'", "%s"), bindings)
+            while True:
+                rows = self._cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+            complete = True
+        finally:
+            if complete:
+                self._cursor.close()
+                if self.get_transaction_level() <= 0:
+                    self.open = 0
+                    self._connection.close()
+            else:
+                # ? Closing the cursor would read every remaining row first
+                self._discard_connection()
+
+    def _discard_connection(self):
+        """Closes the socket of an abandoned unbuffered result"""
+        if self._connection is not None:
+            if self.full_details.get("pool_enabled", True):
+                self.pool().checkin(self._connection, discard=True)
+            else:
+                _close(self._connection)
+        self.open = 0
+        self._connection = None
+
+    def query(self, query, bindings=(), results="*"):
+        # ? Check out a pooled connection instead of reconnecting a closed one
+        pooled = self.full_details.get("pool_enabled", True)
+        if pooled and not self.open and not self._dry:
+            self._connection = self.create_connection()
+
+        return super().query(query, bindings, results)
@@ -0,0 +1,305 @@
+"""File contains the ConnectionPool used by pooled database connections"""
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from logging import getLogger
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional
+
+logger = getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out within the pool timeout"""
+
+
+@dataclass
+class PoolEntry:
+    """A raw connection together with its pool bookkeeping"""
+
+    connection: Any
+    created_at: float
+    last_used: float
+
+
+@dataclass
+class PoolStats:
+    """Point in time statistics of a `ConnectionPool`"""
+
+    size: int
+    in_use: int
+    idle: int
+    waiters: int
+    checkouts: int
+    timeouts: int
+    created: int
+    discarded: int
+    checkout_avg_ms: float
+    checkout_max_ms: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class ConnectionPool:
+    """
+    Thread safe pool of raw DB-API connections.
+
+    Connections are created lazily up to `max_size`, handed out LIFO so the
+    warmest connection is reused first, and validated on checkout.
+    Idle connections above `min_size` are closed after `idle_timeout` seconds,
+    and any connection older than `max_lifetime` seconds is replaced.
+    """
+
+    _pools: Dict[str, "ConnectionPool"] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        close: Callable[[Any], None],
+        ping: Optional[Callable[[Any], None]] = None,
+        reset: Optional[Callable[[Any], None]] = None,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300.0,
+        max_lifetime: float = 1800.0,
+        pre_ping: bool = True,
+        timeout: float = 10.0,
+    ):
+        self._connect = connect
+        self._close = close
+        self._ping = ping
+        self._reset = reset
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.pre_ping = pre_ping
+        self.timeout = timeout
+
+        self._lock = threading.Condition()
+        self._idle: deque = deque()
+        self._in_use: Dict[int, PoolEntry] = {}
+        self._size = 0
+        self._warmed = False
+
+        # ? Statistics
+        self._waiters = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._checkout_total = 0.0
+        self._checkout_max = 0.0
+
+    @classmethod
+    def get_or_create(
+        cls, name: str, factory: Callable[[], "ConnectionPool"]
+    ) -> "ConnectionPool":
+        """Returns the pool registered as `name`, creating it with `factory`"""
+        pool = cls._pools.get(name)
+        if pool is None:
+            with cls._pools_lock:
+                pool = cls._pools.get(name)
+                if pool is None:
+                    pool = cls._pools[name] = factory()
+        return pool
+
+    @classmethod
+    def all_stats(cls) -> Dict[str, PoolStats]:
+        """Returns the statistics of every registered pool by name"""
+        return {name: pool.stats() for name, pool in list(cls._pools.items())}
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Closes the idle connections of every registered pool"""
+        for pool in list(cls._pools.values()):
+            pool.close()
+
+    def checkout(self) -> Any:
+        """Checks a connection out of the pool, waiting up to `timeout` seconds"""
+        start = monotonic()
+        if not self._warmed:
+            self._warm()
+
+        entry, expired = self._acquire(start + self.timeout)
+        for stale in expired:
+            self._close_quietly(stale)
+
+        if entry is None:
+            entry = self._create()
+        elif self.pre_ping and self._ping and not self._alive(entry):
+            # ? Keep the slot of the dead connection for its replacement
+            self._discard(entry, release=False)
+            entry = self._create()
+
+        elapsed = monotonic() - start
+        with self._lock:
+            self._in_use[id(entry.connection)] = entry
+            self._checkouts += 1
+            self._checkout_total += elapsed
+            self._checkout_max = max(self._checkout_max, elapsed)
+
+        return entry.connection
+
+    def checkin(self, connection: Any, discard: bool = False) -> None:
+        """Returns a connection to the pool, or closes it when `discard` is set"""
+        with self._lock:
+            entry = self._in_use.pop(id(connection), None)
+        if entry is None:
+            return
+
+        now = monotonic()
+        if not discard and self._reset:
+            try:
+                self._reset(connection)
+            except Exception as e:
+                logger.warning("Discarding connection which failed to reset: %s", e)
+                discard = True
+
+        if discard or now - entry.created_at >= self.max_lifetime:
+            self._discard(entry)
+            return
+
+        entry.last_used = now
+        with self._lock:
+            self._idle.append(entry)
+            self._lock.notify()
+
+    def stats(self) -> PoolStats:
+        """Returns a snapshot of the pool statistics"""
+        with self._lock:
+            checkouts = self._checkouts
+            return PoolStats(
+                size=self._size,
+                in_use=len(self._in_use),
+                idle=len(self._idle),
+                waiters=self._waiters,
+                checkouts=checkouts,
+                timeouts=self._timeouts,
+                created=self._created,
+                discarded=self._discarded,
+                checkout_avg_ms=(
+                    self._checkout_total / checkouts * 1000 if checkouts else 0.0
+                ),
+                checkout_max_ms=self._checkout_max * 1000,
+            )
+
+    def close(self) -> None:
+        """Closes all idle connections, in-use connections close on checkin"""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+            self._warmed = False
+        for entry in idle:
+            self._discard(entry)
+
+    def _acquire(self, deadline: float):
+        """
+        Takes an idle entry or reserves a slot for a new connection.
+        Returns the entry (None when a slot was reserved) and expired entries.
+        """
+        expired: List[PoolEntry] = []
+        with self._lock:
+            while True:
+                expired.extend(self._expire())
+                if self._idle:
+                    return self._idle.pop(), expired
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, expired
+
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"No connection available within {self.timeout}s "
+                        f"(max_size={self.max_size})"
+                    )
+                self._waiters += 1
+                try:
+                    self._lock.wait(remaining)
+                finally:
+                    self._waiters -= 1
+
+    def _expire(self) -> List[PoolEntry]:
+        """
+        Pops idle entries past their lifetime, or past the idle timeout while
+        above `min_size`, releasing their slots. The caller closes them.
+        """
+        now = monotonic()
+        expired = []
+        # ? Oldest idle entries sit on the left, the warm ones on the right
+        while self._idle:
+            entry = self._idle[0]
+            too_old = now - entry.created_at >= self.max_lifetime
+            too_idle = (
+                now - entry.last_used >= self.idle_timeout
+                and self._size > self.min_size
+            )
+            if not (too_old or too_idle):
+                break
+            expired.append(self._idle.popleft())
+            self._size -= 1
+            self._discarded += 1
+        return expired
+
+    def _create(self) -> PoolEntry:
+        """Opens a new connection for a slot reserved by `_acquire`"""
+        try:
+            connection = self._connect()
+        except Exception:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+
+        now = monotonic()
+        with self._lock:
+            self._created += 1
+        return PoolEntry(connection=connection, created_at=now, last_used=now)
+
+    def _alive(self, entry: PoolEntry) -> bool:
+        try:
+            self._ping(entry.connection)
+            return True
+        except Exception as e:
+            logger.info("Replacing connection which failed pre-ping: %s", e)
+            return False
+
+    def _close_quietly(self, entry: PoolEntry) -> None:
+        try:
+            self._close(entry.connection)
+        except Exception as e:
+            logger.debug("Error while closing pooled connection: %s", e)
+
+    def _discard(self, entry: PoolEntry, release: bool = True) -> None:
+        """Closes a connection, releasing its slot unless it is reused"""
+        self._close_quietly(entry)
+        with self._lock:
+            self._discarded += 1
+            if release:
+                self._size -= 1
+                self._lock.notify()
+
+    def _warm(self) -> None:
+        """Opens connections up to `min_size` on first use"""
+        with self._lock:
+            if self._warmed:
+                return
+            self._warmed = True
+            missing = max(self.min_size - self._size, 0)
+            self._size += missing
+
+        for created in range(missing):
+            try:
+                entry = self._create()
+            except Exception as e:
+                logger.warning("Could not warm connection pool: %s", e)
+                with self._lock:
+                    self._size -= missing - created - 1
+                break
+            with self._lock:
+                self._idle.append(entry)
+                self._lock.notify()
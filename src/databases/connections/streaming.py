@@ -0,0 +1,35 @@
+"""File contains row streaming for large result sets"""
+from typing import Iterator, List
+
+from masoniteorm.query import QueryBuilder
+
+from .mysql import PooledMySQLConnection
+
+
+def stream(builder: QueryBuilder, chunk_size: int = 1000) -> Iterator[List[dict]]:
+    """
+    Yields the rows selected by `builder` in chunks of `chunk_size`.
+
+    MySQL rows come from a server-side cursor, other drivers iterate their
+    cursor lazily (SQLite already steps through the result on demand).
+    """
+    connection = builder.new_connection()
+    query, bindings = builder.to_qmark(), builder._bindings
+
+    if isinstance(connection, PooledMySQLConnection):
+        yield from connection.stream(query, bindings, chunk_size)
+        return
+
+    connection._cursor = connection._connection.cursor()
+    try:
+        connection.statement(query.replace("'?'", "?"), bindings)
+        while True:
+            rows = connection._cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [dict(row) for row in rows]
+    finally:
+        connection._cursor.close()
+        if connection.get_transaction_level() <= 0:
+            connection._connection.close()
+            connection.open = 0
@@ -0,0 +1,37 @@
+"""File contains the registry of connections holding an open transaction"""
+import threading
+from collections.abc import MutableMapping
+
+
+class ThreadLocalConnections(MutableMapping):
+    """
+    Per thread replacement for `ConnectionResolver._connections`.
+
+    The ORM keeps the connection of an open transaction in a process wide
+    dict, which would make queries from other executor threads join it.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def _connections(self) -> dict:
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        return connections
+
+    def __getitem__(self, name):
+        return self._connections[name]
+
+    def __setitem__(self, name, connection):
+        self._connections[name] = connection
+
+    def __delitem__(self, name):
+        del self._connections[name]
+
+    def __iter__(self):
+        return iter(self._connections)
+
+    def __len__(self):
+        return len(self._connections)
@@ -0,0 +1,28 @@
+"""AddPaginationIndexes Migration."""
+
+from masoniteorm.migrations import Migration
+
+
+class AddPaginationIndexes(Migration):
+    def up(self):
+        """
+        Run the migrations.
+        """
+        # ? Serves `ORDER BY created_at, uuid` and the cursor range scans
+        with self.schema.table("users") as table:
+            table.index(["deleted_at", "created_at", "uuid"], name="users_cursor_index")
+            table.index(["created_at", "uuid"], name="users_created_at_uuid_index")
+
+        with self.schema.table("preferences") as table:
+            table.index(["created_at", "uuid"], name="preferences_cursor_index")
+
+    def down(self):
+        """
+        Revert the migrations.
+        """
+        with self.schema.table("users") as table:
+            table.drop_index("users_cursor_index")
+            table.drop_index("users_created_at_uuid_index")
+
+        with self.schema.table("preferences") as table:
+            table.drop_index("preferences_cursor_index")
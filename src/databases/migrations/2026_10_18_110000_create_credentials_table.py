@@ -0,0 +1,25 @@
+"""CreateCredentialsTable Migration."""
+
+from masoniteorm.migrations import Migration
+
+
+class CreateCredentialsTable(Migration):
+    def up(self):
+        """
+        Run the migrations.
+        """
+        with self.schema.create("credentials") as table:
+            table.uuid("uuid").primary()
+
+            table.string("username", length=64).unique()
+            table.string("secret", length=255)
+            table.string("salt", length=64)
+
+            table.timestamps()
+            table.soft_deletes()
+
+    def down(self):
+        """
+        Revert the migrations.
+        """
+        self.schema.drop("credentials")
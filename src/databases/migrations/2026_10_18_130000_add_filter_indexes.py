@@ -0,0 +1,50 @@
+"""AddFilterIndexes Migration."""
+
+from masoniteorm.migrations import Migration
+from masoniteorm.schema.platforms import MySQLPlatform
+
+# ? Filtered & sorted columns lead, SQLite can't seek `deleted_at IS NOT NULL`
+USERS_INDEXES = {
+    "users_email_index": ["email", "deleted_at", "uuid"],
+    "users_name_index": ["name", "deleted_at", "uuid"],
+    "users_gender_index": ["gender", "deleted_at", "created_at", "uuid"],
+    "users_age_index": ["age", "deleted_at", "uuid"],
+    "users_updated_at_index": ["updated_at", "deleted_at", "uuid"],
+}
+
+
+class AddFilterIndexes(Migration):
+    def up(self):
+        """
+        Run the migrations.
+        """
+        with self.schema.table("users") as table:
+            # ? MySQL can not index TEXT columns, SQLite indexes them as they are
+            if self.schema.platform is MySQLPlatform:
+                table.string("name", 128).change()
+                table.string("gender", 32).change()
+                table.string("email", 64).change()
+            for name, columns in USERS_INDEXES.items():
+                table.index(columns, name=name)
+
+        # ? Serves `include=preferences`, MySQL already indexes foreign keys
+        if self.schema.platform is not MySQLPlatform:
+            with self.schema.table("preferences") as table:
+                table.index(["user_id"], name="preferences_user_id_index")
+
+    def down(self):
+        """
+        Revert the migrations.
+        """
+        with self.schema.table("users") as table:
+            for name in USERS_INDEXES:
+                table.drop_index(name)
+
+        if self.schema.platform is MySQLPlatform:
+            with self.schema.table("users") as table:
+                table.text("name", length=128).change()
+                table.text("gender", length=32).change()
+                table.text("email", length=64).change()
+        else:
+            with self.schema.table("preferences") as table:
+                table.drop_index("preferences_user_id_index")
@@ -0,0 +1,24 @@
+"""AddVersionColumns Migration."""
+
+from masoniteorm.migrations import Migration
+
+# ? Tables whose rows are written with `If-Match`, existing rows start at 1
+VERSIONED_TABLES = ["users", "preferences"]
+
+
+class AddVersionColumns(Migration):
+    def up(self):
+        """
+        Run the migrations.
+        """
+        for name in VERSIONED_TABLES:
+            with self.schema.table(name) as table:
+                table.integer("version").unsigned().default(1)
+
+    def down(self):
+        """
+        Revert the migrations.
+        """
+        for name in VERSIONED_TABLES:
+            with self.schema.table(name) as table:
+                table.drop_column("version")
@@ -0,0 +1,46 @@
+"""CreateJobsTables Migration."""
+
+from masoniteorm.migrations import Migration
+
+
+class CreateJobsTables(Migration):
+    def up(self):
+        """
+        Run the migrations.
+        """
+        with self.schema.create("jobs") as table:
+            table.increments("id")
+
+            table.string("name", length=64)
+            table.text("payload")
+            table.integer("attempts").unsigned().default(0)
+            # ? A claim moves it past the lease, hiding the job from other workers
+            table.datetime("available_at")
+            table.string("reserved_by", length=32).nullable()
+            table.text("last_error").nullable()
+            table.datetime("created_at")
+
+            # ? The oldest available job, then the batch of its name
+            table.index(["available_at", "id"], name="jobs_available_index")
+            table.index(["name", "available_at", "id"], name="jobs_name_index")
+            table.index(["reserved_by"], name="jobs_reserved_by_index")
+
+        with self.schema.create("failed_jobs") as table:
+            table.increments("id")
+
+            table.unsigned_integer("job_id")
+            table.string("name", length=64)
+            table.text("payload")
+            table.integer("attempts").unsigned()
+            table.text("error").nullable()
+            table.datetime("created_at")
+            table.datetime("failed_at")
+
+            table.index(["name", "failed_at"], name="failed_jobs_name_index")
+
+    def down(self):
+        """
+        Revert the migrations.
+        """
+        self.schema.drop("failed_jobs")
+        self.schema.drop("jobs")
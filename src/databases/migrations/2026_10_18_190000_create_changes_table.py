@@ -0,0 +1,25 @@
+"""CreateChangesTable Migration."""
+
+from masoniteorm.migrations import Migration
+
+
+class CreateChangesTable(Migration):
+    def up(self):
+        """
+        Run the migrations.
+        """
+        with self.schema.create("changes") as table:
+            # ? The `Last-Event-ID` of the change feed, read in its order
+            table.increments("id")
+
+            table.string("entity", length=32)
+            table.string("event", length=16)
+            table.uuid("uuid")
+            table.text("data").nullable()
+            table.datetime("created_at")
+
+    def down(self):
+        """
+        Revert the migrations.
+        """
+        self.schema.drop("changes")
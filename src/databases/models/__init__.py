@@ -1,8 +1,10 @@
 """Module contains and loads Database Models"""
+from .credentials import CredentialsModel
 from .users import UsersModel
 from .preferences import PreferencesModel
 
 __all__ = [
+    "CredentialsModel",
     "UsersModel",
     "PreferencesModel",
 ]
@@ -0,0 +1,27 @@
+"""
+File contains credentials model
+"""
+from masoniteorm.models import Model
+from masoniteorm.scopes import SoftDeletesMixin, UUIDPrimaryKeyMixin
+
+from databases.observers.credentials import CredentialsObserver
+
+
+class CredentialsModel(Model, UUIDPrimaryKeyMixin, SoftDeletesMixin):
+    """
+    Database ORM Model for 'credentials'
+    """
+
+    # __connection__ = 'NAME'
+    __table__ = "credentials"
+    __primary_key__ = "uuid"
+
+    __timezone__ = "Europe/Amsterdam"
+    __timestamps__ = True
+
+    # __fillable__ = ["*"]
+    __guarded__ = ["created_at", "updated_at", "deleted_at"]
+    __hidden__ = ["secret", "salt"]
+
+
+CredentialsModel.observe(CredentialsObserver())
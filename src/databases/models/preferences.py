@@ -5,6 +5,8 @@ from masoniteorm.models import Model
 from masoniteorm.relationships import belongs_to
 from masoniteorm.scopes import UUIDPrimaryKeyMixin
 
+from databases.observers.preferences import PreferencesObserver
+
 
 class PreferencesModel(Model, UUIDPrimaryKeyMixin):
     """
@@ -19,7 +21,7 @@ class PreferencesModel(Model, UUIDPrimaryKeyMixin):
     __timestamps__ = True
 
     # __fillable__ = ["*"]
-    __guarded__ = ["created_at", "updated_at", "deleted_at"]
+    __guarded__ = ["created_at", "updated_at", "deleted_at", "version"]
     # __hidden__ = []
 
     @belongs_to("user_id", "uuid")
@@ -27,3 +29,6 @@ class PreferencesModel(Model, UUIDPrimaryKeyMixin):
         from databases.models.users import UsersModel
 
         return UsersModel
+
+
+PreferencesModel.observe(PreferencesObserver())
@@ -21,7 +21,7 @@ class UsersModel(Model, UUIDPrimaryKeyMixin, SoftDeletesMixin):
     __timestamps__ = True
 
     # __fillable__ = ["*"]
-    __guarded__ = ["created_at", "updated_at", "deleted_at"]
+    __guarded__ = ["created_at", "updated_at", "deleted_at", "version"]
     # __hidden__ = []
 
     @has_one("uuid", "user_id")
@@ -0,0 +1,114 @@
+"""File contains 'credentials' model observer"""
+from masoniteorm.models import Model
+
+from api.cache import VerifiedCredentials
+
+
+class CredentialsObserver:
+    def created(self, credentials: Model):
+        """
+        Handle the Credentials "created" event.
+
+        Args:
+            credentials (masoniteorm.models.Model): Credentials model.
+        """
+        pass
+
+    def creating(self, credentials: Model):
+        """
+        Handle the Credentials "creating" event.
+
+        Args:
+            credentials (masoniteorm.models.Model): Credentials model.
+        """
+        pass
+
+    def saving(self, credentials: Model):
+        """
+        Handle the Credentials "saving" event.
+
+        Args:
+            credentials (masoniteorm.models.Model): Credentials model.
+        """
+        pass
+
+    def saved(self, credentials: Model):
+        """
+        Handle the Credentials "saved" event.
+
+        Args:
+            credentials (masoniteorm.models.Model): Credentials model.
+        """
+        pass
+
+    def updating(self, credentials: Model):
+        """
+        Handle the Credentials "updating" event.
+
+        Args:
+            credentials (masoniteorm.models.Model): Credentials model.
+        """
+        pass
+
+    def updated(self, credentials: Model):
+        """
+        Handle the Credentials "updated" event.
+
+        Args:
+            credentials (masoniteorm.models.Model): Credentials model.
+        """
+        VerifiedCredentials.forget(credentials.username)
+
+    def booted(self, credentials: Model):
+        """
+        Handle the Credentials "booted" event.
+
+        Args:
+            credentials (masoniteorm.models.Model): Credentials model.
+        """
+        return credentials
+
+    def booting(self, credentials: Model):
+        """
+        Handle the Credentials "booting" event.
+
+        Args:
+            credentials (masoniteorm.models.Model): Credentials model.
+        """
+        pass
+
+    def hydrating(self, credentials: Model):
+        """
+        Handle the Credentials "hydrating" event.
+
+        Args:
+            credentials (masoniteorm.models.Model): Credentials model.
+        """
+        pass
+
+    def hydrated(self, credentials: Model):
+        """
+        Handle the Credentials "hydrated" event.
+
+        Args:
+            credentials (masoniteorm.models.Model): Credentials model.
+        """
+        pass
+
+    def deleting(self, credentials: Model):
+        """
+        Handle the Credentials "deleting" event.
+
+        Args:
+            credentials (masoniteorm.models.Model): Credentials model.
+        """
+        pass
+
+    def deleted(self, credentials: Model):
+        """
+        Handle the Credentials "deleted" event.
+
+        Args:
+            credentials (masoniteorm.models.Model): Credentials model.
+        """
+        VerifiedCredentials.forget(credentials.username)
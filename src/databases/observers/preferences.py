@@ -0,0 +1,130 @@
+"""File contains 'preferences' model observer"""
+from masoniteorm.models import Model
+
+from api.cache import Cache, Totals
+from api.changes import Changes
+from api.schema import PreferencesSchema
+
+
+class PreferencesObserver:
+    def created(self, preferences: Model):
+        """
+        Handle the Preferences "created" event.
+
+        Args:
+            preferences (masoniteorm.models.Model): Preferences model.
+        """
+        Totals.add("preferences")
+        Changes.record(
+            "preferences",
+            "created",
+            preferences.uuid,
+            PreferencesSchema(**preferences.serialize()),
+        )
+
+    def creating(self, preferences: Model):
+        """
+        Handle the Preferences "creating" event.
+
+        Args:
+            preferences (masoniteorm.models.Model): Preferences model.
+        """
+        pass
+
+    def saving(self, preferences: Model):
+        """
+        Handle the Preferences "saving" event.
+
+        Args:
+            preferences (masoniteorm.models.Model): Preferences model.
+        """
+        pass
+
+    def saved(self, preferences: Model):
+        """
+        Handle the Preferences "saved" event.
+
+        Args:
+            preferences (masoniteorm.models.Model): Preferences model.
+        """
+        pass
+
+    def updating(self, preferences: Model):
+        """
+        Handle the Preferences "updating" event.
+
+        Args:
+            preferences (masoniteorm.models.Model): Preferences model.
+        """
+        pass
+
+    def updated(self, preferences: Model):
+        """
+        Handle the Preferences "updated" event.
+
+        Args:
+            preferences (masoniteorm.models.Model): Preferences model.
+        """
+        Cache.forget("preferences", preferences.uuid)
+        Changes.record(
+            "preferences",
+            "updated",
+            preferences.uuid,
+            PreferencesSchema(**preferences.serialize()),
+        )
+
+    def booted(self, preferences: Model):
+        """
+        Handle the Preferences "booted" event.
+
+        Args:
+            preferences (masoniteorm.models.Model): Preferences model.
+        """
+        return preferences
+
+    def booting(self, preferences: Model):
+        """
+        Handle the Preferences "booting" event.
+
+        Args:
+            preferences (masoniteorm.models.Model): Preferences model.
+        """
+        pass
+
+    def hydrating(self, preferences: Model):
+        """
+        Handle the Preferences "hydrating" event.
+
+        Args:
+            preferences (masoniteorm.models.Model): Preferences model.
+        """
+        pass
+
+    def hydrated(self, preferences: Model):
+        """
+        Handle the Preferences "hydrated" event.
+
+        Args:
+            preferences (masoniteorm.models.Model): Preferences model.
+        """
+        pass
+
+    def deleting(self, preferences: Model):
+        """
+        Handle the Preferences "deleting" event.
+
+        Args:
+            preferences (masoniteorm.models.Model): Preferences model.
+        """
+        pass
+
+    def deleted(self, preferences: Model):
+        """
+        Handle the Preferences "deleted" event.
+
+        Args:
+            preferences (masoniteorm.models.Model): Preferences model.
+        """
+        Cache.forget("preferences", preferences.uuid)
+        Totals.add("preferences", -1)
+        Changes.record("preferences", "deleted", preferences.uuid)
@@ -1,9 +1,13 @@
 """File contains 'users' model observer"""
-import hashlib
 from uuid import uuid4
 
 from masoniteorm.models import Model
 
+from api.cache import Cache, Totals
+from api.changes import Changes
+from api.hashing import Hasher
+from api.schema import UsersSchema
+from api.search import UsersSearch
 from databases.models.preferences import PreferencesModel
 
 
@@ -16,8 +20,11 @@ class UsersObserver:
             user (masoniteorm.models.Model): Users model.
         """
         print("User created")
+        Changes.record("users", "created", user.uuid, UsersSchema(**user.serialize()))
         # ? Add preferences
         PreferencesModel.create({"uuid": uuid4(), "user_id": user.uuid})
+        UsersSearch.added(user.uuid, user.name, user.email)
+        Totals.add("users")
         return user
 
     def creating(self, user: Model):
@@ -27,12 +34,9 @@ class UsersObserver:
         Args:
             user (masoniteorm.models.Model): Users model.
         """
-        # ? Hash password
-        hasher = hashlib.new("sha512")
-        hasher.update(f"{user.password}{user.salt}".encode("utf-8"))
-        user.password = hasher.hexdigest()
-        user.save()
-        return user.fresh()
+        # ? Hash password, the changed attribute is part of the INSERT
+        user.password = Hasher.hash(user.password, user.salt)
+        return user
 
     def saving(self, user: Model):
         """
@@ -68,7 +72,9 @@ class UsersObserver:
         Args:
             user (masoniteorm.models.Model): Users model.
         """
-        pass
+        Cache.forget("users", user.uuid)
+        UsersSearch.added(user.uuid, user.name, user.email)
+        Changes.record("users", "updated", user.uuid, UsersSchema(**user.serialize()))
 
     def booted(self, user: Model):
         """
@@ -122,4 +128,8 @@ class UsersObserver:
         Args:
             user (masoniteorm.models.Model): Users model.
         """
-        pass
+        Cache.forget("users", user.uuid)
+        UsersSearch.removed(user.uuid)
+        Totals.add("users", -1)
+        Totals.add("users:deleted")
+        Changes.record("users", "deleted", user.uuid)
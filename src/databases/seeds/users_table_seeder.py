@@ -14,8 +14,8 @@ class UsersTableSeeder(Seeder):
 
     def run(self):
         """Run the database seeds."""
+        fake = Faker()
         for user in range(1, 10):
-            fake = Faker()
             fake_age = fake.random_int(min=25, max=55)
             fake_name = fake.name()
             fake_email = f"{fake_name.lower().replace(' ', '_')}{fake_age}@example.com"
@@ -4,14 +4,58 @@ Main Application file
 Used as target when running the ASGI server
 ex: `uvicorn main:app --reload` from `src/`
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from api.cache import Cache, VerifiedCredentials
+from api.changes import ChangesBroadcaster
+from api.hashing import Hasher
+from api.metrics import Metrics
+from api.profiler import ProfilerMiddleware
+from api.ratelimit import RateLimit
 from api.routers import routers
+from api.search import UsersSearch
+from api.services import Executor
 from config import Config
+from databases.connections import ConnectionPool, PoolTimeout
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Starts & stops application wide resources"""
+    Metrics.start()
+    await Executor.run(UsersSearch.start)
+    yield
+    ChangesBroadcaster.close()
+    UsersSearch.close()
+    Metrics.close()
+    Executor.shutdown()
+    Hasher.shutdown()
+    Cache.close()
+    VerifiedCredentials.close()
+    RateLimit.close()
+    ConnectionPool.close_all()
+
 
 # Initialize application with configs
-app = FastAPI(**Config.Api.model_dump())
+app = FastAPI(**Config.Api.model_dump(), lifespan=lifespan)
+
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    """Answers with 503 when the database connection pool is exhausted"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database is busy, try again later"},
+        headers={"Retry-After": "1"},
+    )
+
+
+# Profile the queries of each request when debugging
+app.add_middleware(ProfilerMiddleware)
 
 # Mount & serve the frontend
 app.mount("/frontend", StaticFiles(directory="frontend"), name="frontend")
@@ -0,0 +1,30 @@
+"""
+Worker Application file
+
+Runs the queued jobs apart from the web workers, as many as needed
+ex: `python worker.py` from `src/`
+"""
+import asyncio
+import logging
+
+import api.tasks  # noqa: F401, registers the job handlers
+from api.jobs import JobsWorker
+from api.metrics import Metrics
+from api.services import Executor
+from databases.connections import ConnectionPool
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    # ? Task metrics are merged into `/metrics` with those of the web workers
+    Metrics.start()
+    try:
+        asyncio.run(JobsWorker().run())
+    finally:
+        Metrics.close()
+        Executor.shutdown()
+        ConnectionPool.close_all()
+
+
+if __name__ == "__main__":
+    main()
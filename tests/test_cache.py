@@ -0,0 +1,117 @@
+"""
+File contains tests for the entity `Cache` backends
+"""
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from unittest import TestCase, mock
+
+from api.cache import Cache, MemoryBackend, SqliteBackend
+from config import Config
+
+
+class BackendTests(ABC):
+    """
+    Testcases shared by every cache backend
+    """
+
+    @abstractmethod
+    def make_backend(self, max_entries=100, ttl=60):
+        """Returns an empty backend, closed when the test ends"""
+
+    def test_get_returns_what_was_set(self):
+        backend = self.make_backend()
+        backend.set("users:1", {"name": "Ada"})
+
+        self.assertEqual(backend.get("users:1"), {"name": "Ada"})
+        self.assertIsNone(backend.get("users:2"))
+
+    def test_delete_removes_entry(self):
+        backend = self.make_backend()
+        backend.set("users:1", {"name": "Ada"})
+        backend.delete("users:1")
+
+        self.assertIsNone(backend.get("users:1"))
+
+    def test_least_recently_used_is_evicted(self):
+        backend = self.make_backend(max_entries=2)
+        backend.set("a", {})
+        backend.set("b", {})
+        with mock.patch("time.time", return_value=self.clock() + 10):
+            backend.get("a")
+            backend.set("c", {})
+
+        self.assertEqual(len(backend), 2)
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("a"), {})
+
+    def test_expired_entries_are_not_returned(self):
+        backend = self.make_backend(ttl=5)
+        backend.set("a", {})
+
+        with mock.patch(self.clock_path, return_value=self.clock() + 6):
+            self.assertIsNone(backend.get("a"))
+
+
+class TestMemoryBackend(BackendTests, TestCase):
+    """
+    Testcases for the in-process `MemoryBackend`
+    """
+
+    clock_path = "time.monotonic"
+    clock = staticmethod(time.monotonic)
+
+    def make_backend(self, max_entries=100, ttl=60):
+        return MemoryBackend(max_entries, ttl)
+
+
+class TestSqliteBackend(BackendTests, TestCase):
+    """
+    Testcases for the shared `SqliteBackend`
+    """
+
+    clock_path = "time.time"
+    clock = staticmethod(time.time)
+
+    def make_backend(self, max_entries=100, ttl=60):
+        directory = tempfile.mkdtemp()
+        backend = SqliteBackend(os.path.join(directory, "cache.sqlite3"), max_entries, ttl)
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_entries_are_shared_between_instances(self):
+        first = self.make_backend()
+        second = SqliteBackend(first.path)
+        self.addCleanup(second.close)
+
+        first.set("users:1", {"name": "Ada"})
+        self.assertEqual(second.get("users:1"), {"name": "Ada"})
+
+        second.delete("users:1")
+        self.assertIsNone(first.get("users:1"))
+
+
+class TestCache(TestCase):
+    """
+    Testcases for the read-through `Cache`
+    """
+
+    def setUp(self):
+        self.config = mock.patch.multiple(Config.Cache, enabled=True, backend="memory")
+        self.config.start()
+        self.addCleanup(self.config.stop)
+        Cache.close()
+        self.addCleanup(Cache.close)
+
+    def test_entries_evicted_while_loading_are_not_stored(self):
+        def load() -> dict:
+            # ? The entity changes after it was read, before it is stored
+            Cache.forget("users", 1)
+            return {"name": "Stale"}
+
+        self.assertEqual(Cache.remember("users", 1, load), {"name": "Stale"})
+        self.assertIsNone(Cache.peek("users", 1))
+
+        Cache.remember("users", 1, lambda: {"name": "Fresh"})
+        self.assertEqual(Cache.peek("users", 1), {"name": "Fresh"})
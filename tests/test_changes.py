@@ -0,0 +1,150 @@
+"""
+File contains tests for the change log & its '/api/changes/stream' events
+"""
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+from unittest import TestCase, mock
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from masoniteorm.exceptions import QueryException
+
+from api.changes import Changes, ChangesBroadcaster
+from config import Config
+from src.main import app
+
+
+class TestChanges(TestCase):
+    """
+    Testcases for the `ChangesBroadcaster` streams, read without a client as
+    the `TestClient` buffers a response until it ends
+    """
+
+    def setUp(self):
+        self.app = TestClient(app)
+        self.auth = (Config.Auth.username, Config.Auth.password)
+
+    def create_user(self) -> dict:
+        response = self.app.post(
+            "/api/users/",
+            json={"email": f"{uuid4().hex}@example.com", "password": "password"},
+            auth=self.auth,
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def update_user(self, uuid: str, name: str) -> None:
+        response = self.app.patch(
+            f"/api/users/{uuid}", json={"name": name}, auth=self.auth
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @staticmethod
+    async def read(
+        stream: AsyncIterator[str], count: int
+    ) -> List[Tuple[Optional[int], str, dict]]:
+        """Returns the next `count` events of a stream, skipping comments"""
+        events = []
+        while len(events) < count:
+            text = await asyncio.wait_for(stream.__anext__(), 5)
+            if text.startswith(":"):
+                continue
+            fields = dict(line.split(": ", 1) for line in text.strip().split("\n"))
+            id = int(fields["id"]) if "id" in fields else None
+            events.append((id, fields["event"], json.loads(fields["data"])))
+        return events
+
+    def test_stream_resumes_then_follows_the_changes(self):
+        newest = Changes.bounds()[1]
+        user = self.create_user()
+
+        async def follow():
+            stream = ChangesBroadcaster.stream(newest, "users")
+            try:
+                [created] = await self.read(stream, 1)
+                await asyncio.to_thread(self.update_user, user["uuid"], "Changed")
+                [updated] = await self.read(stream, 1)
+            finally:
+                await stream.aclose()
+            return created, updated
+
+        created, updated = asyncio.run(follow())
+
+        self.assertEqual(created[1], "users.created")
+        self.assertGreater(created[0], newest)
+        self.assertEqual(created[2]["uuid"], user["uuid"])
+        self.assertEqual(updated[1], "users.updated")
+        self.assertGreater(updated[0], created[0])
+        self.assertEqual(updated[2]["data"]["name"], "Changed")
+        # ? Secrets are not part of the log
+        self.assertNotIn("password", updated[2]["data"])
+        self.assertNotIn("salt", updated[2]["data"])
+
+    def test_stream_only_sends_the_entity_asked_for(self):
+        newest = Changes.bounds()[1]
+        user = self.create_user()
+
+        async def follow():
+            stream = ChangesBroadcaster.stream(newest, "preferences")
+            try:
+                return await self.read(stream, 1)
+            finally:
+                await stream.aclose()
+
+        [(_, event, change)] = asyncio.run(follow())
+
+        self.assertEqual(event, "preferences.created")
+        self.assertEqual(change["data"]["user_id"], user["uuid"])
+
+    def test_stream_resets_clients_behind_the_log(self):
+        self.create_user()
+        with mock.patch.object(Config.Changes, "retention", 1):
+            Changes.prune()
+        oldest, newest = Changes.bounds()
+        self.assertEqual(oldest, newest)
+
+        async def follow():
+            stream = ChangesBroadcaster.stream(0)
+            try:
+                return await self.read(stream, 2)
+            finally:
+                await stream.aclose()
+
+        reset, kept = asyncio.run(follow())
+
+        self.assertEqual(reset, (None, "reset", {"oldest": oldest}))
+        self.assertEqual(kept[0], newest)
+
+    def test_updates_are_not_written_without_their_change(self):
+        url = f"/api/users/{self.create_user()['uuid']}"
+        user = self.app.get(url, auth=self.auth).json()
+
+        with mock.patch.object(Changes, "record", side_effect=QueryException("failed")):
+            response = self.app.patch(url, json={"name": "Lost"}, auth=self.auth)
+
+        self.assertEqual(response.status_code, 409)
+        retrieved = self.app.get(url, auth=self.auth).json()
+        self.assertEqual(retrieved["name"], user["name"])
+        self.assertEqual(retrieved["version"], user["version"])
+
+    def test_streams_falling_behind_are_ended(self):
+        rows = [
+            {
+                "id": id,
+                "entity": "users",
+                "event": "deleted",
+                "uuid": str(uuid4()),
+                "data": None,
+                "created_at": "2026-01-01 00:00:00",
+            }
+            for id in (1, 2)
+        ]
+        queue = asyncio.Queue(1)
+        with mock.patch.multiple(
+            ChangesBroadcaster, _subscribers={queue: None}, position=0
+        ):
+            ChangesBroadcaster.publish(rows)
+            self.assertEqual(ChangesBroadcaster._subscribers, {})
+
+        self.assertEqual(queue.get_nowait(), (0, None))
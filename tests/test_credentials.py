@@ -0,0 +1,125 @@
+"""
+File contains tests for 'credentials' features
+"""
+import os
+import tempfile
+import time
+from unittest import TestCase, mock
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from api.cache import SqliteBackend, VerifiedCredentials
+from api.services import CredentialsService
+from config import Config
+from src.main import app
+
+
+class TestCredentials(TestCase):
+    """
+    Testcases for 'credentials' features
+    """
+
+    app: TestClient
+
+    def setUp(self):
+        """
+        Sets up ASGI Test App and global variables
+        """
+        # ASGI Test App
+        self.app = TestClient(app)
+
+        # TestCase Global Variables
+        self.auth = (Config.Auth.username, Config.Auth.password)
+
+    def create_credentials(self) -> dict:
+        response = self.app.post(
+            "/api/credentials/", json={"username": uuid4().hex}, auth=self.auth
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def test_credentials_authenticate_and_are_cached(self):
+        credentials = self.create_credentials()
+        auth = (credentials["username"], credentials["secret"])
+
+        with mock.patch.object(
+            CredentialsService,
+            "authenticate",
+            autospec=True,
+            side_effect=CredentialsService.authenticate,
+        ) as authenticate:
+            for _ in range(3):
+                response = self.app.get("/api/users/", auth=auth)
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(authenticate.call_count, 1)
+
+        wrong = self.app.get("/api/users/", auth=(credentials["username"], "wrong"))
+        self.assertEqual(wrong.status_code, 401)
+
+    def test_credentials_cannot_manage_credentials(self):
+        credentials = self.create_credentials()
+        auth = (credentials["username"], credentials["secret"])
+
+        response = self.app.get("/api/credentials/", auth=auth)
+        self.assertEqual(response.status_code, 401)
+
+        listed = self.app.get("/api/credentials/", auth=self.auth).json()["data"]
+        self.assertNotIn("secret", listed[0])
+
+    def test_revoked_credentials_are_rejected_immediately(self):
+        credentials = self.create_credentials()
+        auth = (credentials["username"], credentials["secret"])
+        self.assertEqual(self.app.get("/api/users/", auth=auth).status_code, 200)
+        self.assertTrue(VerifiedCredentials.check(*auth))
+
+        response = self.app.delete(
+            f"/api/credentials/{credentials['uuid']}", auth=self.auth
+        )
+        self.assertEqual(response.status_code, 204)
+
+        self.assertFalse(VerifiedCredentials.check(*auth))
+        self.assertEqual(self.app.get("/api/users/", auth=auth).status_code, 401)
+
+    def test_revoked_usernames_can_be_issued_again(self):
+        revoked = self.create_credentials()
+        self.app.delete(f"/api/credentials/{revoked['uuid']}", auth=self.auth)
+
+        response = self.app.post(
+            "/api/credentials/", json={"username": revoked["username"]}, auth=self.auth
+        )
+        self.assertEqual(response.status_code, 201)
+        auth = (revoked["username"], response.json()["secret"])
+        self.assertEqual(self.app.get("/api/users/", auth=auth).status_code, 200)
+
+        taken = self.app.post(
+            "/api/credentials/", json={"username": revoked["username"]}, auth=self.auth
+        )
+        self.assertEqual(taken.status_code, 409)
+
+    def test_verification_racing_a_revocation_is_not_cached(self):
+        token = VerifiedCredentials.begin()
+        VerifiedCredentials.forget("racing")
+        VerifiedCredentials.remember("racing", "secret", token)
+
+        self.assertFalse(VerifiedCredentials.check("racing", "secret"))
+
+    def test_revocations_in_other_workers_are_seen(self):
+        path = os.path.join(tempfile.mkdtemp(), "revocations.sqlite3")
+        VerifiedCredentials.close()
+        self.addCleanup(VerifiedCredentials.close)
+        # ? Shared with the default, per worker cache backend too
+        with mock.patch.object(Config.Cache, "backend", "memory"), mock.patch.object(
+            Config.Auth, "revocations_path", path
+        ):
+            VerifiedCredentials.remember(
+                "revoked", "secret", VerifiedCredentials.begin()
+            )
+            self.assertTrue(VerifiedCredentials.check("revoked", "secret"))
+
+            # ? Stamped by the worker which handled the revocation
+            other = SqliteBackend(path)
+            self.addCleanup(other.close)
+            other.set("revoked", {"at": time.time()})
+
+            self.assertFalse(VerifiedCredentials.check("revoked", "secret"))
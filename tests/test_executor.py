@@ -0,0 +1,82 @@
+"""
+File contains tests for the service `Executor`
+"""
+import asyncio
+import threading
+from unittest import TestCase, mock
+
+from api.services import Executor
+from config import Config
+
+
+class TestExecutor(TestCase):
+    """
+    Testcases for the service `Executor`
+    """
+
+    def test_iterate_runs_the_generator_on_one_thread(self):
+        threads = set()
+
+        def numbers():
+            for number in range(10):
+                threads.add(threading.get_ident())
+                yield number
+
+        async def consume():
+            return [number async for number in Executor.iterate(numbers, buffer=2)]
+
+        self.assertEqual(asyncio.run(consume()), list(range(10)))
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_iterate_stops_the_generator_when_the_consumer_leaves(self):
+        closed = threading.Event()
+
+        def endless():
+            try:
+                while True:
+                    yield b"row"
+            finally:
+                closed.set()
+
+        async def consume():
+            rows = Executor.iterate(endless, buffer=1)
+            async for _ in rows:
+                break
+            await rows.aclose()
+
+        asyncio.run(consume())
+        self.assertTrue(closed.wait(timeout=5))
+
+    def test_iterate_raises_generator_errors(self):
+        def failing():
+            yield 1
+            raise ValueError("failed")
+
+        async def consume():
+            return [item async for item in Executor.iterate(failing)]
+
+        with self.assertRaises(ValueError):
+            asyncio.run(consume())
+
+    def test_streams_do_not_occupy_the_service_threads(self):
+        release = threading.Event()
+
+        def slow():
+            release.wait(timeout=5)
+            yield 1
+
+        async def consume():
+            rows = Executor.iterate(slow)
+            pending = asyncio.ensure_future(rows.__anext__())
+            try:
+                return await asyncio.wait_for(Executor.run(lambda: 2), 5)
+            finally:
+                release.set()
+                await pending
+                await rows.aclose()
+
+        Executor.shutdown()
+        self.addCleanup(Executor.shutdown)
+        with mock.patch.multiple(Config.Executor, max_workers=1, max_streams=1):
+            self.assertEqual(asyncio.run(consume()), 2)
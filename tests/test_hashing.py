@@ -0,0 +1,78 @@
+"""
+File contains tests for the password `Hasher`
+"""
+import hashlib
+from unittest import TestCase, mock
+
+from api.hashing import Hasher
+from config import Config
+
+
+class TestHasher(TestCase):
+    """
+    Testcases for the password `Hasher`
+    """
+
+    def setUp(self):
+        """
+        Hashes in-process with cheap costs unless a test says otherwise
+        """
+        self.config = mock.patch.multiple(
+            Config.Hashing,
+            workers=0,
+            scrypt_ln=4,
+            pbkdf2_iterations=1000,
+        )
+        self.config.start()
+        self.addCleanup(self.config.stop)
+        self.addCleanup(Hasher.shutdown)
+
+    def test_algorithms_round_trip(self):
+        for algorithm in ["sha512", "scrypt", "pbkdf2_sha256"]:
+            with mock.patch.object(Config.Hashing, "algorithm", algorithm):
+                encoded = Hasher.hash("password", "salt")
+
+                self.assertTrue(Hasher.verify("password", "salt", encoded))
+                self.assertFalse(Hasher.verify("wrong", "salt", encoded))
+                self.assertFalse(Hasher.verify("password", "pepper", encoded))
+                self.assertFalse(Hasher.needs_rehash(encoded))
+
+    def test_hash_stores_algorithm_and_params(self):
+        with mock.patch.object(Config.Hashing, "algorithm", "scrypt"):
+            encoded = Hasher.hash("password", "salt")
+
+        self.assertTrue(encoded.startswith("$scrypt$ln=4,p=1,r=8$"))
+
+    def test_legacy_sha512_hashes_verify(self):
+        legacy = hashlib.sha512(b"passwordsalt").hexdigest()
+
+        self.assertTrue(Hasher.verify("password", "salt", legacy))
+        self.assertTrue(Hasher.needs_rehash(legacy))
+
+    def test_cost_change_needs_rehash(self):
+        encoded = Hasher.hash("password", "salt")
+
+        with mock.patch.object(Config.Hashing, "scrypt_ln", 5):
+            self.assertTrue(Hasher.needs_rehash(encoded))
+            # ? Old hashes keep verifying with the params they were made with
+            self.assertTrue(Hasher.verify("password", "salt", encoded))
+
+    def test_unknown_algorithm_is_rejected(self):
+        self.assertFalse(Hasher.verify("password", "salt", "$md5$$abc"))
+        self.assertTrue(Hasher.needs_rehash("$md5$$abc"))
+
+    def test_missing_secrets_do_not_verify(self):
+        encoded = Hasher.hash("password", "salt")
+
+        self.assertFalse(Hasher.verify("password", None, encoded))
+        self.assertFalse(Hasher.verify("password", "salt", None))
+
+    def test_worker_processes_match_in_process_hashes(self):
+        expected = [Hasher.hash(f"password{i}", "salt") for i in range(4)]
+
+        with mock.patch.object(Config.Hashing, "workers", 2):
+            hashed = Hasher.hash_many((f"password{i}", "salt") for i in range(4))
+            self.assertIsNotNone(Hasher._pool)
+            self.assertTrue(Hasher.verify("password0", "salt", hashed[0]))
+
+        self.assertEqual(hashed, expected)
@@ -0,0 +1,187 @@
+"""
+File contains tests for the durable `Jobs` queue and its `JobsWorker`
+"""
+import asyncio
+import json
+from typing import List
+from unittest import TestCase, mock
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from masoniteorm.exceptions import QueryException
+from pydantic import BaseModel
+
+from api.jobs import Jobs, JobsWorker
+from config import Config
+from config.databases import DB
+from src.main import app
+
+
+class Payload(BaseModel):
+    value: str
+
+
+class Invalid(BaseModel):
+    number: int
+
+
+class TestJobs(TestCase):
+    """
+    Testcases for the `Jobs` queue, run by a `JobsWorker` of their name only
+    """
+
+    def setUp(self):
+        self.name = f"test.{uuid4().hex[:12]}"
+        self.batches: List[List[str]] = []
+
+        async def handler(payloads: List[Payload]):
+            values = [payload.value for payload in payloads]
+            self.batches.append(values)
+            if "bad" in values:
+                raise ValueError("bad payload")
+
+        Jobs.handler(self.name, Payload)(handler)
+        self.worker = JobsWorker(names=[self.name])
+
+    def tearDown(self):
+        Jobs.handlers.pop(self.name, None)
+
+    def enqueue(self, *values: str) -> None:
+        Jobs.enqueue(self.name, [Payload(value=value) for value in values])
+
+    def run_once(self) -> int:
+        return asyncio.run(self.worker.run_once())
+
+    def rows(self, table: str = "jobs") -> list:
+        builder = DB.get_query_builder().table(table).where("name", self.name)
+        return list(builder.order_by("id").get())
+
+    def expire(self) -> None:
+        DB.get_query_builder().table("jobs").where("name", self.name).update(
+            {"available_at": Jobs.now()}
+        )
+
+    def test_jobs_of_a_name_run_in_batches(self):
+        self.enqueue("a", "b", "c")
+
+        with mock.patch.object(Config.Jobs, "batch_size", 2):
+            self.assertEqual(self.run_once(), 2)
+            self.assertEqual(self.run_once(), 1)
+            self.assertEqual(self.run_once(), 0)
+
+        self.assertEqual(self.batches, [["a", "b"], ["c"]])
+        self.assertEqual(self.rows(), [])
+
+    def test_failed_batches_back_off_then_dead_letter(self):
+        self.enqueue("good", "bad")
+
+        with mock.patch.object(Config.Jobs, "max_attempts", 2):
+            self.assertEqual(self.run_once(), 2)
+            # ? The batch is retried as a whole, nothing is run twice at once
+            self.assertEqual(self.batches, [["good", "bad"]])
+            jobs = self.rows()
+            self.assertEqual([job["attempts"] for job in jobs], [1, 1])
+            self.assertEqual(jobs[1]["last_error"], "ValueError: bad payload")
+            self.assertGreater(str(jobs[1]["available_at"]), Jobs.now())
+            self.assertEqual(self.run_once(), 0)
+
+            self.expire()
+            self.assertEqual(self.run_once(), 2)
+
+        self.assertEqual(self.batches, [["good", "bad"]] * 2)
+        self.assertEqual(self.rows(), [])
+        failed = self.rows("failed_jobs")
+        self.assertEqual([job["job_id"] for job in failed], [job["id"] for job in jobs])
+        self.assertEqual(json.loads(failed[1]["payload"]), {"value": "bad"})
+
+    def test_invalid_payloads_are_dead_lettered_apart(self):
+        self.enqueue("a")
+        Jobs.enqueue(self.name, [Invalid(number=1)])
+
+        self.assertEqual(self.run_once(), 2)
+
+        self.assertEqual(self.batches, [["a"]])
+        self.assertEqual(self.rows(), [])
+        [failed] = self.rows("failed_jobs")
+        self.assertEqual(failed["attempts"], 1)
+        self.assertTrue(failed["error"].startswith("ValidationError"))
+
+    def test_jobs_of_a_lost_worker_run_after_their_lease(self):
+        self.enqueue("a")
+        # ? Claimed by a worker which stopped before running them
+        self.assertEqual(len(Jobs.claim(10, [self.name])), 1)
+        self.assertEqual(self.run_once(), 0)
+
+        self.expire()
+        self.assertEqual(self.run_once(), 1)
+        self.assertEqual(self.batches, [["a"]])
+
+    def test_jobs_claimed_again_are_not_completed_by_the_first_worker(self):
+        self.enqueue("a")
+        lost = Jobs.claim(10, [self.name])
+        self.expire()
+        claimed = Jobs.claim(10, [self.name])
+
+        Jobs.complete(lost)
+        self.assertEqual([job["id"] for job in self.rows()], [claimed[0]["id"]])
+
+        Jobs.complete(claimed)
+        self.assertEqual(self.rows(), [])
+
+
+class TestUsersJobs(TestCase):
+    """
+    Testcases for the jobs queued by the '/api/users' endpoints
+    """
+
+    def setUp(self):
+        self.app = TestClient(app)
+        self.auth = (Config.Auth.username, Config.Auth.password)
+
+    def create_user(self) -> dict:
+        response = self.app.post(
+            "/api/users/",
+            json={"email": f"{uuid4().hex}@example.com", "password": "password"},
+            auth=self.auth,
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def queued(self, uuid: str) -> list:
+        return list(
+            DB.get_query_builder()
+            .table("jobs")
+            .where("name", "users.do_after")
+            .where("payload", "like", f"%{uuid}%")
+            .get()
+        )
+
+    def test_created_users_are_queued_without_secrets(self):
+        user = self.create_user()
+
+        [job] = self.queued(user["uuid"])
+        payload = json.loads(job["payload"])
+        self.assertEqual(payload["name"], user["name"])
+        self.assertEqual(payload["password"], "**********")
+
+    def test_disabled_queue_runs_after_the_response(self):
+        with mock.patch.object(Config.Jobs, "enabled", False), mock.patch(
+            "builtins.print"
+        ) as printed:
+            user = self.create_user()
+
+        self.assertEqual(self.queued(user["uuid"]), [])
+        printed.assert_called_with(f"User.Name: {user['name']}")
+
+    def test_users_are_not_created_without_their_job(self):
+        uuid = str(uuid4())
+        with mock.patch.object(Jobs, "enqueue", side_effect=QueryException("failed")):
+            response = self.app.post(
+                "/api/users/",
+                json={"uuid": uuid, "email": f"{uuid}@example.com", "password": "p"},
+                auth=self.auth,
+            )
+
+        self.assertEqual(response.status_code, 409)
+        retrieved = self.app.get(f"/api/users/{uuid}", auth=self.auth)
+        self.assertEqual(retrieved.status_code, 404)
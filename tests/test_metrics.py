@@ -0,0 +1,113 @@
+"""
+File contains tests for the Prometheus `Metrics`
+"""
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from fastapi.testclient import TestClient
+
+from api.metrics import Counter, Gauge, Histogram, Metrics
+from api.metrics.registry import merge, render
+from config import Config
+from src.main import app
+
+
+class TestRegistry(TestCase):
+    """
+    Testcases for the metric types & text format
+    """
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("latency_seconds", "Latency", ("op",), (0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe("a", value=value)
+
+        text = render(merge([({"latency_seconds": histogram.snapshot()}, True)]))
+        self.assertIn('latency_seconds_bucket{op="a",le="0.1"} 2', text)
+        self.assertIn('latency_seconds_bucket{op="a",le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{op="a",le="+Inf"} 4', text)
+        self.assertIn('latency_seconds_count{op="a"} 4', text)
+        self.assertIn('latency_seconds_sum{op="a"} 3.65', text)
+
+    def test_exited_processes_keep_counters_not_gauges(self):
+        counter, gauge = Counter("c_total", "C", ("op",)), Gauge("g", "G", ("op",))
+        counter.inc("a", amount=2)
+        gauge.inc("a", amount=3)
+        snapshot = {"c_total": counter.snapshot(), "g": gauge.snapshot()}
+
+        merged = merge([(snapshot, True), (snapshot, False)])
+        self.assertEqual(merged["c_total"]["samples"][("a",)], 4)
+        self.assertEqual(merged["g"]["samples"][("a",)], 3)
+
+
+class TestMetrics(TestCase):
+    """
+    Testcases for the `/metrics` endpoint
+    """
+
+    def setUp(self):
+        self.app = TestClient(app)
+        self.auth = (Config.Auth.username, Config.Auth.password)
+        patcher = mock.patch.object(Config.Metrics, "directory", tempfile.mkdtemp())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sample(self, text: str, prefix: str) -> float:
+        lines = [line for line in text.splitlines() if line.startswith(prefix)]
+        return float(lines[0].rsplit(" ", 1)[1]) if lines else 0
+
+    def test_requests_and_queries_are_recorded_by_operation(self):
+        requests = 'http_requests_total{operation_id="api.users.listed",method="GET",status="200"}'
+        queries = 'db_query_duration_seconds_count{connection="sqlite",statement="select"}'
+        before = self.app.get("/metrics", auth=self.auth).text
+
+        for _ in range(3):
+            self.app.get("/api/users/", auth=self.auth)
+
+        response = self.app.get("/metrics", auth=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertEqual(self.sample(response.text, requests) - self.sample(before, requests), 3)
+        if Config.Database.databases["default"] == "sqlite":
+            self.assertGreaterEqual(
+                self.sample(response.text, queries) - self.sample(before, queries), 3
+            )
+
+    def test_snapshots_of_other_workers_are_merged(self):
+        counter = Counter("http_requests_total", "Requests", ("operation_id", "method", "status"))
+        counter.inc("api.users.listed", "GET", "200", amount=1000)
+        gauge = Gauge("http_requests_in_flight", "In flight", ("operation_id",))
+        gauge.inc("api.users.listed", amount=50)
+        exited = os.path.join(Config.Metrics.directory, "999999999.json")
+        with open(exited, "w") as file:
+            json.dump(
+                {
+                    "http_requests_total": counter.snapshot(),
+                    "http_requests_in_flight": gauge.snapshot(),
+                },
+                file,
+            )
+
+        text = Metrics.render()
+        prefix = 'http_requests_total{operation_id="api.users.listed",method="GET",status="200"}'
+        self.assertGreaterEqual(self.sample(text, prefix), 1000)
+        in_flight = 'http_requests_in_flight{operation_id="api.users.listed"}'
+        self.assertLess(self.sample(text, in_flight), 50)
+
+    def test_exited_workers_are_folded_once(self):
+        counter = Counter("http_requests_total", "Requests", ("operation_id", "method", "status"))
+        counter.inc("api.users.exited", "GET", "200", amount=7)
+        for name in ("999999998-1.json", "999999999-2.json"):
+            path = os.path.join(Config.Metrics.directory, name)
+            with open(path, "w") as file:
+                json.dump({"http_requests_total": counter.snapshot()}, file)
+
+        prefix = 'http_requests_total{operation_id="api.users.exited",method="GET",status="200"}'
+        for _ in range(2):
+            self.assertEqual(self.sample(Metrics.render(), prefix), 14)
+
+        files = sorted(os.listdir(Config.Metrics.directory))
+        own = "{}-{}.json".format(*Metrics._process)
+        self.assertEqual(files, [".lock", own, "exited.json"])
@@ -0,0 +1,188 @@
+"""
+File contains tests for the database `ConnectionPool`
+"""
+import threading
+import time
+from unittest import TestCase, mock
+
+from masoniteorm.connections import ConnectionFactory
+
+from config.databases import DB
+from databases.connections import (
+    ConnectionPool,
+    PooledMySQLConnection,
+    PoolTimeout,
+)
+
+
+class FakeConnection:
+    """Stand-in for a DB-API connection"""
+
+    def __init__(self):
+        self.closed = False
+        self.alive = True
+
+
+class FakeCursor:
+    """Stand-in for a DB-API cursor"""
+
+    rowcount = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, query, bindings):
+        pass
+
+    def fetchall(self):
+        return [{"value": 1}]
+
+    def close(self):
+        pass
+
+
+class FakeMySQLConnection(FakeConnection):
+    def cursor(self):
+        return FakeCursor()
+
+
+class TestConnectionPool(TestCase):
+    """
+    Testcases for the `ConnectionPool`
+    """
+
+    def make_pool(self, **kwargs) -> ConnectionPool:
+        """Creates a pool of `FakeConnection`s"""
+        self.connected = []
+
+        def connect():
+            connection = FakeConnection()
+            self.connected.append(connection)
+            return connection
+
+        def close(connection):
+            connection.closed = True
+
+        def ping(connection):
+            if not connection.alive:
+                raise ConnectionError("gone away")
+
+        options = {"min_size": 0, "max_size": 2, "timeout": 0.05}
+        options.update(kwargs)
+        return ConnectionPool(connect=connect, close=close, ping=ping, **options)
+
+    def test_reuses_connections(self):
+        pool = self.make_pool()
+        first = pool.checkout()
+        pool.checkin(first)
+        second = pool.checkout()
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.connected), 1)
+        self.assertEqual(pool.stats().checkouts, 2)
+
+    def test_warms_min_size(self):
+        pool = self.make_pool(min_size=2)
+        pool.checkout()
+
+        stats = pool.stats()
+        self.assertEqual(stats.size, 2)
+        self.assertEqual(stats.in_use, 1)
+        self.assertEqual(stats.idle, 1)
+
+    def test_times_out_at_max_size(self):
+        pool = self.make_pool(max_size=1)
+        pool.checkout()
+
+        with self.assertRaises(PoolTimeout):
+            pool.checkout()
+        self.assertEqual(pool.stats().timeouts, 1)
+
+    def test_waiter_gets_returned_connection(self):
+        pool = self.make_pool(max_size=1, timeout=2)
+        connection = pool.checkout()
+        result = {}
+
+        def wait():
+            result["connection"] = pool.checkout()
+
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        while pool.stats().waiters == 0:
+            time.sleep(0.001)
+        pool.checkin(connection)
+        waiter.join()
+
+        self.assertIs(result["connection"], connection)
+        self.assertEqual(len(self.connected), 1)
+
+    def test_pre_ping_replaces_dead_connection(self):
+        pool = self.make_pool()
+        connection = pool.checkout()
+        pool.checkin(connection)
+        connection.alive = False
+
+        replacement = pool.checkout()
+
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats().size, 1)
+
+    def test_idle_timeout_keeps_min_size(self):
+        pool = self.make_pool(min_size=1, idle_timeout=0)
+        first, second = pool.checkout(), pool.checkout()
+        pool.checkin(first)
+        pool.checkin(second)
+
+        pool.checkout()
+
+        self.assertEqual(pool.stats().size, 1)
+        self.assertEqual(sum(c.closed for c in self.connected), 1)
+
+    def test_max_lifetime_replaces_connection(self):
+        pool = self.make_pool(max_lifetime=0)
+        connection = pool.checkout()
+        pool.checkin(connection)
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats().size, 0)
+
+    def test_discard_releases_slot(self):
+        pool = self.make_pool(max_size=1)
+        connection = pool.checkout()
+        pool.checkin(connection, discard=True)
+
+        self.assertIsNot(pool.checkout(), connection)
+        self.assertEqual(pool.stats().discarded, 1)
+
+
+class TestPooledMySQLConnection(TestCase):
+    """
+    Testcases for the `PooledMySQLConnection` driver, as resolved by the ORM
+    """
+
+    def test_queries_after_the_first_check_out_from_the_pool(self):
+        pool = mock.Mock()
+        pool.checkout.side_effect = FakeMySQLConnection
+
+        with mock.patch.object(PooledMySQLConnection, "pool", return_value=pool):
+            for _ in range(3):
+                # ? Resolved per query, each connection registers the stock drivers
+                driver = ConnectionFactory().make("mysql")
+                connection = driver(
+                    host="localhost",
+                    database="test",
+                    user="test",
+                    password="test",
+                    port=3306,
+                    full_details={"pool_enabled": True},
+                    name="mysql",
+                ).make_connection()
+                self.assertEqual(connection.query("SELECT 1"), [{"value": 1}])
+
+        self.assertIs(DB.connection_factory.make("mysql"), PooledMySQLConnection)
+        self.assertEqual(pool.checkout.call_count, 3)
+        self.assertEqual(pool.checkin.call_count, 3)
@@ -0,0 +1,53 @@
+"""
+File contains tests for the per request query `Profiler`
+"""
+from unittest import TestCase, mock
+
+from fastapi.testclient import TestClient
+
+from api.profiler import Profile, Profiler
+from config import Config
+from src.main import app
+
+
+class TestProfiler(TestCase):
+    """
+    Testcases for the query profiler & its `Server-Timing` header
+    """
+
+    def setUp(self):
+        self.app = TestClient(app)
+        self.auth = (Config.Auth.username, Config.Auth.password)
+
+    def test_server_timing_only_when_enabled(self):
+        response = self.app.get("/api/users/", auth=self.auth)
+        self.assertNotIn("server-timing", response.headers)
+
+        with mock.patch.object(Config.Profiler, "enabled", True):
+            response = self.app.get("/api/users/", auth=self.auth)
+        self.assertEqual(response.status_code, 200)
+        timing = response.headers["server-timing"]
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="[1-9]\d* queries", app;dur=')
+
+    def test_repeated_statements_are_flagged(self):
+        profile = Profile()
+        with mock.patch.object(Config.Profiler, "repeated_queries", 3):
+            for _ in range(3):
+                profile.record("sqlite", "SELECT * FROM users WHERE id = ?", (1,), 0)
+            profile.record("sqlite", "SELECT * FROM preferences", (), 0)
+
+            self.assertEqual(
+                profile.repeated(), [("SELECT * FROM users WHERE id = ?", 3)]
+            )
+
+    def test_slow_statements_are_explained(self):
+        patched = mock.patch.multiple(Config.Profiler, enabled=True, slow_query_ms=0)
+        with patched, self.assertLogs("api.profiler", "WARNING") as logs:
+            self.app.get("/api/users/", auth=self.auth)
+
+        captured = Profiler.captured[-1]
+        self.assertEqual(captured["endpoint"], "GET /api/users/")
+        self.assertTrue(captured["query"].startswith("SELECT"))
+        if Config.Database.databases[captured["connection"]]["driver"] == "sqlite":
+            self.assertTrue(captured["plan"])
+        self.assertIn("Slow query in GET /api/users/", logs.output[-1])
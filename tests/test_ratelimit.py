@@ -0,0 +1,107 @@
+"""
+File contains tests for the per-client `RateLimit`
+"""
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from unittest import TestCase, mock
+
+from fastapi.testclient import TestClient
+
+from api.ratelimit import MemoryBuckets, RateLimit, SqliteBuckets
+from config import Config
+from src.main import app
+
+
+class BucketTests(ABC):
+    """
+    Testcases shared by every bucket backend
+    """
+
+    @abstractmethod
+    def make_backend(self):
+        """Returns an empty backend, closed when the test ends"""
+
+    def test_burst_is_allowed_then_rejected(self):
+        backend = self.make_backend()
+        with mock.patch("time.time", return_value=1000.0):
+            results = [backend.take("a", 1, 3)[0] for _ in range(4)]
+            self.assertEqual(results, [True, True, True, False])
+            self.assertTrue(backend.take("b", 1, 3)[0])
+
+    def test_tokens_refill_at_rate(self):
+        backend = self.make_backend()
+        with mock.patch("time.time", return_value=1000.0):
+            backend.take("a", 2, 1)
+            self.assertFalse(backend.take("a", 2, 1)[0])
+        with mock.patch("time.time", return_value=1000.5):
+            self.assertEqual(backend.take("a", 2, 1), (True, 0))
+
+
+class TestMemoryBuckets(BucketTests, TestCase):
+    """
+    Testcases for the in-process `MemoryBuckets`
+    """
+
+    def make_backend(self):
+        return MemoryBuckets(max_clients=100)
+
+
+class TestSqliteBuckets(BucketTests, TestCase):
+    """
+    Testcases for the shared `SqliteBuckets`
+    """
+
+    def make_backend(self):
+        directory = tempfile.mkdtemp()
+        backend = SqliteBuckets(os.path.join(directory, "ratelimit.sqlite3"))
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_buckets_are_shared_between_instances(self):
+        first = self.make_backend()
+        second = SqliteBuckets(first.path)
+        self.addCleanup(second.close)
+
+        self.assertTrue(first.take("a", 0.001, 1)[0])
+        self.assertFalse(second.take("a", 0.001, 1)[0])
+
+
+class TestRateLimit(TestCase):
+    """
+    Testcases for the `RateLimit` router dependency
+    """
+
+    def setUp(self):
+        RateLimit.close()
+        self.addCleanup(RateLimit.close)
+        self.app = TestClient(app)
+        self.auth = (Config.Auth.username, Config.Auth.password)
+
+    def test_client_is_rejected_with_retry_after(self):
+        with mock.patch.object(Config.RateLimit, "users_burst", 2), mock.patch.object(
+            Config.RateLimit, "users_rate", 0.5
+        ):
+            responses = [self.app.get("/api/users/", auth=self.auth) for _ in range(3)]
+
+        self.assertEqual([r.status_code for r in responses], [200, 200, 429])
+        self.assertEqual(responses[0].headers["ratelimit-limit"], "2")
+        self.assertEqual(responses[1].headers["ratelimit-remaining"], "0")
+        self.assertEqual(responses[2].headers["retry-after"], "2")
+
+        # ? Routers have separate buckets
+        response = self.app.get("/api/preferences/", auth=self.auth)
+        self.assertEqual(response.status_code, 200)
+
+    def test_failed_authentication_is_limited_by_address(self):
+        wrong = (Config.Auth.username, "wrong")
+        with mock.patch.object(Config.RateLimit, "users_burst", 2), mock.patch.object(
+            Config.RateLimit, "users_rate", 0.5
+        ):
+            responses = [self.app.get("/api/users/", auth=wrong) for _ in range(3)]
+            # ? The bucket of the address is not the one of the username
+            response = self.app.get("/api/users/", auth=self.auth)
+
+        self.assertEqual([r.status_code for r in responses], [401, 401, 429])
+        self.assertEqual(response.status_code, 200)
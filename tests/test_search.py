@@ -0,0 +1,210 @@
+"""
+File contains tests for the type-ahead `UsersSearch`
+"""
+from datetime import datetime
+from unittest import TestCase, mock
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from masoniteorm.exceptions import QueryException
+from masoniteorm.query import QueryBuilder
+
+from api.changes import Changes
+from api.jobs import Jobs
+from api.search import UsersIndex, UsersSearch
+from config import Config
+from config.databases import DB
+from databases.models import UsersModel
+from src.main import app
+
+
+class TestUsersIndex(TestCase):
+    """
+    Testcases for the in-process `UsersIndex`
+    """
+
+    def setUp(self):
+        self.index = UsersIndex()
+        self.index.load(
+            [
+                ("1", "Ann Lee", "lee@example.com"),
+                ("2", "Anna Smith", "anna@example.com"),
+                ("3", "Bob Annett", "bob@example.com"),
+                ("4", "Ann", "ann@example.com"),
+            ]
+        )
+
+    def test_whole_prefixes_rank_before_words(self):
+        # ? "ann" is the name of 4 and its email, it comes before "ann lee"
+        self.assertEqual(self.index.search("ANN", 10), ["4", "1", "2", "3"])
+        self.assertEqual(self.index.search("ann", 2), ["4", "1"])
+        self.assertEqual(self.index.search("lee", 10), ["1"])
+        self.assertEqual(self.index.search("  ann   le ", 10), ["1"])
+        self.assertEqual(self.index.search("", 10), [])
+
+    def test_updates_replace_the_previous_entries(self):
+        self.index.add("3", "Carl", "carl@example.com")
+        self.index.remove("4")
+
+        self.assertEqual(self.index.search("ann", 10), ["1", "2"])
+        self.assertEqual(self.index.search("bob", 10), [])
+        self.assertEqual(self.index.search("car", 10), ["3"])
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(len(self.index.primary), 6)
+
+
+class TestUsersSearch(TestCase):
+    """
+    Testcases for the '/api/users/search' endpoint
+    """
+
+    def setUp(self):
+        self.app = TestClient(app)
+        self.auth = (Config.Auth.username, Config.Auth.password)
+        self.prefix = uuid4().hex[:12]
+
+    def tearDown(self):
+        UsersSearch.close()
+
+    def search(self, query: str) -> list:
+        response = self.app.get(
+            "/api/users/search", params={"q": query}, auth=self.auth
+        )
+        self.assertEqual(response.status_code, 200)
+        return [user["name"] for user in response.json()["data"]]
+
+    def create_user(self, name: str) -> dict:
+        response = self.app.post(
+            "/api/users/",
+            json={
+                "name": name,
+                "age": 30,
+                "email": f"{uuid4().hex}@example.com",
+                "password": "password",
+                "salt": "salt",
+            },
+            auth=self.auth,
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def test_search_follows_the_observer_events(self):
+        first = self.create_user(f"{self.prefix} Lee")
+        # ? Built on first use, then kept current by the `UsersObserver`
+        self.assertEqual(self.search(self.prefix), [f"{self.prefix} Lee"])
+
+        second = self.create_user(f"Zed {self.prefix}")
+        self.create_user(f"{self.prefix}x")
+        self.assertEqual(
+            self.search(self.prefix.upper()),
+            [f"{self.prefix} Lee", f"{self.prefix}x", f"Zed {self.prefix}"],
+        )
+
+        renamed = self.prefix[::-1]
+        UsersModel.find(first["uuid"]).update({"name": renamed})
+        self.app.delete(f"/api/users/{second['uuid']}", auth=self.auth)
+        self.assertEqual(self.search(self.prefix), [f"{self.prefix}x"])
+        self.assertEqual(self.search(renamed), [renamed])
+
+    def test_rolled_back_writes_are_not_indexed(self):
+        UsersSearch.index()
+        failed = mock.patch.object(
+            Jobs, "enqueue", side_effect=QueryException("failed")
+        )
+        with failed:
+            response = self.app.post(
+                "/api/users/",
+                json={"name": f"{self.prefix} Lost", "password": "password"},
+                auth=self.auth,
+            )
+        self.assertEqual(response.status_code, 409)
+        # ? The endpoint skips missing users, the index itself is read
+        self.assertEqual(UsersSearch.search(self.prefix, 10), [])
+
+        user = self.create_user(f"{self.prefix} Lee")
+        failed = mock.patch.object(
+            Changes, "record", side_effect=QueryException("failed")
+        )
+        with failed:
+            response = self.app.patch(
+                f"/api/users/{user['uuid']}",
+                json={"name": f"{self.prefix}renamed"},
+                auth=self.auth,
+            )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(UsersSearch.search(f"{self.prefix}r", 10), [])
+        self.assertEqual(UsersSearch.search(self.prefix, 10), [user["uuid"]])
+
+    def test_bulk_created_users_are_searchable(self):
+        UsersSearch.index()
+        users = [
+            {
+                "uuid": str(uuid4()),
+                "name": f"{self.prefix} {number}",
+                "age": 30,
+                "email": f"{uuid4().hex}@example.com",
+                "password": "password",
+                "salt": "salt",
+            }
+            for number in range(3)
+        ]
+        response = self.app.post("/api/users/bulk", json=users, auth=self.auth)
+        self.assertEqual(response.status_code, 207)
+
+        self.assertEqual(len(self.search(self.prefix)), 3)
+
+    def test_sync_applies_rows_written_by_other_workers(self):
+        user = self.create_user(f"{self.prefix} Lee")
+        UsersSearch.index()
+        now = UsersModel().get_new_date().to_datetime_string()
+        # ? Written around the observers, like another process would
+        DB.get_query_builder().table("users").where("uuid", user["uuid"]).update(
+            {"name": f"{self.prefix}moved", "updated_at": now}
+        )
+        self.assertEqual(self.search(f"{self.prefix}m"), [])
+
+        UsersSearch.sync()
+        self.assertEqual(self.search(f"{self.prefix}m"), [f"{self.prefix}moved"])
+
+        DB.get_query_builder().table("users").where("uuid", user["uuid"]).update(
+            {"deleted_at": now}
+        )
+        UsersSearch.sync()
+        self.assertEqual(self.search(self.prefix), [])
+
+    def test_sync_compares_datetime_timestamps(self):
+        get, first = QueryBuilder.get, QueryBuilder.first
+
+        def as_datetimes(row):
+            # ? Like MySQL, which returns the timestamps as datetime objects
+            return {
+                key: datetime.fromisoformat(value)
+                if key.endswith("_at") and isinstance(value, str)
+                else value
+                for key, value in row.items()
+            }
+
+        def mysql_get(builder, *args, **kwargs):
+            return [as_datetimes(row) for row in get(builder, *args, **kwargs)]
+
+        def mysql_first(builder, *args, **kwargs):
+            row = first(builder, *args, **kwargs)
+            return as_datetimes(row) if row else row
+
+        kept = self.create_user(f"{self.prefix} Lee")
+        removed = self.create_user(f"{self.prefix} Zed")
+        with mock.patch.object(QueryBuilder, "get", mysql_get), mock.patch.object(
+            QueryBuilder, "first", mysql_first
+        ):
+            UsersSearch.index()
+            # ? As if no user was deleted when the index was built
+            UsersSearch._watermarks["deleted_at"] = None
+            now = UsersModel().get_new_date().to_datetime_string()
+            DB.get_query_builder().table("users").where("uuid", removed["uuid"]).update(
+                {"deleted_at": now}
+            )
+            UsersSearch.sync()
+            UsersSearch.sync()
+
+        self.assertEqual(self.search(self.prefix), [kept["name"]])
+        self.assertIsInstance(UsersSearch._watermarks["deleted_at"], datetime)
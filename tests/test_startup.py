@@ -0,0 +1,65 @@
+"""
+File contains tests for the cold start of the application, by import time
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+from unittest import TestCase
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+class TestStartup(TestCase):
+    """
+    Testcases for the modules loaded when a worker starts, measured with
+    `python -X importtime` in a new interpreter
+    """
+
+    # ? Seconds allowed to `import main`, about twice its time on a laptop
+    budget = 3.0
+
+    def importtime(self, statement: str) -> Dict[str, int]:
+        """Runs `statement`, returns the cumulative microseconds of each module"""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            cwd=SRC,
+            env={
+                **os.environ,
+                "PYTHONPATH": os.pathsep.join(
+                    filter(None, [str(SRC), os.environ.get("PYTHONPATH")])
+                ),
+            },
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+        return times
+
+    def test_application_imports_within_budget(self):
+        times = self.importtime("import main")
+
+        self.assertLess(times["main"] / 1_000_000, self.budget)
+        # ? Loaded by the first page served
+        self.assertNotIn("jinja2", times)
+
+    def test_config_is_parsed_without_the_orm(self):
+        times = self.importtime("from config import Config; Config.Database")
+
+        self.assertNotIn("masoniteorm", times)
+        self.assertNotIn("databases.connections", times)
+
+    def test_schemas_do_not_load_faker(self):
+        times = self.importtime("import api.schema")
+
+        self.assertNotIn("faker", times)
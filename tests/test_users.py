@@ -1,10 +1,23 @@
 """
 File contains tests for 'users' features
 """
-from unittest import TestCase
+import csv
+import io
+import json
+from itertools import combinations
+from unittest import TestCase, mock
+from uuid import uuid4
 
 from fastapi.testclient import TestClient
+from masoniteorm.connections.BaseConnection import BaseConnection
+from masoniteorm.exceptions import QueryException
 
+from api.cache import Cache, Totals
+from api.hashing import Hasher
+from api.profiler import Profiler
+from config import Config
+from config.databases import DB
+from databases.models import PreferencesModel, UsersModel
 from src.main import app
 
 
@@ -23,3 +36,665 @@ class TestUsers(TestCase):
         self.app = TestClient(app)
 
         # TestCase Global Variables
+        self.auth = (Config.Auth.username, Config.Auth.password)
+
+    def create_user(self, **fields) -> dict:
+        """Creates a user through the API and returns its body"""
+        body = {
+            "name": "Test User",
+            "age": 30,
+            "email": f"{uuid4().hex}@example.com",
+            "password": "password",
+            "salt": "salt",
+        }
+        body.update(fields)
+        response = self.app.post("/api/users/", json=body, auth=self.auth)
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def count_queries(self):
+        """Patches the ORM connections to record every executed statement"""
+        return mock.patch.object(
+            BaseConnection,
+            "statement",
+            autospec=True,
+            side_effect=BaseConnection.statement,
+        )
+
+    def test_create_issues_one_insert_per_table(self):
+        with self.count_queries() as statement:
+            user = self.create_user()
+
+        queries = [call.args[1] for call in statement.call_args_list]
+        self.assertEqual(len(queries), 5, queries)
+        self.assertTrue(all(query.startswith("INSERT") for query in queries))
+        self.assertIn("users", queries[0])
+        self.assertIn("preferences", queries[2])
+        # ? Each insert is logged for the change streams
+        self.assertIn("changes", queries[1])
+        self.assertIn("changes", queries[3])
+        # ? The follow-up work is queued for the jobs worker
+        self.assertIn("jobs", queries[4])
+        self.assertIsNotNone(user["created_at"])
+
+    def test_create_is_atomic(self):
+        uuid = str(uuid4())
+        with mock.patch.object(
+            PreferencesModel, "create", side_effect=QueryException("failed")
+        ):
+            response = self.app.post(
+                "/api/users/",
+                json={"uuid": uuid, "password": "password", "salt": "salt"},
+                auth=self.auth,
+            )
+
+        self.assertEqual(response.status_code, 409)
+        retrieved = self.app.get(f"/api/users/{uuid}", auth=self.auth)
+        self.assertEqual(retrieved.status_code, 404)
+
+    def test_cursor_pagination_visits_each_user_once(self):
+        created = {self.create_user()["uuid"] for _ in range(5)}
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = self.app.get("/api/users/", params=params, auth=self.auth)
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            seen.extend(user["uuid"] for user in page["data"])
+            cursor = page["meta"]["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertTrue(created.issubset(seen))
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.app.get(
+            "/api/users/", params={"cursor": "not-a-cursor"}, auth=self.auth
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_include_preferences_loads_one_query_per_page(self):
+        for _ in range(3):
+            self.create_user()
+
+        with self.count_queries() as statement:
+            response = self.app.get(
+                "/api/users/",
+                params={"limit": 3, "include": "preferences"},
+                auth=self.auth,
+            )
+
+        self.assertEqual(response.status_code, 200)
+        queries = [call.args[1] for call in statement.call_args_list]
+        self.assertEqual(len(queries), 2, queries)
+        for user in response.json()["data"]:
+            self.assertEqual(user["preferences"]["user_id"], user["uuid"])
+
+        plain = self.app.get("/api/users/", params={"limit": 3}, auth=self.auth)
+        self.assertNotIn("preferences", plain.json()["data"][0])
+        self.assertNotEqual(plain.headers["etag"], response.headers["etag"])
+
+    def test_nested_preferences_use_a_single_join(self):
+        user = self.create_user()
+        url = f"/api/users/{user['uuid']}/preferences"
+
+        with self.count_queries() as statement:
+            response = self.app.get(url, auth=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user_id"], user["uuid"])
+        self.assertEqual(statement.call_count, 1)
+        self.assertIn("JOIN", statement.call_args.args[1])
+
+        included = self.app.get(
+            f"/api/users/{user['uuid']}",
+            params={"include": "preferences"},
+            auth=self.auth,
+        ).json()
+        self.assertEqual(included["preferences"], response.json())
+
+        self.app.delete(f"/api/users/{user['uuid']}", auth=self.auth)
+        self.assertEqual(self.app.get(url, auth=self.auth).status_code, 404)
+
+    def test_fields_narrow_the_select_and_the_response(self):
+        self.create_user()
+
+        with self.count_queries() as statement:
+            response = self.app.get(
+                "/api/users/",
+                params={"limit": 2, "fields": "email,uuid,name"},
+                auth=self.auth,
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()["data"][0]), ["uuid", "name", "email"])
+        query = statement.call_args.args[1]
+        self.assertNotIn("password", query)
+        self.assertNotIn("*", query)
+
+        cached = self.app.get(
+            "/api/users/",
+            params={"limit": 2, "fields": "email,uuid,name"},
+            headers={"If-None-Match": response.headers["etag"]},
+            auth=self.auth,
+        )
+        self.assertEqual(cached.status_code, 304)
+
+    def test_unknown_fields_are_rejected(self):
+        for fields in ("name,nickname", "password", ","):
+            with self.count_queries() as statement:
+                response = self.app.get(
+                    "/api/users/", params={"fields": fields}, auth=self.auth
+                )
+            self.assertEqual(response.status_code, 422, fields)
+            statement.assert_not_called()
+
+    def test_filters_and_sort_with_cursor(self):
+        prefix = uuid4().hex[:8]
+        for age in (31, 45, 27, 60):
+            self.create_user(name=f"{prefix} {age}", age=age)
+        self.create_user(name=f"x{prefix}", age=40)
+
+        params = {"name": prefix, "min_age": 28, "max_age": 59, "sort": "-age"}
+        seen, cursors = [], []
+        while True:
+            cursor = {"cursor": cursors[-1]} if cursors else {}
+            page = self.app.get(
+                "/api/users/", params={**params, "limit": 1, **cursor}, auth=self.auth
+            ).json()
+            seen.extend(user["age"] for user in page["data"])
+            if not page["meta"]["next_cursor"]:
+                break
+            cursors.append(page["meta"]["next_cursor"])
+        self.assertEqual(seen, [45, 31])
+
+        # ? A cursor only continues the sort it was issued for
+        mismatched = self.app.get(
+            "/api/users/", params={"sort": "name", "cursor": cursors[0]}, auth=self.auth
+        )
+        self.assertEqual(mismatched.status_code, 400)
+
+    @staticmethod
+    def table_scans(driver: str, plan: list) -> list:
+        """Returns the steps of an `EXPLAIN` reading `users` without an index"""
+        if driver == "mysql":
+            return [
+                row
+                for row in plan
+                if row.get("table") == "users" and row.get("type") == "ALL"
+            ]
+        if driver == "postgres":
+            return [
+                row for row in plan if "Seq Scan on users" in row.get("QUERY PLAN", "")
+            ]
+        return [
+            row
+            for row in plan
+            if row["detail"].startswith(("SCAN users", "SEARCH users"))
+            and "INDEX" not in row["detail"]
+        ]
+
+    def test_every_filter_combination_uses_an_index(self):
+        connection = Config.Database.databases["default"]
+        driver = Config.Database.databases[connection]["driver"]
+
+        filters = [
+            {"email": "a@example.com"},
+            {"name": "Ad"},
+            {"gender": "Male"},
+            {"min_age": 20, "max_age": 40},
+            {"created_after": "2020-01-01T00:00", "created_before": "2030-01-01"},
+            {"updated_after": "2020-01-01T00:00", "updated_before": "2030-01-01"},
+        ]
+        cases = [
+            {key: value for group in combination for key, value in group.items()}
+            for size in range(len(filters) + 1)
+            for combination in combinations(filters, size)
+        ]
+        for column in ("created_at", "updated_at", "name", "email", "age"):
+            cases += [{"sort": column}, {"sort": f"-{column}"}]
+
+        patched = mock.patch.multiple(Config.Profiler, enabled=True, slow_query_ms=0)
+        unlimited = mock.patch.object(Config.RateLimit, "enabled", False)
+        with patched, unlimited, self.assertLogs("api.profiler", "WARNING"):
+            for url in ("/api/users/", "/api/users/deleted"):
+                for params in cases:
+                    response = self.app.get(url, params=params, auth=self.auth)
+                    self.assertEqual(response.status_code, 200, params)
+                    plan = Profiler.captured[-1]["plan"]
+                    self.assertTrue(plan, (url, params))
+                    scans = self.table_scans(driver, plan)
+                    self.assertFalse(scans, (url, params, plan))
+
+    def test_table_scans_are_read_from_every_driver(self):
+        plans = {
+            "sqlite": [
+                {"detail": "SEARCH users USING INDEX users_email_index (email=?)"},
+                {"detail": "SCAN users"},
+            ],
+            "mysql": [
+                {"table": "users", "type": "range", "key": "users_email_index"},
+                {"table": "users", "type": "ALL", "key": None},
+            ],
+            "postgres": [
+                {"QUERY PLAN": "Index Scan using users_email_index on users"},
+                {"QUERY PLAN": "Seq Scan on users"},
+            ],
+        }
+        for driver, plan in plans.items():
+            self.assertEqual(self.table_scans(driver, plan), plan[1:], driver)
+
+    def test_totals_are_counted_once_then_kept_by_the_observers(self):
+        Totals.clear()
+        prefix = uuid4().hex
+        total = self.app.head("/api/users/", auth=self.auth).headers["x-total-count"]
+        deleted = self.app.head("/api/users/deleted", auth=self.auth).headers[
+            "x-total-count"
+        ]
+        self.assertEqual(int(total), UsersModel.count())
+
+        with self.count_queries() as statement:
+            user = self.create_user(name=prefix)
+            self.create_user(name=f"{prefix} 2")
+            self.app.delete(f"/api/users/{user['uuid']}", auth=self.auth)
+            listed = self.app.get(
+                "/api/users/", params={"with_total": True, "limit": 1}, auth=self.auth
+            )
+            head = self.app.head("/api/users/deleted", auth=self.auth)
+
+        queries = [call.args[1] for call in statement.call_args_list]
+        self.assertFalse([query for query in queries if "COUNT" in query], queries)
+        self.assertEqual(listed.json()["meta"]["total"], int(total) + 1)
+        self.assertEqual(int(head.headers["x-total-count"]), int(deleted) + 1)
+
+        # ? Filtered totals are counted, only their index range is read
+        filtered = self.app.get(
+            "/api/users/", params={"name": prefix, "with_total": True}, auth=self.auth
+        )
+        self.assertEqual(filtered.json()["meta"]["total"], 1)
+        self.assertIsNone(
+            self.app.get("/api/users/", auth=self.auth).json()["meta"]["total"]
+        )
+
+    def test_replace_updates_in_place(self):
+        user = self.create_user(password="first", salt="salt")
+        url = f"/api/users/{user['uuid']}"
+        rows = UsersModel.with_trashed().count(), PreferencesModel.count()
+
+        for age in (41, 42, 43):
+            with self.count_queries() as statement:
+                response = self.app.put(
+                    url, json={"name": "Replaced", "age": age}, auth=self.auth
+                )
+            self.assertEqual(response.status_code, 200)
+            queries = [call.args[1] for call in statement.call_args_list]
+            self.assertEqual(len(queries), 3, queries)
+            self.assertTrue(queries[0].startswith("UPDATE"))
+            self.assertTrue(queries[1].startswith("SELECT"))
+            self.assertIn("changes", queries[2])
+
+        replaced = response.json()
+        self.assertEqual((replaced["uuid"], replaced["age"]), (user["uuid"], 43))
+        self.assertEqual(replaced["created_at"], user["created_at"])
+        counts = UsersModel.with_trashed().count(), PreferencesModel.count()
+        self.assertEqual(counts, rows)
+
+        # ? Secrets are kept unless given, then hashed like on create
+        def verify(password: str) -> int:
+            return self.app.post(
+                f"{url}/verify", json={"password": password}, auth=self.auth
+            ).status_code
+
+        self.assertEqual(verify("first"), 204)
+        self.app.put(url, json={"name": "Replaced", "password": "2nd"}, auth=self.auth)
+        self.assertEqual((verify("first"), verify("2nd")), (403, 204))
+
+        patched = self.app.patch(url, json={"age": 50}, auth=self.auth).json()
+        self.assertEqual((patched["name"], patched["age"]), ("Replaced", 50))
+        missing = self.app.put(f"/api/users/{uuid4()}", json={}, auth=self.auth)
+        self.assertEqual(missing.status_code, 404)
+
+    def test_created_entities_carry_their_etag(self):
+        body = {"email": f"{uuid4().hex}@example.com", "password": "password"}
+        created = self.app.post("/api/users/", json=body, auth=self.auth)
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(created.json()["version"], 1)
+        url = f"/api/users/{created.json()['uuid']}"
+        self.assertEqual(
+            created.headers["etag"], self.app.get(url, auth=self.auth).headers["etag"]
+        )
+
+        preferences = self.app.post(
+            "/api/preferences/",
+            json={"user_id": created.json()["uuid"]},
+            auth=self.auth,
+        )
+        self.assertEqual(preferences.status_code, 201)
+        self.assertEqual(preferences.json()["version"], 1)
+        self.assertEqual(preferences.headers["etag"], '"1"')
+
+    def test_writes_with_if_match_are_conditional(self):
+        user = self.create_user()
+        url = f"/api/users/{user['uuid']}"
+        etag = self.app.get(url, auth=self.auth).headers["etag"]
+        self.assertEqual(etag, '"1"')
+
+        # ? The client holds the version, nothing is read before the UPDATE
+        with self.count_queries() as statement:
+            response = self.app.patch(
+                url, json={"age": 40}, headers={"If-Match": etag}, auth=self.auth
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(statement.call_args_list[0].args[1].startswith("UPDATE"))
+        self.assertEqual(response.json()["version"], 2)
+        self.assertEqual(response.headers["etag"], '"2"')
+        self.assertEqual(self.app.get(url, auth=self.auth).headers["etag"], '"2"')
+
+        # ? The second writer of the same version loses, nothing is overwritten
+        stale = self.app.put(
+            url, json={"name": "Stale"}, headers={"If-Match": etag}, auth=self.auth
+        )
+        self.assertEqual(stale.status_code, 412)
+        self.assertEqual(self.app.get(url, auth=self.auth).json()["age"], 40)
+
+        for if_match in ('W/"2"', '"1", "2"', "*"):
+            response = self.app.patch(
+                url, json={"age": 41}, headers={"If-Match": if_match}, auth=self.auth
+            )
+            self.assertEqual(response.status_code, 412 if "W/" in if_match else 200)
+        self.assertEqual(response.headers["etag"], '"4"')
+
+        missing = self.app.patch(
+            f"/api/users/{uuid4()}", json={}, headers={"If-Match": "*"}, auth=self.auth
+        )
+        self.assertEqual(missing.status_code, 412)
+
+        preferences = self.app.get(f"{url}/preferences", auth=self.auth)
+        response = self.app.patch(
+            f"/api/preferences/{preferences.json()['uuid']}",
+            json={"toggle_email": False},
+            headers={"If-Match": preferences.headers["etag"]},
+            auth=self.auth,
+        )
+        self.assertEqual((response.status_code, response.json()["version"]), (200, 2))
+
+    def test_replace_preferences_updates_in_place(self):
+        user = self.create_user()
+        preferences = self.app.get(
+            f"/api/users/{user['uuid']}/preferences", auth=self.auth
+        ).json()
+        url = f"/api/preferences/{preferences['uuid']}"
+        rows = PreferencesModel.count()
+
+        for toggle in (False, True, False):
+            with self.count_queries() as statement:
+                response = self.app.put(
+                    url, json={"toggle_email": toggle}, auth=self.auth
+                )
+            self.assertEqual(response.status_code, 200)
+            # ? UPDATE, SELECT & the INSERT into the change log
+            self.assertEqual(statement.call_count, 3)
+
+        replaced = response.json()
+        self.assertEqual(replaced["uuid"], preferences["uuid"])
+        self.assertEqual(replaced["user_id"], user["uuid"])
+        self.assertFalse(replaced["toggle_email"])
+        self.assertEqual(PreferencesModel.count(), rows)
+
+        patched = self.app.patch(
+            url, json={"toggle_dark_mode": False}, auth=self.auth
+        ).json()
+        self.assertEqual(patched["uuid"], preferences["uuid"])
+        self.assertFalse(patched["toggle_email"])
+
+    def test_bulk_create_reports_conflicts_per_item(self):
+        existing = self.create_user()
+        duplicate = str(uuid4())
+        items = [
+            {**existing, "password": "password", "salt": "salt"},
+            {"uuid": duplicate, "email": "first@example.com", "password": "p", "salt": "s"},
+            {"uuid": duplicate, "email": "second@example.com", "password": "p", "salt": "s"},
+        ]
+
+        response = self.app.post("/api/users/bulk", json=items, auth=self.auth)
+        self.assertEqual(response.status_code, 207)
+
+        body = response.json()
+        self.assertEqual([item["status"] for item in body["data"]], [409, 201, 409])
+        self.assertEqual((body["created"], body["conflicts"]), (1, 2))
+
+        created = self.app.get(f"/api/users/{duplicate}", auth=self.auth)
+        self.assertEqual(created.json()["email"], "first@example.com")
+
+    def test_bulk_create_reports_concurrent_inserts_per_item(self):
+        raced, kept = str(uuid4()), str(uuid4())
+        items = [
+            {"uuid": uuid, "email": f"{uuid}@example.com", "password": "p", "salt": "s"}
+            for uuid in (raced, kept)
+        ]
+        hash_many = Hasher.hash_many
+
+        def race(*args, **kwargs):
+            # ? Another request creates the user after the existence check
+            now = UsersModel().get_new_date().to_datetime_string()
+            builder = DB.get_query_builder()
+            builder.table("users").create(
+                {
+                    "uuid": raced,
+                    "name": "Raced",
+                    "gender": "Male",
+                    "age": 30,
+                    "email": f"{raced}@example.com",
+                    "password": "password",
+                    "salt": "salt",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            builder.new().table("preferences").create(
+                {
+                    "uuid": str(uuid4()),
+                    "user_id": raced,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            return hash_many(*args, **kwargs)
+
+        with mock.patch.object(Hasher, "hash_many", side_effect=race):
+            response = self.app.post("/api/users/bulk", json=items, auth=self.auth)
+
+        self.assertEqual(response.status_code, 207)
+        body = response.json()
+        self.assertEqual([item["status"] for item in body["data"]], [409, 201])
+        self.assertEqual((body["created"], body["conflicts"]), (1, 1))
+        created = self.app.get(f"/api/users/{kept}", auth=self.auth)
+        self.assertEqual(created.status_code, 200)
+
+    def test_import_reports_failed_lines(self):
+        existing = self.create_user()
+        created = str(uuid4())
+        lines = [
+            json.dumps({"uuid": created, "email": "import@example.com", "password": "p", "salt": "s"}),
+            "",
+            json.dumps({"uuid": str(uuid4()), "email": "not an email", "password": "p", "salt": "s"}),
+            json.dumps({**existing, "password": "password", "salt": "salt"}),
+            "{broken",
+        ]
+
+        response = self.app.post(
+            "/api/users/import", content="\n".join(lines), auth=self.auth
+        )
+        self.assertEqual(response.status_code, 200)
+
+        body = response.json()
+        self.assertEqual((body["lines"], body["created"], body["failed"]), (4, 1, 3))
+        self.assertEqual([error["line"] for error in body["errors"]], [3, 4, 5])
+        self.assertEqual([error["status"] for error in body["errors"]], [422, 409, 422])
+
+        response = self.app.get(f"/api/users/{created}", auth=self.auth)
+        self.assertEqual(response.json()["email"], "import@example.com")
+
+        response = self.app.post(
+            "/api/users/import",
+            content=lines[0],
+            headers={"accept": "application/x-ndjson"},
+            auth=self.auth,
+        )
+        events = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([event["event"] for event in events], ["error", "progress", "summary"])
+        self.assertEqual(events[-1]["failed"], 1)
+
+    def test_verify_rehashes_outdated_passwords(self):
+        with mock.patch.object(Config.Hashing, "algorithm", "sha512"):
+            user = self.create_user()
+        url = f"/api/users/{user['uuid']}/verify"
+
+        wrong = self.app.post(url, json={"password": "wrong"}, auth=self.auth)
+        self.assertEqual(wrong.status_code, 403)
+
+        response = self.app.post(url, json={"password": "password"}, auth=self.auth)
+        self.assertEqual(response.status_code, 204)
+
+        stored = UsersModel.select("password").find(user["uuid"]).password
+        self.assertTrue(stored.startswith(f"${Config.Hashing.algorithm}$"))
+
+        response = self.app.post(url, json={"password": "password"}, auth=self.auth)
+        self.assertEqual(response.status_code, 204)
+
+    def test_verify_rejects_users_without_secrets(self):
+        user = self.create_user()
+        DB.get_query_builder().table("users").where("uuid", user["uuid"]).update(
+            {"password": None, "salt": None}
+        )
+
+        response = self.app.post(
+            f"/api/users/{user['uuid']}/verify",
+            json={"password": "password"},
+            auth=self.auth,
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_retrieve_is_cached_until_the_user_changes(self):
+        user = self.create_user()
+        url = f"/api/users/{user['uuid']}"
+
+        self.app.get(url, auth=self.auth)
+        with self.count_queries() as statement:
+            cached = self.app.get(url, auth=self.auth)
+        self.assertEqual(statement.call_count, 0)
+        self.assertEqual(cached.json()["email"], user["email"])
+
+        stats = self.app.get("/api/system/cache", auth=self.auth).json()
+        self.assertGreaterEqual(stats["hits"], 1)
+        self.assertGreaterEqual(stats["misses"], 1)
+
+        self.app.patch(url, json={"name": "Renamed"}, auth=self.auth)
+        self.assertEqual(self.app.get(url, auth=self.auth).json()["name"], "Renamed")
+
+        self.app.delete(url, auth=self.auth)
+        self.assertEqual(self.app.get(url, auth=self.auth).status_code, 404)
+
+    def test_retrieve_answers_if_none_match_with_not_modified(self):
+        user = self.create_user()
+        url = f"/api/users/{user['uuid']}"
+
+        etag = self.app.get(url, auth=self.auth).headers["etag"]
+        headers = {"If-None-Match": etag}
+
+        response = self.app.get(url, headers=headers, auth=self.auth)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["etag"], etag)
+        self.assertEqual(response.content, b"")
+
+        # ? Without a cached entry the tag comes from a narrow query
+        with mock.patch.object(Config.Cache, "enabled", False):
+            with self.count_queries() as statement:
+                response = self.app.get(url, headers=headers, auth=self.auth)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(statement.call_count, 1)
+        self.assertNotIn("*", statement.call_args.args[1].split("FROM")[0])
+
+        DB.get_query_builder().table("users").where("uuid", user["uuid"]).update(
+            {"version": 2}
+        )
+        Cache.forget("users", user["uuid"])
+        response = self.app.get(url, headers=headers, auth=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["etag"], etag)
+
+    def test_listed_answers_if_none_match_with_not_modified(self):
+        self.create_user()
+        params = {"limit": 5}
+
+        etag = self.app.get("/api/users/", params=params, auth=self.auth).headers["etag"]
+        response = self.app.get(
+            "/api/users/", params=params, headers={"If-None-Match": etag}, auth=self.auth
+        )
+        self.assertEqual(response.status_code, 304)
+
+        first = self.app.get("/api/users/", params=params, auth=self.auth).json()["data"][0]
+        self.app.delete(f"/api/users/{first['uuid']}", auth=self.auth)
+        response = self.app.get(
+            "/api/users/", params=params, headers={"If-None-Match": etag}, auth=self.auth
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_fast_json_matches_default_responses_without_secrets(self):
+        user = self.create_user()
+        deleted = self.create_user()
+        self.app.delete(f"/api/users/{deleted['uuid']}", auth=self.auth)
+        preferences = self.app.get("/api/preferences/", auth=self.auth).json()["data"]
+
+        for url in (
+            "/api/users/",
+            "/api/users/deleted",
+            f"/api/users/{user['uuid']}",
+            "/api/preferences/",
+            f"/api/preferences/{preferences[0]['uuid']}",
+        ):
+            default = self.app.get(url, auth=self.auth)
+            with mock.patch.object(Config.Responses, "fast_json", True):
+                fast = self.app.get(url, auth=self.auth)
+
+            self.assertEqual(fast.status_code, 200)
+            self.assertEqual(fast.headers["etag"], default.headers["etag"])
+            self.assertEqual(fast.headers["content-type"], "application/json")
+
+            expected = default.json()
+            for item in expected.get("data", [expected]):
+                item.pop("password", None), item.pop("salt", None)
+            self.assertEqual(fast.json(), expected)
+            self.assertNotIn(b"password", fast.content)
+
+    def test_export_streams_every_user_without_secrets(self):
+        kept = self.create_user()
+        deleted = self.create_user()
+        self.app.delete(f"/api/users/{deleted['uuid']}", auth=self.auth)
+
+        response = self.app.get("/api/users/export", auth=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        uuids = [row["uuid"] for row in rows]
+        self.assertIn(kept["uuid"], uuids)
+        self.assertNotIn(deleted["uuid"], uuids)
+        self.assertNotIn("password", rows[0])
+        self.assertEqual(rows, sorted(rows, key=lambda row: (row["created_at"], row["uuid"])))
+
+        response = self.app.get(
+            "/api/users/export",
+            params={"format": "csv", "include_deleted": True},
+            auth=self.auth,
+        )
+        lines = list(csv.DictReader(io.StringIO(response.text)))
+        self.assertIn(deleted["uuid"], [line["uuid"] for line in lines])
+        self.assertNotIn("salt", lines[0])
+
+        response = self.app.get(
+            "/api/users/export",
+            params={"created_after": "2999-01-01T00:00:00+00:00"},
+            auth=self.auth,
+        )
+        self.assertEqual(response.text, "")